@@ -0,0 +1,148 @@
+"""End-to-end benchmark of the plugin bridge: MCP tool -> queue -> poll -> plugin -> result.
+
+Runs the real FastAPI app in-process (uvicorn on --port), connects the
+simulated plugin from fake_plugin.py to it, then calls MCP tools through
+FastMCP.call_tool at the requested concurrency. For each tool it reports
+calls, errors, p50/p95/p99 latency and completed calls per second.
+
+Usage: python benchmarks/bench_bridge.py [--calls 200] [--concurrency 8]
+           [--tools get_property,list_children,find_instances,create_instance,modify_children]
+           [--zones 20] [--parts 100] [--command-delay 0.0]
+
+Needs the server's dependencies (fastapi, uvicorn, mcp, httpx). No Roblox
+credentials are required: only Studio-plugin tools are exercised.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import time
+from typing import Dict, Any, List, Callable
+
+import uvicorn
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from roblox_mcp import server # noqa: E402
+from fake_plugin import FakeDataModel, FakePlugin # noqa: E402
+
+def tool_arguments(zones: int, parts: int) -> Dict[str, Callable[[int], Dict[str, Any]]]:
+    """Argument factories per tool; each call gets slightly different arguments."""
+    def zone(i):
+        return f"Workspace.Map.Zone{i % zones}"
+    return {
+        "get_property": lambda i: {"object_name": f"{zone(i)}.Part{random.randrange(parts)}", "property_name": "Position"},
+        "list_children": lambda i: {"parent_name": zone(i), "use_mirror": False},
+        "find_instances": lambda i: {"class_name": "Part", "search_root": zone(i), "limit": 200, "use_mirror": False,
+                                     "properties": ["Position", "Anchored"]},
+        "create_instance": lambda i: {"class_name": "Part", "parent_name": "Workspace",
+                                      "properties": {"Name": f"Bench{i}", "Anchored": True}},
+        "modify_children": lambda i: {"parent_path": zone(i), "property_name": "Transparency",
+                                      "property_value": (i % 10) / 10, "child_class_filter": "Part"},
+    }
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return float("nan")
+    rank = max(1, min(len(sorted_values), round(fraction * len(sorted_values) + 0.5)))
+    return sorted_values[rank - 1]
+
+def result_text(result: Any) -> str:
+    # call_tool returns a list of content blocks (newer mcp versions: (content, structured))
+    if isinstance(result, tuple):
+        result = result[0]
+    return "".join(getattr(block, "text", "") for block in result)
+
+async def run_tool(name: str, make_arguments: Callable[[int], Dict[str, Any]], calls: int, concurrency: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = 0
+    next_call = 0
+
+    async def worker():
+        nonlocal next_call, errors
+        while next_call < calls:
+            index = next_call
+            next_call += 1
+            started = time.perf_counter()
+            try:
+                text = result_text(await server.mcp_server.call_tool(name, make_arguments(index)))
+                if "Error" in text:
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "tool": name,
+        "calls": calls,
+        "errors": errors,
+        "p50": percentile(latencies, 0.50),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+        "per_second": calls / elapsed if elapsed > 0 else float("inf"),
+    }
+
+async def main_async(args) -> None:
+    config = uvicorn.Config(server.app, host="127.0.0.1", port=args.port, log_level="warning", lifespan="on")
+    http_server = uvicorn.Server(config)
+    server_task = asyncio.create_task(http_server.serve())
+    while not http_server.started:
+        await asyncio.sleep(0.05)
+
+    model = FakeDataModel()
+    model.populate(args.zones, args.parts)
+    stop = asyncio.Event()
+    plugin = FakePlugin(f"http://127.0.0.1:{args.port}", model, command_delay=args.command_delay)
+    plugin_task = asyncio.create_task(plugin.run(stop))
+    while not server.plugin_presence.is_available():
+        await asyncio.sleep(0.05)
+
+    factories = tool_arguments(args.zones, args.parts)
+    tools = [tool.strip() for tool in args.tools.split(",") if tool.strip()]
+    unknown = [tool for tool in tools if tool not in factories]
+    if unknown:
+        raise SystemExit(f"Unknown tool(s): {', '.join(unknown)}. Choose from {', '.join(factories)}.")
+
+    print(f"{args.zones * (args.parts + 1)} instances under Workspace.Map, {args.calls} calls per tool, concurrency {args.concurrency}")
+    print(f"{'tool':<18} {'calls':>6} {'errors':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'calls/s':>9}")
+    try:
+        for tool in tools:
+            if args.warmup:
+                await run_tool(tool, factories[tool], args.warmup, args.concurrency)
+            row = await run_tool(tool, factories[tool], args.calls, args.concurrency)
+            print(f"{row['tool']:<18} {row['calls']:>6} {row['errors']:>6} {row['p50'] * 1000:>8.2f} {row['p95'] * 1000:>8.2f} {row['p99'] * 1000:>8.2f} {row['per_second']:>9.1f}")
+    finally:
+        stop.set()
+        plugin_task.cancel()
+        http_server.should_exit = True
+        await asyncio.gather(plugin_task, server_task, return_exceptions=True)
+    print(f"Plugin executed {plugin.commands_executed} commands.")
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end plugin bridge benchmark with a simulated Studio plugin.")
+    parser.add_argument("--calls", type=int, default=200, help="Measured calls per tool.")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured calls per tool before measuring.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Tool calls in flight at once.")
+    parser.add_argument("--tools", default="get_property,list_children,find_instances,create_instance,modify_children",
+                        help="Comma-separated tools to benchmark.")
+    parser.add_argument("--zones", type=int, default=20, help="Models under Workspace.Map in the fake DataModel.")
+    parser.add_argument("--parts", type=int, default=100, help="Parts per zone.")
+    parser.add_argument("--command-delay", type=float, default=0.0, help="Simulated Studio time per command, in seconds.")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the in-process server.")
+    parser.add_argument("--log-level", default="WARNING", help="Server log level during the run (INFO logs every command).")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(args.log_level)
+    server.logger.setLevel(args.log_level)
+    asyncio.run(main_async(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Micro-benchmark: stdlib json vs. roblox_mcp.json_codec on plugin-bridge payloads.
+
+Usage: python benchmarks/bench_json.py [--repeat N]
+
+The payloads mirror what actually crosses the bridge: a find_instances page
+(row format, with property projections) reported by the plugin, a
+create_instances_bulk command handed out by /plugin_command, a log batch, and
+an execute_luau result pretty-printed for tool output. Install orjson to see
+the fast backend; without it json_codec falls back to the stdlib and the
+speedup column stays around 1.0x.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from roblox_mcp import json_codec # noqa: E402
+
+def find_instances_page(count=2000):
+    return {
+        "request_id": "4b0c7c1e-6a55-4f4e-9a55-0e0d6d1d7f10",
+        "result": {
+            "instances": [
+                {
+                    "name": f"Part{i}",
+                    "className": "Part",
+                    "path": f"Workspace.Map.Zone{i // 100}.Part{i}",
+                    "handle": f"@3fa9c2d1:{i + 1}",
+                    "properties": {
+                        "Position": {"type": "Vector3", "x": i * 4.0, "y": 2.5, "z": -i * 0.75},
+                        "Anchored": i % 2 == 0,
+                        "Material": {"type": "EnumItem", "fullValue": "Enum.Material.Plastic", "name": "Plastic", "value": 256},
+                    },
+                }
+                for i in range(count)
+            ],
+            "offset": 0,
+            "scanned": count * 3,
+            "total_descendants": count * 3,
+        },
+    }
+
+def bulk_create_command(count=20000):
+    return {
+        "request_id": "a6f5e0f4-1d8e-4c38-8b3a-2f2d5f3d9c11",
+        "action": "create_instances_bulk",
+        "deadline": 1760000000.123,
+        "data": {
+            "class_name": "Part",
+            "parent_name": "Workspace.Generated",
+            "count": count,
+            "columns": {
+                "Name": [f"Block{i}" for i in range(count)],
+                "Position": [[i % 100 * 4, 1, i // 100 * 4] for i in range(count)],
+                "Color": [[(i * 7) % 255, (i * 13) % 255, (i * 29) % 255] for i in range(count)],
+            },
+            "shared_properties": {"Anchored": True, "Size": [4, 1, 4]},
+        },
+    }
+
+def log_batch(count=50):
+    return [
+        {"message": f"[Spawner] Spawned wave {i} with {i * 3} enemies at zone {i % 7}", "log_type": "Enum.MessageType.MessageOutput", "timestamp": 1234.5 + i}
+        for i in range(count)
+    ]
+
+def luau_return_values(count=500):
+    return [{"id": i, "name": f"item_{i}", "tags": ["a", "b", "c"], "stats": {"hp": 100 - i % 100, "speed": 16.0}} for i in range(count)]
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per case; the best run is reported.")
+    args = parser.parse_args()
+
+    page = find_instances_page()
+    page_bytes = json.dumps(page).encode()
+    command = bulk_create_command()
+    logs = log_batch()
+    logs_bytes = json.dumps(logs).encode()
+    values = luau_return_values()
+
+    cases = [
+        ("decode find_instances result", len(page_bytes),
+         lambda: json.loads(page_bytes), lambda: json_codec.loads(page_bytes)),
+        ("encode bulk create command", len(json_codec.dumps(command)),
+         lambda: json.dumps(command, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8"),
+         lambda: json_codec.dumps(command)),
+        ("decode log batch (50)", len(logs_bytes),
+         lambda: json.loads(logs_bytes), lambda: json_codec.loads(logs_bytes)),
+        ("pretty-print luau result", len(json.dumps(values, indent=2)),
+         lambda: json.dumps(values, indent=2), lambda: json_codec.dumps_text(values, indent=True)),
+    ]
+
+    print(f"json_codec backend: {json_codec.BACKEND} (best of {args.repeat})")
+    print(f"{'case':<32} {'bytes':>10} {'stdlib ms':>10} {'codec ms':>10} {'speedup':>8}")
+    for name, size, baseline, candidate in cases:
+        baseline_time = best_of(baseline, args.repeat)
+        candidate_time = best_of(candidate, args.repeat)
+        print(f"{name:<32} {size:>10} {baseline_time * 1000:>10.2f} {candidate_time * 1000:>10.2f} {baseline_time / candidate_time:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,383 @@
+"""Python stand-in for the Studio plugin (roblox_mcp_plugin/src/Plugin.server.lua).
+
+Polls /plugin_command the way the Lua plugin does (batched long-poll, gzip),
+runs the commands against an in-memory DataModel and reports results to
+/plugin_report_result(s) and output lines to /receive_studio_logs. It lets the
+server be exercised and benchmarked without Roblox Studio.
+
+Usage: python benchmarks/fake_plugin.py [--server http://localhost:8000] [--zones 20] [--parts 100]
+
+Supported actions: get_property, set_property, list_children, find_instances,
+create_instance, delete_instance, modify_children. Anything else is answered
+with an error result, like a plugin that doesn't know the action.
+"""
+import argparse
+import asyncio
+import logging
+import time
+import uuid
+from typing import Dict, Any, Optional, List
+
+import httpx
+
+logger = logging.getLogger("fake_plugin")
+
+SERVICES = ("Workspace", "ReplicatedStorage", "ServerScriptService", "ServerStorage", "Lighting", "StarterGui")
+
+class FakeInstance:
+    __slots__ = ("id", "name", "class_name", "parent", "children", "properties")
+
+    def __init__(self, instance_id: int, name: str, class_name: str, properties: Optional[Dict[str, Any]] = None):
+        self.id = instance_id
+        self.name = name
+        self.class_name = class_name
+        self.parent: Optional["FakeInstance"] = None
+        self.children: List["FakeInstance"] = []
+        self.properties: Dict[str, Any] = properties or {}
+
+    def full_name(self) -> str:
+        # Like Instance:GetFullName(), the DataModel itself is left out
+        parts = []
+        instance = self
+        while instance is not None and instance.class_name != "DataModel":
+            parts.append(instance.name)
+            instance = instance.parent
+        return ".".join(reversed(parts))
+
+    def find_first_child(self, name: str) -> Optional["FakeInstance"]:
+        for child in self.children:
+            if child.name == name:
+                return child
+        return None
+
+    def descendants(self):
+        stack = list(reversed(self.children))
+        while stack:
+            instance = stack.pop()
+            yield instance
+            stack.extend(reversed(instance.children))
+
+    def get(self, property_name: str) -> Any:
+        if property_name == "Name":
+            return self.name
+        if property_name == "ClassName":
+            return self.class_name
+        if property_name == "Parent":
+            return None if self.parent is None else {"type": "Instance", "name": self.parent.name, "className": self.parent.class_name, "path": self.parent.full_name()}
+        if property_name not in self.properties:
+            raise KeyError(f"{property_name} is not a valid member of {self.class_name} \"{self.full_name()}\"")
+        return self.properties[property_name]
+
+    def set(self, property_name: str, value: Any) -> None:
+        if property_name == "Name":
+            self.name = str(value)
+        elif property_name in ("ClassName", "Parent"):
+            raise ValueError(f"{property_name} can't be set here")
+        else:
+            self.properties[property_name] = value
+
+class FakeDataModel:
+    """Instance tree with the services a place starts with, plus handle bookkeeping."""
+
+    def __init__(self):
+        self.session = uuid.uuid4().hex[:8].upper()
+        self._next_id = 1
+        self._by_id: Dict[int, FakeInstance] = {}
+        self.game = self.new("Game", "DataModel")
+        for service in SERVICES:
+            self.add(self.game, self.new(service, service))
+        self.workspace = self.game.find_first_child("Workspace")
+
+    def new(self, name: str, class_name: str, properties: Optional[Dict[str, Any]] = None) -> FakeInstance:
+        instance = FakeInstance(self._next_id, name, class_name, properties)
+        self._by_id[instance.id] = instance
+        self._next_id += 1
+        return instance
+
+    def add(self, parent: FakeInstance, instance: FakeInstance) -> FakeInstance:
+        instance.parent = parent
+        parent.children.append(instance)
+        return instance
+
+    def destroy(self, instance: FakeInstance) -> None:
+        if instance.parent is not None:
+            instance.parent.children.remove(instance)
+            instance.parent = None
+        for descendant in [instance, *instance.descendants()]:
+            self._by_id.pop(descendant.id, None)
+
+    def handle(self, instance: FakeInstance) -> str:
+        return f"@{self.session}:{instance.id}"
+
+    def find(self, path: str) -> Optional[FakeInstance]:
+        """Same rules as findObjectFromPath in the Lua plugin."""
+        if path.startswith("@"):
+            session, _, rest = path[1:].partition(":")
+            id_text, _, suffix = rest.partition(".")
+            instance = self._by_id.get(int(id_text)) if session == self.session and id_text.isdigit() else None
+            parts = suffix.split(".") if suffix else []
+        else:
+            parts = path.split(".")
+            first = parts[0].lower()
+            if first == "game":
+                instance, parts = self.game, parts[1:]
+            elif first == "workspace":
+                instance, parts = self.workspace, parts[1:]
+            else:
+                instance = self.game
+        for part in parts:
+            if instance is None:
+                return None
+            instance = instance.find_first_child(part)
+        return instance
+
+    def populate(self, zones: int, parts_per_zone: int) -> None:
+        """Workspace.Map.Zone<i>.Part<j> with a few realistic properties each."""
+        world = self.add(self.workspace, self.new("Map", "Model"))
+        for zone_index in range(zones):
+            zone = self.add(world, self.new(f"Zone{zone_index}", "Model"))
+            for part_index in range(parts_per_zone):
+                self.add(zone, self.new(f"Part{part_index}", "Part", {
+                    "Position": {"type": "Vector3", "x": part_index * 4.0, "y": 1.0, "z": zone_index * 4.0},
+                    "Anchored": True,
+                    "Transparency": 0,
+                    "Material": {"type": "EnumItem", "fullValue": "Enum.Material.Plastic", "name": "Plastic", "value": 256},
+                }))
+            self.add(zone, self.new("Spawner", "Script", {"Source": "print('spawned')", "Enabled": True}))
+
+def encode_listing(model: FakeDataModel, instances: List[FakeInstance], properties: Optional[List[str]], columnar: bool) -> Any:
+    """Mirrors encodeInstanceListing in the Lua plugin (row or columnar format)."""
+    def read(instance: FakeInstance, name: str):
+        try:
+            return True, instance.get(name)
+        except KeyError:
+            return False, None
+
+    if not columnar:
+        entries = []
+        for instance in instances:
+            entry = {"name": instance.name, "className": instance.class_name, "path": instance.full_name(), "handle": model.handle(instance)}
+            if properties:
+                entry["properties"] = {name: value for name in properties for ok, value in [read(instance, name)] if ok}
+            entries.append(entry)
+        return entries
+
+    classes: List[str] = []
+    class_indexes: Dict[str, int] = {}
+    parents: List[str] = []
+    parent_indexes: Dict[Any, int] = {}
+    listing = {"format": "columnar", "count": len(instances), "names": [], "classes": classes, "class_index": [],
+               "parents": parents, "parent_index": [], "handle_prefix": f"@{model.session}:", "ids": []}
+    columns = {name: [] for name in properties or []}
+    missing: Dict[str, List[int]] = {}
+    for index, instance in enumerate(instances):
+        listing["names"].append(instance.name)
+        if instance.class_name not in class_indexes:
+            class_indexes[instance.class_name] = len(classes)
+            classes.append(instance.class_name)
+        listing["class_index"].append(class_indexes[instance.class_name])
+        parent_key = instance.parent.id if instance.parent is not None else None
+        if parent_key not in parent_indexes:
+            parent_indexes[parent_key] = len(parents)
+            parents.append(instance.parent.full_name() if instance.parent is not None else "")
+        listing["parent_index"].append(parent_indexes[parent_key])
+        listing["ids"].append(instance.id)
+        for name, column in columns.items():
+            ok, value = read(instance, name)
+            column.append(value if ok and value is not None else False)
+            if not ok or value is None:
+                missing.setdefault(name, []).append(index)
+    if columns:
+        listing["properties"] = columns
+        listing["missing_properties"] = missing
+    return listing
+
+class FakePlugin:
+    def __init__(self, server_url: str, model: FakeDataModel, max_commands: int = 25,
+                 command_delay: float = 0.0, log_interval: float = 1.5):
+        self.server_url = server_url.rstrip("/")
+        self.model = model
+        self.max_commands = max_commands
+        self.command_delay = command_delay # Simulated Studio work per command (seconds)
+        self.log_interval = log_interval
+        self.commands_executed = 0
+        self._logs: List[Dict[str, Any]] = []
+        self._find_cursors: Dict[str, Dict[str, Any]] = {}
+        self._handlers = {
+            "get_property": self.get_property,
+            "set_property": self.set_property,
+            "list_children": self.list_children,
+            "find_instances": self.find_instances,
+            "create_instance": self.create_instance,
+            "delete_instance": self.delete_instance,
+            "modify_children": self.modify_children,
+        }
+
+    # --- Actions (result shapes match the Lua handlers) ---
+    def get_property(self, data):
+        target = self.model.find(data.get("object_name") or "")
+        if target is None:
+            return {"error": f"Object not found: {data.get('object_name')}"}
+        try:
+            return {"value": target.get(data["property_name"])}
+        except KeyError as e:
+            return {"error": f"Error accessing property: {e}"}
+
+    def set_property(self, data):
+        target = self.model.find(data.get("object_name") or "")
+        if target is None:
+            return {"success": False, "error": f"Object not found: {data.get('object_name')}"}
+        try:
+            target.set(data["property_name"], data.get("property_value"))
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
+        return {"success": True}
+
+    def list_children(self, data):
+        parent = self.model.find(data.get("parent_name") or "Workspace")
+        if parent is None:
+            return {"error": f"Error - Could not find parent object: {data.get('parent_name')}"}
+        return encode_listing(self.model, list(parent.children), None, data.get("format") == "columnar")
+
+    def find_instances(self, data):
+        cursor_id = data.get("cursor")
+        if cursor_id:
+            scan = self._find_cursors.pop(cursor_id, None)
+            if scan is None:
+                return {"error": f"Cursor expired or unknown: {cursor_id}. Restart the search without a cursor."}
+        else:
+            root = self.model.find(data.get("search_root") or "Workspace")
+            if root is None:
+                return {"error": f"Search root not found: {data.get('search_root')}"}
+            offset = data.get("offset") or 0
+            scan = {"descendants": list(root.descendants()), "position": 0, "skip": offset, "returned": offset,
+                    "class_name": data.get("class_name"), "name_contains": (data.get("name_contains") or "").lower() or None}
+        limit = data.get("limit")
+        matches = []
+        descendants = scan["descendants"]
+        while scan["position"] < len(descendants):
+            instance = descendants[scan["position"]]
+            scan["position"] += 1
+            if scan["class_name"] and instance.class_name != scan["class_name"]:
+                continue
+            if scan["name_contains"] and scan["name_contains"] not in instance.name.lower():
+                continue
+            if scan["skip"] > 0:
+                scan["skip"] -= 1
+                continue
+            matches.append(instance)
+            if limit and len(matches) >= limit:
+                break
+        result = {"instances": encode_listing(self.model, matches, data.get("properties"), data.get("format") == "columnar"),
+                  "offset": scan["returned"], "scanned": scan["position"], "total_descendants": len(descendants)}
+        scan["returned"] += len(matches)
+        if scan["position"] < len(descendants):
+            cursor_id = cursor_id or uuid.uuid4().hex
+            self._find_cursors[cursor_id] = scan
+            result["next_cursor"] = cursor_id
+        return result
+
+    def create_instance(self, data):
+        parent = self.model.find(data.get("parent_name") or "Workspace")
+        if parent is None:
+            return {"error": f"Parent not found: {data.get('parent_name')}"}
+        properties = dict(data.get("properties") or {})
+        class_name = data.get("class_name") or "Part"
+        instance = self.model.new(str(properties.pop("Name", class_name)), class_name, properties)
+        self.model.add(parent, instance)
+        return {"success": True, "name": instance.name, "path": instance.full_name(), "handle": self.model.handle(instance)}
+
+    def delete_instance(self, data):
+        target = self.model.find(data.get("object_name") or "")
+        if target is None:
+            return {"success": False, "error": f"Object not found: {data.get('object_name')}"}
+        self.model.destroy(target)
+        return {"success": True}
+
+    def modify_children(self, data):
+        parent = self.model.find(data.get("parent_path") or "")
+        if parent is None:
+            return {"affected_count": 0, "errors": [], "error_message": f"Parent object not found at path: {data.get('parent_path')}"}
+        affected, errors = 0, []
+        for child in parent.children:
+            if data.get("child_name_filter") and child.name != data["child_name_filter"]:
+                continue
+            if data.get("child_class_filter") and child.class_name != data["child_class_filter"]:
+                continue
+            try:
+                child.set(data["property_name"], data.get("property_value"))
+                affected += 1
+            except ValueError as e:
+                errors.append(f"{child.name}: {e}")
+        return {"affected_count": affected, "errors": errors}
+    # --- End Actions ---
+
+    async def execute(self, command: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        deadline = command.get("deadline")
+        if deadline is not None and time.time() > deadline:
+            return None # Nobody is waiting anymore, same as the Lua plugin's deadline skip
+        if self.command_delay:
+            await asyncio.sleep(self.command_delay)
+        action = command.get("action")
+        handler = self._handlers.get(action)
+        data = command.get("data") or {}
+        try:
+            result = handler(data) if handler else {"error": f"Unknown action: {action}"}
+        except Exception as e:
+            result = {"error": f"Error executing {action}: {e}"}
+        self.commands_executed += 1
+        self._logs.append({"message": f"Executed {action}", "log_type": "Enum.MessageType.MessageOutput", "timestamp": time.monotonic()})
+        return {"request_id": command.get("request_id"), "result": result}
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        """Polls and executes until stop is set (or forever)."""
+        stop = stop or asyncio.Event()
+        poll_params = {"max_commands": self.max_commands, "long_poll": 1, "gzip": 1}
+        timeout = httpx.Timeout(60.0, connect=5.0)
+        async with httpx.AsyncClient(base_url=self.server_url, timeout=timeout) as client:
+            log_task = asyncio.create_task(self._send_logs(client, stop))
+            try:
+                while not stop.is_set():
+                    try:
+                        response = await client.get("/plugin_command", params=poll_params)
+                        response.raise_for_status()
+                        commands = response.json().get("commands") or []
+                    except httpx.HTTPError as e:
+                        logger.warning(f"Poll failed: {e}")
+                        await asyncio.sleep(2)
+                        continue
+                    # Studio runs one command at a time; results of a poll go back in one POST
+                    results = [result for command in commands if (result := await self.execute(command)) is not None]
+                    if len(results) == 1:
+                        await client.post("/plugin_report_result", json=results[0])
+                    elif results:
+                        await client.post("/plugin_report_results", json={"results": results})
+            finally:
+                log_task.cancel()
+
+    async def _send_logs(self, client: httpx.AsyncClient, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            await asyncio.sleep(self.log_interval)
+            batch, self._logs = self._logs[:50], self._logs[50:]
+            if batch:
+                try:
+                    await client.post("/receive_studio_logs", json=batch)
+                except httpx.HTTPError as e:
+                    logger.warning(f"Log send failed: {e}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulated Roblox Studio plugin for the Vibe Blocks MCP server.")
+    parser.add_argument("--server", default="http://localhost:8000", help="Server base URL.")
+    parser.add_argument("--zones", type=int, default=20, help="Models under Workspace.Map.")
+    parser.add_argument("--parts", type=int, default=100, help="Parts per zone.")
+    parser.add_argument("--command-delay", type=float, default=0.0, help="Simulated Studio time per command, in seconds.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    model = FakeDataModel()
+    model.populate(args.zones, args.parts)
+    logger.info(f"Fake DataModel ready ({args.zones * (args.parts + 1)} instances under Workspace.Map), polling {args.server}")
+    asyncio.run(FakePlugin(args.server, model, command_delay=args.command_delay).run())
+
+if __name__ == "__main__":
+    main()
@@ -11,15 +11,43 @@ local function debugLog(message)
 end
 
 local HttpService = game:GetService("HttpService")
+
+-- Commands carry an absolute "deadline" (Unix seconds); past it the server no longer waits for the result
+local function isPastDeadline(deadline)
+    return type(deadline) == "number" and DateTime.now().UnixTimestampMillis / 1000 > deadline
+end
+-- Long-running handlers (bulk edits, big searches) yield after this many seconds of work per frame
+local BULK_FRAME_BUDGET = 0.010
 local RunService = game:GetService("RunService")
 local LogService = game:GetService("LogService")
+local ChangeHistoryService = game:GetService("ChangeHistoryService")
 local Plugin = script:FindFirstAncestorOfClass("Plugin")
 
 local SERVER_URL = "http://localhost:8001/plugin_command"
 local POLLING_INTERVAL = 2 -- Seconds
+-- Long-poll: the server holds the request open until a command is queued,
+-- so the plugin can re-poll immediately after every answer.
+local USE_LONG_POLL = true
+-- Up to this many queued commands are fetched and executed per poll
+local MAX_COMMANDS_PER_POLL = 25
+-- gzip=1: large poll answers may come back gzip-encoded (HttpService decodes them)
+local BATCH_POLL_URL = SERVER_URL .. "?max_commands=" .. MAX_COMMANDS_PER_POLL .. "&gzip=1"
+local LONG_POLL_URL = BATCH_POLL_URL .. "&long_poll=1"
+-- An empty answer faster than this means the server ignored long_poll (older build)
+local MIN_LONG_POLL_HOLD = 1
 
 -- --- NEW: Result Reporting Configuration --- --
 local SERVER_RESULT_ENDPOINT = "http://localhost:8001/plugin_report_result"
+-- Results of a polled batch are posted together here (falls back to one POST each on older servers)
+local SERVER_RESULTS_BATCH_ENDPOINT = "http://localhost:8001/plugin_report_results"
+local batchResultsSupported = true
+local resultBatch = nil -- While non-nil, sendResultToServer collects results here instead of posting
+local stepResultCapture = nil -- While non-nil (execute_batch), step results are captured here by request ID
+-- POST bodies at least this long (bytes) are sent gzip-compressed (PostAsync's compress flag)
+local GZIP_POST_THRESHOLD = 2048
+-- Encoded results longer than this (bytes) are sent in numbered chunks of at most this size
+local SERVER_RESULT_CHUNK_ENDPOINT = "http://localhost:8001/plugin_report_result_chunk"
+local RESULT_CHUNK_SIZE = 512 * 1024
 -- --- END: Result Reporting Configuration --- --
 
 -- --- NEW: Logging Configuration --- --
@@ -34,10 +62,13 @@ local lastLogSendTime = 0
 
 -- 変数定義
 local lastPollTime = 0
+local isPolling = false -- Guard so Heartbeat doesn't stack requests while a long-poll is open
+local nextPollDelay = 0 -- 0 = re-poll immediately (long-poll), otherwise POLLING_INTERVAL
 local isEnabled = false -- Track if plugin is enabled
 local toolbarButton = nil -- Store reference to toolbar button
 local isConnected = false -- Track connection state
 local wasConnected = false -- Track previous connection state
+local startSceneSync, stopSceneSync, flushPendingSceneChanges -- Scene mirror sync (defined near the end of the file)
 
 -- 接続状態変化のログ関数は各場所で直接実装
 
@@ -131,9 +162,11 @@ local function createToolbarButton()
             print("Vibe Blocks MCP Plugin: Start connecting...")
             -- 接続テストを実行
             testConnection()
+            startSceneSync()
         else
             print("Vibe Blocks MCP Plugin: Disabled")
             isConnected = false
+            stopSceneSync()
         end
     end)
     
@@ -146,19 +179,52 @@ if RunService:IsStudio() and not RunService:IsRunning() then
 end
 
 -- --- Helper: Send Result Back to Server --- --
-local function sendResultToServer(requestId, resultData)
-	-- 詳細なデバッグ出力
-	debugLog("結果送信開始 requestId=" .. tostring(requestId))
-	
-	if not requestId then
-		print("Vibe Blocks MCP Plugin: エラー - リクエストIDなしで結果を送信できません")
-		return
+-- Posts an already encoded result in RESULT_CHUNK_SIZE slices; the server reassembles them
+-- by request ID. Slices end on UTF-8 character boundaries. Returns success, errorMessage.
+local function postChunkedResult(requestId, encodedPayload)
+	local length = string.len(encodedPayload)
+	local pieces = {}
+	local start = 1
+	while start <= length do
+		local stop = math.min(start + RESULT_CHUNK_SIZE - 1, length)
+		-- Don't cut before a UTF-8 continuation byte (0x80-0xBF)
+		while stop < length and stop > start do
+			local nextByte = string.byte(encodedPayload, stop + 1)
+			if nextByte < 0x80 or nextByte >= 0xC0 then
+				break
+			end
+			stop = stop - 1
+		end
+		table.insert(pieces, string.sub(encodedPayload, start, stop))
+		start = stop + 1
+	end
+
+	for index, piece in ipairs(pieces) do
+		local url = string.format("%s?request_id=%s&index=%d&total=%d",
+			SERVER_RESULT_CHUNK_ENDPOINT, HttpService:UrlEncode(requestId), index - 1, #pieces)
+		local ok, response = pcall(function()
+			return HttpService:PostAsync(url, piece, Enum.HttpContentType.TextPlain, true)
+		end)
+		if not ok then
+			return false, tostring(response)
+		end
+		local decodeOk, decoded = pcall(function() return HttpService:JSONDecode(response) end)
+		if decodeOk and type(decoded) == "table" and decoded.status == "unknown_request" then
+			-- The server stopped waiting (timeout); the remaining chunks would be thrown away
+			debugLog("チャンク送信中止: " .. tostring(requestId))
+			return true, nil
+		end
+	end
+	print(string.format("Vibe Blocks MCP Plugin: Sent %d-byte result for %s in %d chunks", length, tostring(requestId), #pieces))
+	return true, nil
+end
+
+-- Encodes and POSTs a payload. Returns success, errorMessage.
+local function postResultPayload(endpoint, payload)
+	-- Push pending scene changes first so the mirror already reflects this command's effects
+	if flushPendingSceneChanges then
+		flushPendingSceneChanges()
 	end
-	
-	local payload = {
-		request_id = requestId,
-		result = resultData or {} -- resultDataがnilの場合は空のテーブルを使用
-	}
 	
 	-- JSONエンコード処理
 	local success, encodedPayload = pcall(function()
@@ -167,40 +233,119 @@ local function sendResultToServer(requestId, resultData)
 	
 	if not success then
 		print("Vibe Blocks MCP Plugin: エラー - JSONエンコード失敗: " .. tostring(encodedPayload))
-		return
+		return false, tostring(encodedPayload)
 	end
 	
-	debugLog("POST送信準備完了: エンドポイント=" .. SERVER_RESULT_ENDPOINT .. " データ長=" .. string.len(encodedPayload))
+	debugLog("POST送信準備完了: エンドポイント=" .. endpoint .. " データ長=" .. string.len(encodedPayload))
+
+	-- Too big for one request: batches fall back to per-result posts, single results go in chunks
+	if string.len(encodedPayload) > RESULT_CHUNK_SIZE then
+		if endpoint == SERVER_RESULTS_BATCH_ENDPOINT then
+			return false, "payload too large"
+		end
+		local chunkOk, chunkError = postChunkedResult(payload.request_id, encodedPayload)
+		if not chunkOk then
+			warn("Vibe Blocks MCP Plugin: エラー - 分割結果送信失敗: " .. tostring(chunkError))
+			-- Report the failure in a small result so the waiting tool doesn't sit out its timeout
+			pcall(function()
+				HttpService:PostAsync(SERVER_RESULT_ENDPOINT, HttpService:JSONEncode({
+					request_id = payload.request_id,
+					result = { error = string.format("Result too large to deliver (%d bytes): %s", string.len(encodedPayload), tostring(chunkError)) }
+				}), Enum.HttpContentType.ApplicationJson, false)
+			end)
+		end
+		return chunkOk, chunkError
+	end
 	
 	-- HTTPリクエスト送信
 	local postSuccess, postResult = pcall(function()
 		debugLog("HTTPリクエスト実行前")
 		local result = HttpService:PostAsync(
-			SERVER_RESULT_ENDPOINT,
+			endpoint,
 			encodedPayload,
 			Enum.HttpContentType.ApplicationJson,
-			false
+			string.len(encodedPayload) >= GZIP_POST_THRESHOLD
 		)
 		debugLog("HTTPリクエスト実行後: 結果長=" .. (result and string.len(result) or 0))
 		return result
 	end)
 	
 	if postSuccess then
+		return true, nil
+	end
+	
+	warn("Vibe Blocks MCP Plugin: エラー - 結果送信失敗: " .. tostring(postResult))
+	-- HTTP権限エラーの詳細検出
+	local errorMessage = tostring(postResult)
+	if string.find(errorMessage, "not allowed") or 
+	   string.find(errorMessage, "permission") or
+	   string.find(errorMessage, "HttpService") or
+	   string.find(errorMessage, "must be enabled") then
+		warn("Vibe Blocks MCP Plugin: ===== HTTP権限エラー =====")
+		warn("Vibe Blocks MCP Plugin: プラグイン設定でHTTP権限確認が必要です。")
+		warn("Vibe Blocks MCP Plugin: 1. Roblox Studioメニューから [ファイル]->[スタジオ設定] を開く")
+		warn("Vibe Blocks MCP Plugin: 2. [セキュリティ]タブの[APIサービス]セクションで")
+		warn("Vibe Blocks MCP Plugin: 3. 'プラグインのHTTPリクエストを許可する'をオンにしてください")
+	end
+	return false, errorMessage
+end
+
+local function sendResultToServer(requestId, resultData)
+	-- 詳細なデバッグ出力
+	debugLog("結果送信開始 requestId=" .. tostring(requestId))
+	
+	if not requestId then
+		print("Vibe Blocks MCP Plugin: エラー - リクエストIDなしで結果を送信できません")
+		return
+	end
+	
+	-- Inside execute_batch: the step's result goes back to the batch handler, not the server
+	if stepResultCapture then
+		stepResultCapture[requestId] = resultData or {}
+		return
+	end
+	
+	local payload = {
+		request_id = requestId,
+		result = resultData or {} -- resultDataがnilの場合は空のテーブルを使用
+	}
+	
+	-- Inside a polled batch: collect now, flushResultBatch posts them together
+	if resultBatch then
+		table.insert(resultBatch, payload)
+		return
+	end
+	
+	if postResultPayload(SERVER_RESULT_ENDPOINT, payload) then
 		debugLog("Vibe Blocks MCP Plugin: 結果送信成功 - " .. tostring(requestId))
-	else
-		warn("Vibe Blocks MCP Plugin: エラー - 結果送信失敗: " .. tostring(postResult))
-		-- HTTP権限エラーの詳細検出
-		local errorMessage = tostring(postResult)
-		if string.find(errorMessage, "not allowed") or 
-		   string.find(errorMessage, "permission") or
-		   string.find(errorMessage, "HttpService") or
-		   string.find(errorMessage, "must be enabled") then
-			warn("Vibe Blocks MCP Plugin: ===== HTTP権限エラー =====")
-			warn("Vibe Blocks MCP Plugin: プラグイン設定でHTTP権限確認が必要です。")
-			warn("Vibe Blocks MCP Plugin: 1. Roblox Studioメニューから [ファイル]->[スタジオ設定] を開く")
-			warn("Vibe Blocks MCP Plugin: 2. [セキュリティ]タブの[APIサービス]セクションで")
-			warn("Vibe Blocks MCP Plugin: 3. 'プラグインのHTTPリクエストを許可する'をオンにしてください")
+	end
+end
+
+-- Posts every result collected since resultBatch was opened, in one request when possible
+local function flushResultBatch()
+	local batch = resultBatch
+	resultBatch = nil
+	if not batch or #batch == 0 then
+		return
+	end
+	
+	if #batch > 1 and batchResultsSupported then
+		local ok, errorMessage = postResultPayload(SERVER_RESULTS_BATCH_ENDPOINT, { results = batch })
+		if ok then
+			debugLog("結果バッチ送信成功: " .. #batch .. "件")
+			return
 		end
+		if errorMessage and string.find(errorMessage, "404") then
+			-- Older server without /plugin_report_results
+			batchResultsSupported = false
+		end
+		if errorMessage ~= "payload too large" then
+			warn("Vibe Blocks MCP Plugin: Batched result send failed, sending results individually")
+		end
+	end
+	
+	for _, payload in ipairs(batch) do
+		postResultPayload(SERVER_RESULT_ENDPOINT, payload)
 	end
 end
 -- --- End Helper: Send Result --- --
@@ -215,7 +360,48 @@ local function getFullPath(instance)
 end
 -- --- End Helper: Get Full Path --- --
 
+-- --- Helper: Instance Handles --- --
+-- Session-scoped IDs for instances the plugin returns. "@<session>:<id>" (optionally followed
+-- by ".Child.Path") is accepted anywhere a path is, skipping path traversal and never
+-- confusing same-named siblings. Both maps are weak, so handles never keep instances alive.
+local HANDLE_SESSION = string.sub(HttpService:GenerateGUID(false), 1, 8)
+local instanceIds = setmetatable({}, { __mode = "k" }) -- Instance -> id
+local instancesById = setmetatable({}, { __mode = "v" }) -- id -> Instance
+local nextInstanceId = 1
+
+local function getInstanceId(instance)
+	local id = instanceIds[instance]
+	if not id then
+		id = nextInstanceId
+		nextInstanceId = nextInstanceId + 1
+		instanceIds[instance] = id
+		instancesById[id] = instance
+	end
+	return id
+end
+
+local function getInstanceHandle(instance)
+	return "@" .. HANDLE_SESSION .. ":" .. getInstanceId(instance)
+end
+-- --- End Helper: Instance Handles --- --
+
 local function findObjectFromPath(pathString)
+	-- Handles resolve directly; handles from another Studio session (or for destroyed instances) resolve to nil
+	if string.sub(pathString, 1, 1) == "@" then
+		local session, id, suffix = string.match(pathString, "^@(%x+):(%d+)(.*)$")
+		local instance = session == HANDLE_SESSION and instancesById[tonumber(id)] or nil
+		if not instance or not instance:IsDescendantOf(game) then
+			return nil
+		end
+		for _, partName in ipairs(suffix ~= "" and string.sub(suffix, 2):split(".") or {}) do
+			instance = instance:FindFirstChild(partName)
+			if not instance then
+				return nil
+			end
+		end
+		return instance
+	end
+
 	-- Simple path traversal (game, workspace, or starts with game/workspace)
 	local parts = pathString:split(".")
 	local currentObject
@@ -719,6 +905,7 @@ local function handleCloneInstance(data)
 		resultPayload.success = true
 		resultPayload.clone_name = clone.Name
 		resultPayload.clone_path = clone:GetFullName()
+		resultPayload.clone_handle = getInstanceHandle(clone)
 		if parentError then resultPayload.parent_error = parentError end -- Include the parent warning
 		print("Vibe Blocks MCP Plugin: Finished cloning. New instance at " .. resultPayload.clone_path)
 	end
@@ -1156,41 +1343,220 @@ local function handleSetPlayerPosition(data)
 	end
 end
 
+-- --- Helper: Serialize Roblox Value to JSON-compatible Table/Primitive --- --
+-- NOTE: Defined globally before handlers that might use it.
+local function serializeValue(value)
+	local valueType = typeof(value)
+
+	if valueType == 'Vector3' then
+		return {type='Vector3', x=value.X, y=value.Y, z=value.Z}
+	elseif valueType == 'CFrame' then
+		-- Simplified CFrame representation (Position + LookVector for basic orientation)
+		-- Or return full components if needed
+		local pos = value.Position
+		local look = value.LookVector
+		return {type='CFrame', position={x=pos.X, y=pos.Y, z=pos.Z}, lookVector={x=look.X, y=look.Y, z=look.Z}} 
+	elseif valueType == 'Color3' then
+		 return {type='Color3', r=value.R, g=value.G, b=value.B}
+	elseif valueType == 'BrickColor' then
+		return {type='BrickColor', name=value.Name, number=value.Number}
+	elseif valueType == 'boolean' or valueType == 'number' or valueType == 'string' or valueType == 'nil' then
+		return value -- These types are directly JSON compatible
+	elseif string.find(valueType, "Enum.") then -- Check if it's an EnumItem
+		return {type='EnumItem', fullValue=tostring(value), name=value.Name, value=value.Value}
+	elseif valueType == 'Instance' then
+		 return {type='Instance', name=value.Name, className=value.ClassName, path=value:GetFullName(), handle=getInstanceHandle(value)}
+	elseif valueType == 'RBXScriptConnection' then
+		return {type='Connection', status=value.Connected and 'Connected' or 'Disconnected'} -- Basic info
+	-- Add more types as needed: Vector2, UDim2, Rect, Ray, Region3, PhysicalProperties, etc.
+	else
+		-- Fallback: represent unknown types as a string
+		return {type=valueType, value=tostring(value)}
+	end
+end
+-- --- END Helper: Serialize Roblox Value --- --
+
+-- --- Helper: Encode Instance Listing --- --
+-- list_children / find_instances results. The row format repeats every key and each
+-- full path per instance; with format = "columnar" the listing is sent as parallel
+-- arrays with interned class names and paths split into a parent table + name
+-- (indexes are 0-based; decoded by the server's instance_listing.py).
+local function encodeInstanceListing(instances, properties, columnar)
+	local propertyNames = (type(properties) == "table" and #properties > 0) and properties or nil
+
+	if not columnar then
+		local entries = table.create(#instances)
+		for i, instance in ipairs(instances) do
+			local entry = {
+				name = instance.Name,
+				className = instance.ClassName,
+				path = instance:GetFullName(),
+				handle = getInstanceHandle(instance)
+			}
+			if propertyNames then
+				entry.properties = {}
+				for _, propName in ipairs(propertyNames) do
+					local readOk, value = pcall(function() return instance[propName] end)
+					if readOk then
+						entry.properties[propName] = serializeValue(value)
+					end
+				end
+			end
+			entries[i] = entry
+		end
+		return entries
+	end
+
+	local count = #instances
+	local names, classIndexes, parentIndexes, ids = table.create(count), table.create(count), table.create(count), table.create(count)
+	local classes, classIndexByName = {}, {}
+	local parents, parentIndexByInstance = {}, {}
+	local propertyColumns, missingProperties = nil, nil
+	if propertyNames then
+		propertyColumns, missingProperties = {}, {}
+		for _, propName in ipairs(propertyNames) do
+			propertyColumns[propName] = table.create(count)
+		end
+	end
+
+	for i, instance in ipairs(instances) do
+		names[i] = instance.Name
+
+		local className = instance.ClassName
+		local classIndex = classIndexByName[className]
+		if not classIndex then
+			table.insert(classes, className)
+			classIndex = #classes - 1
+			classIndexByName[className] = classIndex
+		end
+		classIndexes[i] = classIndex
+
+		local parent = instance.Parent or false -- false = no parent any more (path is just the name)
+		local parentIndex = parentIndexByInstance[parent]
+		if not parentIndex then
+			-- GetFullName() leaves out the DataModel, so services under game get an empty prefix too
+			table.insert(parents, (parent and parent ~= game) and parent:GetFullName() or "")
+			parentIndex = #parents - 1
+			parentIndexByInstance[parent] = parentIndex
+		end
+		parentIndexes[i] = parentIndex
+
+		ids[i] = getInstanceId(instance)
+
+		if propertyNames then
+			for _, propName in ipairs(propertyNames) do
+				local readOk, value = pcall(function() return instance[propName] end)
+				-- Columns can't hold nil (it would end the JSON array), so unreadable cells are listed separately
+				propertyColumns[propName][i] = readOk and serializeValue(value) or false
+				if not readOk or value == nil then
+					missingProperties[propName] = missingProperties[propName] or {}
+					table.insert(missingProperties[propName], i - 1)
+				end
+			end
+		end
+	end
+
+	return {
+		format = "columnar",
+		count = count,
+		names = names,
+		classes = classes,
+		class_index = classIndexes,
+		parents = parents,
+		parent_index = parentIndexes,
+		handle_prefix = "@" .. HANDLE_SESSION .. ":",
+		ids = ids,
+		properties = propertyColumns,
+		missing_properties = missingProperties,
+	}
+end
+-- --- End Helper: Encode Instance Listing --- --
+
 -- --- NEW: Find Instances Handler --- --
+-- Paged searches keep their GetDescendants() snapshot under a cursor, so later pages
+-- resume where the previous one stopped instead of re-walking the tree.
+local FIND_CURSOR_TTL = 120 -- Seconds an idle cursor is kept
+local FIND_MAX_CURSORS = 8
+local findCursors = {} -- cursorId -> scan state
+
+local function pruneFindCursors()
+    local now = os.clock()
+    local live = {}
+    for cursorId, scan in pairs(findCursors) do
+        if now - scan.lastUsed > FIND_CURSOR_TTL then
+            findCursors[cursorId] = nil
+        else
+            table.insert(live, cursorId)
+        end
+    end
+    table.sort(live, function(a, b) return findCursors[a].lastUsed < findCursors[b].lastUsed end)
+    for i = 1, #live - FIND_MAX_CURSORS do
+        findCursors[live[i]] = nil
+    end
+end
+
 local function handleFindInstances(data)
-    local classNameFilter = data.class_name -- Can be nil
-    local nameContainsFilter = data.name_contains -- Can be nil
-    local searchRootName = data.search_root or "Workspace"
     local requestId = data.request_id
-
-    local resultPayload = { instances = {} } -- Initialize with empty list
+    local limit = tonumber(data.limit) -- nil = no limit
+    local properties = data.properties -- Optional list of property names to read for each match
+    local cursorId = data.cursor
     local errorResult = nil
+    local resultPayload = nil
 
-    local root = findObjectFromPath(searchRootName)
+    pruneFindCursors()
 
-    if not root then
-        errorResult = { error = "Search root not found: " .. searchRootName }
+    local scan = nil
+    if cursorId then
+        scan = findCursors[cursorId]
+        if not scan then
+            errorResult = { error = "Cursor expired or unknown: " .. tostring(cursorId) .. ". Restart the search without a cursor." }
+        end
     else
-        print(string.format("Vibe Blocks MCP Plugin: Finding instances under %s (%s) for request ID %s", root.Name, root.ClassName, requestId or "N/A"))
-        print(string.format("  - Filters: ClassName='%s', NameContains='%s'", classNameFilter or "any", nameContainsFilter or "any"))
-        
-        local nameFilterLower = nameContainsFilter and nameContainsFilter:lower() or nil
+        local searchRootName = data.search_root or "Workspace"
+        local root = findObjectFromPath(searchRootName)
+        if not root then
+            errorResult = { error = "Search root not found: " .. searchRootName }
+        else
+            print(string.format("Vibe Blocks MCP Plugin: Finding instances under %s (%s) for request ID %s", root.Name, root.ClassName, requestId or "N/A"))
+            print(string.format("  - Filters: ClassName='%s', NameContains='%s'", data.class_name or "any", data.name_contains or "any"))
+            scan = {
+                descendants = root:GetDescendants(),
+                position = 0,
+                skip = tonumber(data.offset) or 0,
+                returned = tonumber(data.offset) or 0, -- Absolute index of the next match
+                classFilter = data.class_name, -- Can be nil
+                nameFilterLower = data.name_contains and data.name_contains:lower() or nil,
+            }
+        end
+    end
 
+    if scan then
+        local matches = {}
+        local descendants = scan.descendants
         local findSuccess, findError = pcall(function()
-            for _, descendant in ipairs(root:GetDescendants()) do
-                -- ClassName check
-                local classMatch = (classNameFilter == nil) or (descendant.ClassName == classNameFilter)
-
-                -- Name check (case-insensitive)
-                local nameMatch = (nameFilterLower == nil) or (string.find(descendant.Name:lower(), nameFilterLower) ~= nil)
-
-                if classMatch and nameMatch then
-                    -- No need to serialize here, just basic info
-                    table.insert(resultPayload.instances, {
-                        name = descendant.Name,
-                        className = descendant.ClassName,
-                        path = descendant:GetFullName()
-                    })
+            local frameStart = os.clock()
+            while scan.position < #descendants do
+                if os.clock() - frameStart > BULK_FRAME_BUDGET then
+                    if isPastDeadline(data.deadline) then
+                        error("Deadline exceeded; search abandoned", 0)
+                    end
+                    task.wait() -- Spread big scans across frames
+                    frameStart = os.clock()
+                end
+                scan.position = scan.position + 1
+                local descendant = descendants[scan.position]
+                -- Skip instances destroyed since the snapshot was taken
+                if descendant.Parent ~= nil
+                    and (scan.classFilter == nil or descendant.ClassName == scan.classFilter)
+                    and (scan.nameFilterLower == nil or string.find(descendant.Name:lower(), scan.nameFilterLower, 1, true) ~= nil) then
+                    if scan.skip > 0 then
+                        scan.skip = scan.skip - 1
+                    else
+                        table.insert(matches, descendant)
+                        if limit and #matches >= limit then
+                            break
+                        end
+                    end
                 end
             end
         end)
@@ -1198,8 +1564,24 @@ local function handleFindInstances(data)
         if not findSuccess then
             errorResult = { error = "Error during search: " .. tostring(findError) }
             print("  - Error during search: " .. tostring(findError))
+            if cursorId then findCursors[cursorId] = nil end
         else
-             print(string.format("  - Found %d matching instances.", #resultPayload.instances))
+            resultPayload = {
+                instances = encodeInstanceListing(matches, properties, data.format == "columnar"),
+                offset = scan.returned,
+                scanned = scan.position,
+                total_descendants = #descendants
+            }
+            scan.returned = scan.returned + #matches
+            if scan.position < #descendants then
+                cursorId = cursorId or HttpService:GenerateGUID(false)
+                scan.lastUsed = os.clock()
+                findCursors[cursorId] = scan
+                resultPayload.next_cursor = cursorId
+            elseif cursorId then
+                findCursors[cursorId] = nil
+            end
+            print(string.format("  - Found %d matching instances (%d/%d scanned).", #matches, scan.position, #descendants))
         end
     end
 
@@ -1233,15 +1615,8 @@ local function handleListChildren(data)
 
         if success then
             local children = childrenOrError
-            for i, child in ipairs(children) do
-                table.insert(results, {
-                    name = child.Name,
-                    className = child.ClassName,
-                    path = child:GetFullName()
-                })
-                print(string.format("  - Found: %s (%s) Path: %s", child.Name, child.ClassName, child:GetFullName()))
-            end
-            print("Vibe Blocks MCP Plugin: Finished listing children for " .. parentName)
+            results = encodeInstanceListing(children, nil, data.format == "columnar")
+            print(string.format("Vibe Blocks MCP Plugin: Finished listing %d children for %s", #children, parentName))
         else
             local errMsg = "Error getting children for " .. parentName .. ": " .. tostring(childrenOrError)
             print("Vibe Blocks MCP Plugin: " .. errMsg)
@@ -1258,38 +1633,6 @@ local function handleListChildren(data)
 end
 -- --- END: List Children Handler --- --
 
--- --- Helper: Serialize Roblox Value to JSON-compatible Table/Primitive --- --
--- NOTE: Defined globally before handlers that might use it.
-local function serializeValue(value)
-	local valueType = typeof(value)
-
-	if valueType == 'Vector3' then
-		return {type='Vector3', x=value.X, y=value.Y, z=value.Z}
-	elseif valueType == 'CFrame' then
-		-- Simplified CFrame representation (Position + LookVector for basic orientation)
-		-- Or return full components if needed
-		local pos = value.Position
-		local look = value.LookVector
-		return {type='CFrame', position={x=pos.X, y=pos.Y, z=pos.Z}, lookVector={x=look.X, y=look.Y, z=look.Z}} 
-	elseif valueType == 'Color3' then
-		 return {type='Color3', r=value.R, g=value.G, b=value.B}
-	elseif valueType == 'BrickColor' then
-		return {type='BrickColor', name=value.Name, number=value.Number}
-	elseif valueType == 'boolean' or valueType == 'number' or valueType == 'string' or valueType == 'nil' then
-		return value -- These types are directly JSON compatible
-	elseif string.find(valueType, "Enum.") then -- Check if it's an EnumItem
-		return {type='EnumItem', fullValue=tostring(value), name=value.Name, value=value.Value}
-	elseif valueType == 'Instance' then
-		 return {type='Instance', name=value.Name, className=value.ClassName, path=value:GetFullName()}
-	elseif valueType == 'RBXScriptConnection' then
-		return {type='Connection', status=value.Connected and 'Connected' or 'Disconnected'} -- Basic info
-	-- Add more types as needed: Vector2, UDim2, Rect, Ray, Region3, PhysicalProperties, etc.
-	else
-		-- Fallback: represent unknown types as a string
-		return {type=valueType, value=tostring(value)}
-	end
-end
--- --- END Helper: Serialize Roblox Value --- --
 
 -- --- NEW: Get Property Handler --- --
 local function handleGetProperty(data)
@@ -1615,6 +1958,11 @@ local function handleModifyChildren(data)
     -- 2. Iterate and Modify Children
     local children = parentObject:GetChildren()
     for i, child in ipairs(children) do
+        if i % 50 == 0 and isPastDeadline(data.deadline) then
+            resultPayload.error_message = string.format("Deadline exceeded after %d of %d children; stopped early.", i - 1, #children)
+            warn("Vibe Blocks MCP Plugin: " .. resultPayload.error_message)
+            break
+        end
         local childMatches = true
 
         -- Apply filters
@@ -1677,6 +2025,246 @@ local function handleModifyChildren(data)
 end
 -- --- END: Modify Children Handler --- --
 
+-- --- NEW: Bulk Create Handler --- --
+-- Builds `count` instances of one class in a single command. `shared` properties are
+-- converted once; `columns` hold one value per instance (nil/missing = leave default).
+
+local function handleCreateInstancesBulk(data)
+	local requestId = data.request_id
+	local className = data.class_name
+	local parentName = data.parent_name
+	local columns = data.columns or {}
+	local shared = data.shared or {}
+	local count = tonumber(data.count) or 0
+
+	local function fail(message)
+		warn("Vibe Blocks MCP Plugin: create_instances_bulk - " .. message)
+		if requestId then sendResultToServer(requestId, { success = false, error = message }) end
+	end
+
+	if type(className) ~= "string" or type(parentName) ~= "string" then
+		return fail("Missing required parameters 'class_name' or 'parent_name'")
+	end
+	local parent = findObjectFromPath(parentName)
+	if not parent then
+		return fail("Parent object not found: " .. parentName)
+	end
+	local classOk, classError = pcall(function() Instance.new(className):Destroy() end)
+	if not classOk then
+		return fail("Cannot create instances of class '" .. className .. "': " .. tostring(classError))
+	end
+
+	-- Convert the shared properties once instead of once per instance
+	local sharedValues = {}
+	for propName, rawValue in pairs(shared) do
+		local value, convertError = convertToRobloxType(propName, rawValue)
+		if convertError then
+			return fail(string.format("Shared property '%s': %s", propName, convertError))
+		end
+		sharedValues[propName] = value
+	end
+
+	local recordingId = nil
+	local recOk, recResult = pcall(function() return ChangeHistoryService:TryBeginRecording("Vibe Blocks MCP Bulk Create") end)
+	if recOk and recResult then
+		recordingId = recResult
+	end
+
+	print(string.format("Vibe Blocks MCP Plugin: Bulk creating %d %s under %s for request ID %s", count, className, parent:GetFullName(), tostring(requestId)))
+
+	local names = {}
+	local handles = {}
+	local failed = {}
+	local created = 0
+	local deadlineExceeded = false
+	local frameStart = os.clock()
+	for index = 1, count do
+		if os.clock() - frameStart > BULK_FRAME_BUDGET then
+			if isPastDeadline(data.deadline) then
+				deadlineExceeded = true
+				break
+			end
+			task.wait() -- Let Studio render and handle input between slices
+			frameStart = os.clock()
+		end
+
+		local newInstance = Instance.new(className)
+		local ok, err = pcall(function()
+			for propName, value in pairs(sharedValues) do
+				newInstance[propName] = value
+			end
+			for propName, column in pairs(columns) do
+				local rawValue = column[index]
+				if rawValue ~= nil then
+					local value, convertError = convertToRobloxType(propName, rawValue)
+					if convertError then
+						error(propName .. ": " .. convertError, 0)
+					end
+					newInstance[propName] = value
+				end
+			end
+			newInstance.Parent = parent
+		end)
+		if ok then
+			created = created + 1
+			names[index] = newInstance.Name
+			handles[index] = getInstanceHandle(newInstance)
+		else
+			newInstance:Destroy()
+			names[index] = false
+			handles[index] = false
+			table.insert(failed, { index = index, error = tostring(err) })
+		end
+	end
+
+	if recordingId then
+		pcall(function() ChangeHistoryService:FinishRecording(recordingId, Enum.FinishRecordingOperation.Commit) end)
+	else
+		pcall(function() ChangeHistoryService:SetWaypoint("Vibe Blocks MCP Bulk Create") end)
+	end
+
+	print(string.format("Vibe Blocks MCP Plugin: Bulk create finished - %d created, %d failed%s", created, #failed, deadlineExceeded and " (deadline exceeded)" or ""))
+
+	if requestId then
+		-- Compact result: the parent path once, then one name per requested instance (false = failed)
+		sendResultToServer(requestId, {
+			success = #failed == 0 and not deadlineExceeded,
+			parent_path = parent:GetFullName(),
+			created = created,
+			names = names,
+			handles = handles,
+			failed = failed,
+			deadline_exceeded = deadlineExceeded,
+		})
+	end
+end
+-- --- END: Bulk Create Handler --- --
+
+-- --- NEW: Bulk Set Properties Handler --- --
+-- Accepts either entries = {{target=..., properties={...}}, ...} or the column layout
+-- targets = {...} + columns = {Prop = {...}}; `shared` properties apply to every target.
+local function handleSetPropertiesBulk(data)
+	local requestId = data.request_id
+	local entries = data.entries
+	local targets = data.targets
+	local columns = data.columns or {}
+	local shared = data.shared or {}
+
+	local count = entries and #entries or (targets and #targets or 0)
+	if count == 0 then
+		if requestId then sendResultToServer(requestId, { success = false, error = "No targets given ('entries' or 'targets')." }) end
+		return
+	end
+
+	-- Memoized conversions: propName -> value key -> converted value (or error)
+	local conversionCache = {}
+	local function convertCached(propName, rawValue)
+		local byValue = conversionCache[propName]
+		if not byValue then
+			byValue = {}
+			conversionCache[propName] = byValue
+		end
+		local key = rawValue
+		if type(rawValue) == "table" then
+			key = HttpService:JSONEncode(rawValue)
+		end
+		local cached = byValue[key]
+		if cached == nil then
+			local value, convertError = convertToRobloxType(propName, rawValue)
+			cached = { value = value, error = convertError }
+			byValue[key] = cached
+		end
+		return cached.value, cached.error
+	end
+
+	local recordingId = nil
+	local recOk, recResult = pcall(function() return ChangeHistoryService:TryBeginRecording("Vibe Blocks MCP Bulk Set Properties") end)
+	if recOk and recResult then
+		recordingId = recResult
+	end
+
+	print(string.format("Vibe Blocks MCP Plugin: Bulk setting properties on %d targets for request ID %s", count, tostring(requestId)))
+
+	local results = {}
+	local succeeded = 0
+	local deadlineExceeded = false
+	local frameStart = os.clock()
+	for index = 1, count do
+		if os.clock() - frameStart > BULK_FRAME_BUDGET then
+			if isPastDeadline(data.deadline) then
+				deadlineExceeded = true
+				break
+			end
+			task.wait()
+			frameStart = os.clock()
+		end
+
+		local targetPath, properties
+		if entries then
+			local entry = entries[index]
+			targetPath = type(entry) == "table" and entry.target or nil
+			properties = type(entry) == "table" and entry.properties or {}
+		else
+			targetPath = targets[index]
+			properties = {}
+			for propName, column in pairs(columns) do
+				properties[propName] = column[index]
+			end
+		end
+
+		local target = type(targetPath) == "string" and findObjectFromPath(targetPath) or nil
+		if not target then
+			results[index] = "Object not found: " .. tostring(targetPath)
+		else
+			local errors = {}
+			local function apply(propName, rawValue)
+				local value, convertError = convertCached(propName, rawValue)
+				if convertError then
+					table.insert(errors, propName .. ": " .. convertError)
+					return
+				end
+				local ok, setError = pcall(function() target[propName] = value end)
+				if not ok then
+					table.insert(errors, propName .. ": " .. tostring(setError))
+				end
+			end
+			for propName, rawValue in pairs(shared) do
+				apply(propName, rawValue)
+			end
+			for propName, rawValue in pairs(properties) do
+				apply(propName, rawValue)
+			end
+			if #errors == 0 then
+				results[index] = true
+				succeeded = succeeded + 1
+			else
+				results[index] = table.concat(errors, "; ")
+			end
+		end
+	end
+
+	if recordingId then
+		pcall(function() ChangeHistoryService:FinishRecording(recordingId, Enum.FinishRecordingOperation.Commit) end)
+	else
+		pcall(function() ChangeHistoryService:SetWaypoint("Vibe Blocks MCP Bulk Set Properties") end)
+	end
+
+	print(string.format("Vibe Blocks MCP Plugin: Bulk set finished - %d/%d targets updated%s", succeeded, count, deadlineExceeded and " (deadline exceeded)" or ""))
+
+	if requestId then
+		-- results[i] is true, or an error string for target i
+		sendResultToServer(requestId, {
+			success = succeeded == count,
+			updated = succeeded,
+			results = results,
+			deadline_exceeded = deadlineExceeded,
+		})
+	end
+end
+-- --- END: Bulk Set Properties Handler --- --
+
+local handleExecuteBatch -- Defined after executeCommand, which it calls for each step
+
 local function executeCommand(commandData)
 	if not commandData then
 		warn("Vibe Blocks MCP Plugin: エラー - 無効なコマンドデータ (nil)")
@@ -1730,6 +2318,7 @@ local function executeCommand(commandData)
 		-- request_idをdata内に移動
 		local data = commandData.data or {}
 		data.request_id = commandData.request_id
+		data.deadline = commandData.deadline
 		handleSetEnvironment(data) -- Pass the 'data' part of the command
 
 	elseif action == "create_instance" then
@@ -1829,7 +2418,7 @@ local function executeCommand(commandData)
 			newInstance.Parent = parent
 			local path = getFullPath(newInstance)
 			debugLog("インスタンス作成完了: " .. path)
-			return {success = true, path = path}
+			return {success = true, path = path, handle = getInstanceHandle(newInstance)}
 		end)
 		
 		-- 実行結果をすぐに送信
@@ -1857,108 +2446,126 @@ local function executeCommand(commandData)
 		-- request_idをdata内に移動
 		local data = commandData.data or {}
 		data.request_id = commandData.request_id
+		data.deadline = commandData.deadline
 		handleDeleteInstance(data)
 
 	elseif action == "set_property" then
 		-- request_idをdata内に移動
 		local data = commandData.data or {}
 		data.request_id = commandData.request_id
+		data.deadline = commandData.deadline
 		handleSetProperty(data)
 
 	elseif action == "move_instance" then
 		-- request_idをdata内に移動
 		local data = commandData.data or {}
 		data.request_id = commandData.request_id
+		data.deadline = commandData.deadline
 		handleMoveInstance(data)
 
 	elseif action == "clone_instance" then
 		-- request_idをdata内に移動
 		local data = commandData.data or {}
 		data.request_id = commandData.request_id
+		data.deadline = commandData.deadline
 		handleCloneInstance(data)
 
 	elseif action == "create_script" then
 		-- request_idをdata内に移動
 		local data = commandData.data or {}
 		data.request_id = commandData.request_id
+		data.deadline = commandData.deadline
 		handleCreateScript(data)
 
 	elseif action == "spawn_npc" then
 		-- request_idをdata内に移動
 		local data = commandData.data or {}
 		data.request_id = commandData.request_id
+		data.deadline = commandData.deadline
 		handleSpawnNpc(data)
 
 	elseif action == "scale_model" then
 		-- request_idをdata内に移動
 		local data = commandData.data or {}
 		data.request_id = commandData.request_id
+		data.deadline = commandData.deadline
 		handleScaleModel(data)
 
 	elseif action == "play_animation" then
 		-- request_idをdata内に移動
 		local data = commandData.data or {}
 		data.request_id = commandData.request_id
+		data.deadline = commandData.deadline
 		handlePlayAnimation(data)
 
 	elseif action == "send_chat" then
 		-- request_idをdata内に移動
 		local data = commandData.data or {}
 		data.request_id = commandData.request_id
+		data.deadline = commandData.deadline
 		handleSendChat(data)
 
 	elseif action == "teleport_player" then
 		-- request_idをdata内に移動
 		local data = commandData.data or {}
 		data.request_id = commandData.request_id
+		data.deadline = commandData.deadline
 		handleTeleportPlayer(data)
 
 	elseif action == "set_player_position" then
 		-- request_idをdata内に移動
 		local data = commandData.data or {}
 		data.request_id = commandData.request_id
+		data.deadline = commandData.deadline
 		handleSetPlayerPosition(data)
 
 	elseif action == "list_children" then
 		-- request_idをdata内に移動
 		local data = commandData.data or {}
 		data.request_id = commandData.request_id
+		data.deadline = commandData.deadline
 		handleListChildren(data)
 
 	elseif action == "get_property" then
 		-- request_idをdata内に移動
 		local data = commandData.data or {}
 		data.request_id = commandData.request_id
+		data.deadline = commandData.deadline
 		handleGetProperty(data)
 
 	elseif action == "find_instances" then
 		-- request_idをdata内に移動
 		local data = commandData.data or {}
 		data.request_id = commandData.request_id
+		data.deadline = commandData.deadline
 		handleFindInstances(data)
 
 	elseif action == "edit_script" then
 		-- request_idをdata内に移動
 		local data = commandData.data or {}
 		data.request_id = commandData.request_id
+		data.deadline = commandData.deadline
 		handleEditScript(data)
 
 	elseif action == "delete_script" then
 		-- request_idをdata内に移動
 		local data = commandData.data or {}
 		data.request_id = commandData.request_id
+		data.deadline = commandData.deadline
 		handleDeleteScript(data)
 
 	elseif action == "set_primary_part" then
 		-- request_idをdata内に移動
 		local data = commandData.data or {}
 		data.request_id = commandData.request_id
+		data.deadline = commandData.deadline
 		handleSetPrimaryPart(data)
 
 	elseif action == "execute_script_in_studio" then
 		-- request_idをdata内に移動
 		local data = commandData.data or {}
 		data.request_id = commandData.request_id
+		data.deadline = commandData.deadline
 		handleExecuteScriptInStudio(data)
 
 	-- <<< ADD: New action routing >>>
@@ -1966,13 +2573,179 @@ local function executeCommand(commandData)
 		-- request_idをdata内に移動
 		local data = commandData.data or {}
 		data.request_id = commandData.request_id
+		data.deadline = commandData.deadline
 		handleModifyChildren(data)
 
+	elseif action == "create_instances_bulk" then
+		-- request_idをdata内に移動
+		local data = commandData.data or {}
+		data.request_id = commandData.request_id
+		data.deadline = commandData.deadline
+		handleCreateInstancesBulk(data)
+
+	elseif action == "set_properties_bulk" then
+		-- request_idをdata内に移動
+		local data = commandData.data or {}
+		data.request_id = commandData.request_id
+		data.deadline = commandData.deadline
+		handleSetPropertiesBulk(data)
+
+	elseif action == "execute_batch" then
+		-- request_idをdata内に移動
+		local data = commandData.data or {}
+		data.request_id = commandData.request_id
+		data.deadline = commandData.deadline
+		handleExecuteBatch(data)
+
 	else
 		print("Vibe Blocks MCP Plugin: Unknown command action received: " .. tostring(action))
 	end
 end
 
+-- --- NEW: Execute Batch Handler --- --
+
+-- Path of the instance a step created/cloned/returned, used for "$N" references
+local function getStepResultPath(stepResult)
+	if type(stepResult) ~= "table" then
+		return nil
+	end
+	-- Prefer handles: they stay valid even if a sibling has the same name
+	return stepResult.handle or stepResult.clone_handle or stepResult.path or stepResult.clone_path
+end
+
+-- Replaces "$N" / "$N.Child.Path" strings with the path produced by step N (1-based)
+local function resolveStepReferences(value, stepResults)
+	if type(value) == "string" then
+		local stepIndex, suffix = string.match(value, "^%$(%d+)(.*)$")
+		if stepIndex then
+			local refPath = getStepResultPath(stepResults[tonumber(stepIndex)])
+			if not refPath then
+				error("Reference '" .. value .. "' does not point to an earlier step that produced an instance path")
+			end
+			return refPath .. suffix
+		end
+		return value
+	elseif type(value) == "table" then
+		local resolved = {}
+		for key, item in pairs(value) do
+			resolved[key] = resolveStepReferences(item, stepResults)
+		end
+		return resolved
+	end
+	return value
+end
+
+local function isStepFailure(stepResult)
+	return type(stepResult) == "table" and (stepResult.error ~= nil or stepResult.error_message ~= nil or stepResult.success == false)
+end
+
+handleExecuteBatch = function(data)
+	local steps = data.steps
+	local requestId = data.request_id
+	local useWaypoint = data.use_waypoint ~= false
+	local stopOnError = data.stop_on_error ~= false
+	local rollbackOnError = data.rollback_on_error == true
+	local waypointName = data.waypoint_name or "Vibe Blocks MCP Batch"
+
+	if type(steps) ~= "table" or #steps == 0 then
+		if requestId then sendResultToServer(requestId, { error = "Missing or empty 'steps' list in execute_batch data." }) end
+		return
+	end
+
+	-- Prefer the recording API (supports rollback); fall back to plain waypoints
+	local recordingId = nil
+	if useWaypoint then
+		local recOk, recResult = pcall(function() return ChangeHistoryService:TryBeginRecording(waypointName) end)
+		if recOk and recResult then
+			recordingId = recResult
+		else
+			pcall(function() ChangeHistoryService:SetWaypoint(waypointName .. " (before)") end)
+		end
+	end
+
+	print(string.format("Vibe Blocks MCP Plugin: Executing batch of %d steps for request ID %s", #steps, tostring(requestId)))
+
+	local stepResults = {}
+	local outcome = {}
+	local failedCount = 0
+	local stopped = false
+	local deadlineExceeded = false
+
+	-- Collect step results locally while the batch runs
+	local previousCapture = stepResultCapture
+	stepResultCapture = {}
+
+	for index, step in ipairs(steps) do
+		local stepRecord = { index = index, action = type(step) == "table" and step.action or nil }
+		if not stopped and isPastDeadline(data.deadline) then
+			-- The caller has given up; don't spend Studio time on the rest
+			stopped = true
+			deadlineExceeded = true
+		end
+		if stopped then
+			stepRecord.skipped = true
+		elseif type(step) ~= "table" or type(step.action) ~= "string" then
+			stepRecord.success = false
+			stepRecord.result = { error = "Step must be an object with an 'action' string." }
+		elseif step.action == "execute_batch" then
+			stepRecord.success = false
+			stepRecord.result = { error = "Nested execute_batch steps are not supported." }
+		else
+			local stepRequestId = tostring(requestId) .. ":" .. index
+			local ok, err = pcall(function()
+				local stepData = resolveStepReferences(step.data or {}, stepResults)
+				executeCommand({ action = step.action, data = stepData, request_id = stepRequestId, deadline = data.deadline })
+			end)
+			local stepResult = stepResultCapture[stepRequestId]
+			stepResultCapture[stepRequestId] = nil
+			if not ok then
+				stepResult = { error = tostring(err) }
+			elseif stepResult == nil then
+				-- Some handlers only log; treat completion without a report as success
+				stepResult = { success = true, reported = false }
+			end
+			stepResults[index] = stepResult
+			stepRecord.result = stepResult
+			stepRecord.success = not isStepFailure(stepResult)
+		end
+
+		if stepRecord.success == false then
+			failedCount = failedCount + 1
+			if stopOnError then
+				stopped = true
+			end
+		end
+		table.insert(outcome, stepRecord)
+	end
+
+	stepResultCapture = previousCapture
+
+	local rolledBack = false
+	if recordingId then
+		local operation = Enum.FinishRecordingOperation.Commit
+		if failedCount > 0 and rollbackOnError then
+			operation = Enum.FinishRecordingOperation.Cancel
+			rolledBack = true
+		end
+		pcall(function() ChangeHistoryService:FinishRecording(recordingId, operation) end)
+	elseif useWaypoint then
+		pcall(function() ChangeHistoryService:SetWaypoint(waypointName) end)
+	end
+
+	print(string.format("Vibe Blocks MCP Plugin: Batch finished - %d steps, %d failed%s%s", #steps, failedCount, rolledBack and " (rolled back)" or "", deadlineExceeded and " (deadline exceeded)" or ""))
+
+	if requestId then
+		sendResultToServer(requestId, {
+			success = failedCount == 0 and not deadlineExceeded,
+			steps = outcome,
+			failed_count = failedCount,
+			rolled_back = rolledBack,
+			deadline_exceeded = deadlineExceeded,
+		})
+	end
+end
+-- --- END: Execute Batch Handler --- --
+
 local COMMAND_HANDLERS = {
 	set_environment = handleSetEnvironment,
 	create_instance = handleCreateInstance,
@@ -1995,28 +2768,36 @@ local COMMAND_HANDLERS = {
 	set_primary_part = handleSetPrimaryPart,
 	execute_script_in_studio = handleExecuteScriptInStudio,
 	modify_children = handleModifyChildren, -- <<< REGISTER: New handler >>>
+	create_instances_bulk = handleCreateInstancesBulk,
+	set_properties_bulk = handleSetPropertiesBulk,
+	execute_batch = handleExecuteBatch,
 }
 
 
-local function pollServer()
-    if not isEnabled then
-        return
-    end
-    
+-- One poll round trip plus execution of whatever it returned (called via pollServer)
+local function pollAndExecute()
     local currentTime = tick()
-    if currentTime - lastPollTime < POLLING_INTERVAL then
-        return
-    end
-    
     lastPollTime = currentTime
     
+    local pollUrl = USE_LONG_POLL and LONG_POLL_URL or BATCH_POLL_URL
     local success, response = pcall(function()
-        return HttpService:GetAsync(SERVER_URL)
+        return HttpService:GetAsync(pollUrl)
     end)
+    local pollDuration = tick() - currentTime
     
     wasConnected = isConnected
     isConnected = success
     
+    -- Re-poll right away after a long-poll answer; fall back to the fixed interval
+    -- on errors or when the server answered empty without holding the request.
+    if not success or not USE_LONG_POLL then
+        nextPollDelay = POLLING_INTERVAL
+    elseif (response == "" or response == "{}" or response == "[]" or response == '{"commands":[]}') and pollDuration < MIN_LONG_POLL_HOLD then
+        nextPollDelay = POLLING_INTERVAL
+    else
+        nextPollDelay = 0
+    end
+    
     -- 接続状態が変化した時のみログを表示
     if isConnected ~= wasConnected then
         if isConnected then
@@ -2046,31 +2827,81 @@ local function pollServer()
             return
         end
         
-        -- 配列の場合は最初の要素を使用（サーバーが配列として送ってくる場合）
-        if decodedCommand and type(decodedCommand) == "table" then
-            if #decodedCommand > 0 then
-                -- 配列として送られてきた場合、最初の要素を使用
-                debugLog("配列形式のレスポンス検出、最初の要素を使用")
-                decodedCommand = decodedCommand[1]
-            elseif next(decodedCommand) == nil then
-                -- 空のテーブル/オブジェクトの場合
-                debugLog("空のオブジェクト受信、処理スキップ")
-                return
-            end
+        -- Normalise the three response shapes into a list of commands:
+        -- {"commands": [...]} (batch), a bare array, or a single command object (older servers)
+        local commands
+        if type(decodedCommand) ~= "table" then
+            print("Vibe Blocks MCP Plugin: エラー - コマンドにactionがありません")
+            debugLog("受信データ: " .. response)
+            return
+        elseif decodedCommand.commands then
+            commands = decodedCommand.commands
+        elseif #decodedCommand > 0 then
+            debugLog("配列形式のレスポンス検出")
+            commands = decodedCommand
+        elseif next(decodedCommand) == nil then
+            -- 空のテーブル/オブジェクトの場合
+            debugLog("空のオブジェクト受信、処理スキップ")
+            return
+        else
+            commands = { decodedCommand }
+        end
+        
+        if #commands == 0 then
+            debugLog("空のコマンドバッチ受信、処理スキップ")
+            return
         end
         
-        if decodedCommand and decodedCommand.action then
-            debugLog("コマンドタイプ: " .. decodedCommand.action)
-            if decodedCommand.request_id then
-                debugLog("リクエストID: " .. decodedCommand.request_id)
+        -- Drain the whole batch in this tick and report all results in one POST
+        resultBatch = {}
+        for _, command in ipairs(commands) do
+            if command and command.action then
+                debugLog("コマンドタイプ: " .. command.action)
+                if command.request_id then
+                    debugLog("リクエストID: " .. command.request_id)
+                end
+                
+                -- コマンド実行 (skip work whose caller has already timed out)
+                local execSuccess, execError = true, nil
+                if isPastDeadline(command.deadline) then
+                    debugLog("期限切れコマンドをスキップ: " .. tostring(command.request_id))
+                else
+                    execSuccess, execError = pcall(executeCommand, command)
+                end
+                if not execSuccess then
+                    warn("Vibe Blocks MCP Plugin: Command execution failed: " .. tostring(execError))
+                    if command.request_id then
+                        sendResultToServer(command.request_id, { error = "Plugin error executing command: " .. tostring(execError) })
+                    end
+                end
+            else
+                print("Vibe Blocks MCP Plugin: エラー - コマンドにactionがありません")
+                debugLog("受信データ: " .. response)
             end
-            
-            -- コマンド実行
-            executeCommand(decodedCommand)
-        else
-            print("Vibe Blocks MCP Plugin: エラー - コマンドにactionがありません")
-            debugLog("受信データ: " .. response)
         end
+        flushResultBatch()
+    end
+end
+
+local function pollServer()
+    if not isEnabled or isPolling then
+        return
+    end
+    
+    if tick() - lastPollTime < nextPollDelay then
+        return
+    end
+    
+    -- Stay "polling" until the batch has executed so a yielding handler can't
+    -- let the next Heartbeat start an overlapping poll
+    isPolling = true
+    local ok, err = pcall(pollAndExecute)
+    -- Never strand collected results if the batch loop itself errored
+    flushResultBatch()
+    isPolling = false
+    if not ok then
+        warn("Vibe Blocks MCP Plugin: Poll failed: " .. tostring(err))
+        nextPollDelay = POLLING_INTERVAL
     end
 end
 
@@ -2107,7 +2938,7 @@ local function sendLogsToServer()
 
     local success, response = pcall(function()
         local jsonData = HttpService:JSONEncode(batch)
-        return HttpService:PostAsync(SERVER_LOG_ENDPOINT, jsonData, Enum.HttpContentType.ApplicationJson)
+        return HttpService:PostAsync(SERVER_LOG_ENDPOINT, jsonData, Enum.HttpContentType.ApplicationJson, string.len(jsonData) >= GZIP_POST_THRESHOLD)
     end)
 
     if success then
@@ -2167,12 +2998,247 @@ end
 
 -- --- END: Log Handling Functions --- --
 
+-- --- NEW: Scene Mirror Sync --- --
+-- Streams the instance tree of the main services to the server: one chunked snapshot,
+-- then coalesced change batches ([id, parentId, name, className] upserts, [id] removals).
+local SERVER_SCENE_SNAPSHOT_ENDPOINT = "http://localhost:8001/plugin_scene_snapshot"
+local SERVER_SCENE_EVENTS_ENDPOINT = "http://localhost:8001/plugin_scene_events"
+local SCENE_FLUSH_INTERVAL = 1 -- Seconds between change batches (results also flush them immediately)
+local SCENE_HEARTBEAT_INTERVAL = 5 -- Empty batch so the server knows the mirror is still live
+local SCENE_SNAPSHOT_CHUNK_SIZE = 2000
+local MIRRORED_SERVICES = {
+	"Workspace", "Lighting", "ReplicatedFirst", "ReplicatedStorage", "ServerScriptService",
+	"ServerStorage", "StarterGui", "StarterPack", "StarterPlayer", "Teams", "SoundService", "TextChatService",
+}
+
+local sceneSession = nil
+local sceneSeq = 0
+local sceneRoots = {} -- Service instance -> true
+local sceneRootConnections = {}
+local sceneNameConnections = {} -- Instance -> Name change connection
+local sceneDirty = {} -- Instance -> true, coalesced until the next flush
+local sceneNeedsSnapshot = false
+local isSyncingScene = false
+local lastSceneSendTime = 0
+
+local function isMirroredInstance(instance)
+	local ancestor = instance
+	while ancestor and ancestor.Parent ~= game do
+		ancestor = ancestor.Parent
+	end
+	return ancestor ~= nil and sceneRoots[ancestor] == true
+end
+
+local function sceneRow(instance)
+	local parentId = (instance.Parent == game) and 0 or getInstanceId(instance.Parent)
+	return { getInstanceId(instance), parentId, instance.Name, instance.ClassName }
+end
+
+local function markSceneDirty(instance)
+	sceneDirty[instance] = true
+end
+
+local function watchSceneInstance(instance)
+	if sceneNameConnections[instance] then
+		return
+	end
+	local ok, connection = pcall(function()
+		return instance:GetPropertyChangedSignal("Name"):Connect(function()
+			markSceneDirty(instance)
+		end)
+	end)
+	if ok then
+		sceneNameConnections[instance] = connection
+	end
+end
+
+local function unwatchSceneInstance(instance)
+	local connection = sceneNameConnections[instance]
+	if connection then
+		connection:Disconnect()
+		sceneNameConnections[instance] = nil
+	end
+end
+
+local function postSceneJson(endpoint, payload)
+	local ok, response = pcall(function()
+		local body = HttpService:JSONEncode(payload)
+		return HttpService:PostAsync(endpoint, body, Enum.HttpContentType.ApplicationJson, string.len(body) >= GZIP_POST_THRESHOLD)
+	end)
+	if not ok then
+		debugLog("シーン同期送信失敗: " .. tostring(response))
+		return false
+	end
+	local decodeOk, decoded = pcall(function() return HttpService:JSONDecode(response) end)
+	if decodeOk and type(decoded) == "table" and decoded.status == "resync" then
+		return false
+	end
+	return true
+end
+
+local function sendSceneSnapshot()
+	sceneSession = HttpService:GenerateGUID(false)
+	sceneSeq = 0
+	sceneDirty = {}
+	sceneNeedsSnapshot = false
+
+	-- Services in game:GetChildren() order and descendants in GetDescendants() order, so the
+	-- server's sibling order matches what FindFirstChild/GetChildren see here
+	local rows = {}
+	for _, root in ipairs(game:GetChildren()) do
+		if sceneRoots[root] then
+			table.insert(rows, sceneRow(root))
+			for _, descendant in ipairs(root:GetDescendants()) do
+				watchSceneInstance(descendant)
+				table.insert(rows, sceneRow(descendant))
+			end
+		end
+	end
+
+	local chunkCount = math.max(1, math.ceil(#rows / SCENE_SNAPSHOT_CHUNK_SIZE))
+	for chunkIndex = 0, chunkCount - 1 do
+		local first = chunkIndex * SCENE_SNAPSHOT_CHUNK_SIZE + 1
+		local chunk = table.move(rows, first, math.min(first + SCENE_SNAPSHOT_CHUNK_SIZE - 1, #rows), 1, {})
+		local sent = postSceneJson(SERVER_SCENE_SNAPSHOT_ENDPOINT, {
+			session = sceneSession,
+			chunk_index = chunkIndex,
+			final = chunkIndex == chunkCount - 1,
+			handle_prefix = "@" .. HANDLE_SESSION .. ":", -- Mirror IDs are instance handle IDs
+			nodes = chunk,
+		})
+		if not sent then
+			sceneNeedsSnapshot = true
+			return
+		end
+	end
+	lastSceneSendTime = tick()
+	debugLog("シーンスナップショット送信完了: " .. #rows .. "件")
+end
+
+local function flushSceneEvents()
+	-- pairs() order is arbitrary, so upserts are grouped by parent and sent in that parent's
+	-- GetChildren() order: the server appends new children, keeping sibling order identical
+	local changes = {}
+	local dirtyParents = {} -- Parent -> true
+	local parentOrder = {}
+	for instance in pairs(sceneDirty) do
+		if isMirroredInstance(instance) then
+			watchSceneInstance(instance)
+			local parent = instance.Parent
+			if not dirtyParents[parent] then
+				dirtyParents[parent] = true
+				table.insert(parentOrder, parent)
+			end
+		elseif instanceIds[instance] then
+			unwatchSceneInstance(instance)
+			table.insert(changes, { instanceIds[instance] })
+		end
+	end
+	for _, parent in ipairs(parentOrder) do
+		for _, child in ipairs(parent:GetChildren()) do
+			if sceneDirty[child] then
+				table.insert(changes, sceneRow(child))
+			end
+		end
+	end
+	sceneDirty = {}
+
+	local sent = postSceneJson(SERVER_SCENE_EVENTS_ENDPOINT, {
+		session = sceneSession,
+		seq = sceneSeq + 1,
+		changes = changes,
+	})
+	if sent then
+		sceneSeq = sceneSeq + 1
+	else
+		-- Changes were lost or the server asked for a resync; rebuild from scratch
+		sceneNeedsSnapshot = true
+	end
+	lastSceneSendTime = tick()
+end
+
+flushPendingSceneChanges = function()
+	if not sceneSession or sceneNeedsSnapshot then
+		return
+	end
+	local waited = 0
+	while isSyncingScene and waited < 2 do
+		waited = waited + task.wait()
+	end
+	if isSyncingScene or next(sceneDirty) == nil then
+		return
+	end
+	isSyncingScene = true
+	pcall(flushSceneEvents)
+	isSyncingScene = false
+end
+
+local function sceneTick()
+	if not isEnabled or isSyncingScene or next(sceneRoots) == nil then
+		return
+	end
+	local elapsed = tick() - lastSceneSendTime
+	local hasChanges = next(sceneDirty) ~= nil
+	if not sceneNeedsSnapshot and not (hasChanges and elapsed >= SCENE_FLUSH_INTERVAL) and elapsed < SCENE_HEARTBEAT_INTERVAL then
+		return
+	end
+
+	isSyncingScene = true
+	local ok, err = pcall(function()
+		if sceneNeedsSnapshot then
+			sendSceneSnapshot()
+		else
+			flushSceneEvents()
+		end
+	end)
+	isSyncingScene = false
+	if not ok then
+		warn("Vibe Blocks MCP Plugin: Scene sync failed: " .. tostring(err))
+		sceneNeedsSnapshot = true
+		lastSceneSendTime = tick()
+	end
+end
+
+startSceneSync = function()
+	stopSceneSync()
+	for _, serviceName in ipairs(MIRRORED_SERVICES) do
+		local service = game:FindService(serviceName)
+		if service then
+			sceneRoots[service] = true
+			table.insert(sceneRootConnections, service.DescendantAdded:Connect(function(descendant)
+				watchSceneInstance(descendant)
+				markSceneDirty(descendant)
+			end))
+			table.insert(sceneRootConnections, service.DescendantRemoving:Connect(markSceneDirty))
+		end
+	end
+	sceneNeedsSnapshot = true
+end
+
+stopSceneSync = function()
+	for _, connection in ipairs(sceneRootConnections) do
+		connection:Disconnect()
+	end
+	for _, connection in pairs(sceneNameConnections) do
+		connection:Disconnect()
+	end
+	sceneRootConnections = {}
+	sceneNameConnections = {}
+	sceneRoots = {}
+	sceneDirty = {}
+	sceneSession = nil
+	sceneNeedsSnapshot = false
+end
+-- --- END: Scene Mirror Sync --- --
+
 -- Only run polling loop and connect log service in Studio
 if RunService:IsStudio() then
     -- Connect to Log Service
     LogService.MessageOut:Connect(onMessageOut)
     -- Start polling loop
     RunService.Heartbeat:Connect(pollServer)
+    -- Keep the server's scene mirror in sync
+    RunService.Heartbeat:Connect(sceneTick)
 else
     -- Not in Studio, nothing to do
 end
@@ -0,0 +1,116 @@
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
+
+from .metrics import CLOUD_ASSET_UPLOAD_CACHE
+
+logger = logging.getLogger(__name__)
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+def hash_file(file_path: str) -> str:
+    """sha256 of a file's bytes, read in 1 MiB blocks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def owner_fingerprint(api_key: str) -> str:
+    """Stable, non-reversible id for the API key owner, who is the creator of "me" uploads."""
+    return "apikey:" + hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+class AssetUploadIndex:
+    """Persistent map of (owner, file content sha256, asset type) -> asset ID produced by a finished upload.
+
+    Entries are scoped to an owner (the creator uploads are made for), so an
+    index file shared between API keys or accounts never hands out another
+    creator's asset IDs; an instance only sees its own owner's entries.
+    Stored as a small JSON file, loaded on first use and rewritten atomically
+    on every change. An empty path disables the index. Entries are only
+    added after Open Cloud returned an asset ID, so a failed or timed-out
+    upload is never cached; entries whose asset turns out to be gone can be
+    dropped with invalidate().
+    """
+
+    def __init__(self, path: str, owner: str):
+        self.path = path
+        self.owner = owner
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def _key(self, content_hash: str, asset_type: str) -> str:
+        return f"{self.owner}:{asset_type.lower()}:{content_hash}"
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            self._entries = {}
+            if self.enabled and os.path.exists(self.path):
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        self._entries = json.load(f).get("entries", {})
+                except (OSError, ValueError, AttributeError) as e:
+                    logger.warning(f"Ignoring unreadable asset upload index {self.path}: {e}")
+        return self._entries
+
+    def _save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "entries": self._load()}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """This owner's entries."""
+        return {key: entry for key, entry in self._load().items() if entry.get("owner") == self.owner}
+
+    def __len__(self) -> int:
+        return len(self.entries())
+
+    def get(self, content_hash: str, asset_type: str) -> Optional[Dict[str, Any]]:
+        """Returns the entry for this content and type (counting a hit) or None (counting a miss)."""
+        if not self.enabled:
+            return None
+        entry = self._load().get(self._key(content_hash, asset_type))
+        CLOUD_ASSET_UPLOAD_CACHE.labels("hit" if entry else "miss").inc()
+        return entry
+
+    def put(self, content_hash: str, asset_type: str, asset_id: Any, display_name: str, file_name: str) -> None:
+        if not self.enabled:
+            return
+        self._load()[self._key(content_hash, asset_type)] = {
+            "owner": self.owner,
+            "asset_id": str(asset_id),
+            "asset_type": asset_type,
+            "sha256": content_hash,
+            "display_name": display_name,
+            "file_name": file_name,
+            "uploaded_at": _now(),
+            "verified_at": None,
+        }
+        self._save()
+
+    def mark_verified(self, content_hash: str, asset_type: str) -> None:
+        entry = self._load().get(self._key(content_hash, asset_type))
+        if entry is not None:
+            entry["verified_at"] = _now()
+            self._save()
+
+    def invalidate(self, content_hash: str, asset_type: str) -> bool:
+        """Drops an entry; returns whether there was one."""
+        if self._load().pop(self._key(content_hash, asset_type), None) is None:
+            return False
+        CLOUD_ASSET_UPLOAD_CACHE.labels("stale").inc()
+        self._save()
+        return True
@@ -0,0 +1,106 @@
+import gzip
+import logging
+import zlib
+from typing import Any, Callable, Awaitable, Dict, List, Tuple
+
+from fastapi.responses import JSONResponse, Response
+
+from . import json_codec
+from .metrics import PLUGIN_GZIP_BODIES, PLUGIN_GZIP_RAW_BYTES, PLUGIN_GZIP_BYTES_SAVED
+
+logger = logging.getLogger(__name__)
+
+# Responses smaller than this aren't worth the CPU (and often don't shrink)
+GZIP_MIN_RESPONSE_SIZE = 2048
+# Level 5 gets most of level 9's ratio on JSON at a fraction of the cost
+GZIP_LEVEL = 5
+# Refuse request bodies that inflate past this many bytes (guards against gzip bombs)
+GZIP_MAX_DECOMPRESSED_SIZE = 64 * 1024 * 1024
+
+class _BodyTooLarge(Exception):
+    pass
+
+def _gunzip(data: bytes, max_size: int) -> bytes:
+    """Decompresses a gzip body, raising _BodyTooLarge past max_size and ValueError if it is corrupt."""
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    try:
+        body = decompressor.decompress(data, max_size + 1)
+    except zlib.error as e:
+        raise ValueError(f"Invalid gzip body: {e}") from e
+    if len(body) > max_size or decompressor.unconsumed_tail:
+        raise _BodyTooLarge()
+    if not decompressor.eof:
+        raise ValueError("Truncated gzip body")
+    return body
+
+def record_gzip_savings(direction: str, raw_size: int, wire_size: int) -> None:
+    PLUGIN_GZIP_BODIES.labels(direction).inc()
+    PLUGIN_GZIP_RAW_BYTES.labels(direction).inc(raw_size)
+    PLUGIN_GZIP_BYTES_SAVED.labels(direction).inc(raw_size - wire_size)
+
+class GzipRequestMiddleware:
+    """ASGI middleware that inflates requests sent with Content-Encoding: gzip.
+
+    The body is replaced by its decompressed form (with matching headers) before
+    routing, so endpoints and pydantic models never see the encoding.
+    """
+
+    def __init__(self, app: Callable[..., Awaitable[None]], max_decompressed_size: int = GZIP_MAX_DECOMPRESSED_SIZE):
+        self.app = app
+        self.max_decompressed_size = max_decompressed_size
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers: List[Tuple[bytes, bytes]] = scope["headers"]
+        encoding = next((value for name, value in headers if name == b"content-encoding"), None)
+        if encoding is None or encoding.strip().lower() != b"gzip":
+            await self.app(scope, receive, send)
+            return
+
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        compressed = b"".join(chunks)
+
+        try:
+            body = _gunzip(compressed, self.max_decompressed_size)
+        except _BodyTooLarge:
+            logger.warning(f"Rejected gzip body for {scope.get('path')}: inflates past {self.max_decompressed_size} bytes")
+            await JSONResponse(status_code=413, content={"detail": "Decompressed body too large"})(scope, receive, send)
+            return
+        except ValueError as e:
+            logger.warning(f"Rejected gzip body for {scope.get('path')}: {e}")
+            await JSONResponse(status_code=400, content={"detail": str(e)})(scope, receive, send)
+            return
+
+        record_gzip_savings("request", len(body), len(compressed))
+        headers = [(name, value) for name, value in headers if name not in (b"content-encoding", b"content-length")]
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        scope = dict(scope, headers=headers)
+
+        body_sent = False
+        async def receive_inflated() -> Dict[str, Any]:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive() # Disconnect notifications
+
+        await self.app(scope, receive_inflated, send)
+
+def json_response(content: Any, allow_gzip: bool = False, min_size: int = GZIP_MIN_RESPONSE_SIZE) -> Response:
+    """JSON response, gzip-encoded when allowed, at least min_size bytes, and actually smaller."""
+    body = json_codec.dumps(content)
+    if allow_gzip and len(body) >= min_size:
+        compressed = gzip.compress(body, compresslevel=GZIP_LEVEL)
+        if len(compressed) < len(body):
+            record_gzip_savings("response", len(body), len(compressed))
+            return Response(compressed, media_type="application/json", headers={"Content-Encoding": "gzip"})
+    return Response(body, media_type="application/json")
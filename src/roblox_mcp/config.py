@@ -1,4 +1,5 @@
 import os
+from typing import Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from dotenv import load_dotenv
 
@@ -11,6 +12,30 @@ class Settings(BaseSettings):
     # Optional MCP server settings (if needed)
     mcp_host: str | None = None
     mcp_port: int | None = None
+    # Open Cloud HTTP connection pool (shared client, reused across tool calls)
+    roblox_http_max_connections: int = 20
+    roblox_http_max_keepalive_connections: int = 10
+    roblox_http_keepalive_expiry: float = 30.0
+    roblox_http2: bool = False # Needs the 'h2' package (pip install httpx[http2])
+    # DataStore entry read cache (seconds an entry is served from memory; 0 disables it)
+    roblox_datastore_cache_ttl: float = 15.0
+    roblox_datastore_cache_max_entries: int = 1000
+    # Asset upload index (content hash + asset type -> asset ID); empty disables it
+    roblox_asset_cache_path: str = ".roblox_mcp/asset_uploads.json"
+
+class PluginSettings(BaseSettings):
+    """Studio plugin bridge settings; unlike Settings, nothing here is required (no Open Cloud credentials)."""
+    model_config = SettingsConfigDict(env_file='.env', env_file_encoding='utf-8', extra='ignore')
+
+    # What Studio tools do when the plugin isn't polling: fail at once, or hold the
+    # command up to plugin_reconnect_wait seconds for it to reconnect. Tools can override per call.
+    plugin_disconnected_policy: Literal["fail_fast", "wait"] = "fail_fast"
+    plugin_reconnect_wait: float = 30.0
+
+def load_plugin_config() -> PluginSettings:
+    """Loads the plugin bridge settings from environment variables or .env file."""
+    load_dotenv()
+    return PluginSettings()
 
 def load_config() -> Settings:
     """Loads configuration from environment variables or .env file."""
@@ -0,0 +1,313 @@
+import contextlib
+import gzip
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, List, Callable, Awaitable
+
+from . import json_codec
+from .roblox_client import RobloxClient, RobloxApiError, ordered_bounded_map
+
+logger = logging.getLogger(__name__)
+
+# Archive layout (a directory):
+#   manifest.json                 what was backed up, per-datastore cursors and the list of finished chunks
+#   <nnn>-<nnnnn>.jsonl.gz        chunks: one {"scope", "key", "version", "value", "attributes", "user_ids"} per line
+#   restore.checkpoint.json       only while a restore from this archive is in progress
+# The manifest doubles as the backup checkpoint: it is rewritten (atomically) after every chunk.
+BACKUP_FORMAT = "roblox-mcp-datastore-backup"
+BACKUP_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+RESTORE_CHECKPOINT_NAME = "restore.checkpoint.json"
+
+RESTORE_MODES = ("overwrite", "match_version", "create_only")
+CONFLICT_STATUS_CODES = (409, 412) # Version / exclusive-create precondition failed
+
+ProgressCallback = Callable[[int, Optional[int]], Awaitable[None]]
+
+class BackupError(ValueError):
+    """The archive is missing, incomplete, corrupt or doesn't match the requested operation."""
+
+def normalize_timestamp(value: str) -> str:
+    """Parses an ISO 8601 timestamp and returns it as RFC 3339 UTC ('...Z'); naive times are taken as UTC."""
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00").replace("z", "+00:00"))
+    except ValueError as e:
+        raise BackupError(f"Invalid timestamp '{value}': expected ISO 8601, e.g. 2025-01-31T12:00:00Z") from e
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+def _write_json_atomic(path: str, data: Dict[str, Any]) -> None:
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def _read_json(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _write_chunk(path: str, lines: List[bytes]) -> Dict[str, Any]:
+    tmp_path = path + ".tmp"
+    with gzip.open(tmp_path, "wb", compresslevel=6) as f:
+        f.write(b"".join(lines))
+    with open(tmp_path, "rb") as f:
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    with open(path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    return {"file": os.path.basename(path), "entries": len(lines), "bytes": os.path.getsize(path), "sha256": digest}
+
+def _read_chunk(backup_dir: str, chunk: Dict[str, Any]) -> List[Dict[str, Any]]:
+    path = os.path.join(backup_dir, chunk["file"])
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except FileNotFoundError as e:
+        raise BackupError(f"Chunk {chunk['file']} listed in the manifest is missing.") from e
+    if hashlib.sha256(raw).hexdigest() != chunk["sha256"]:
+        raise BackupError(f"Chunk {chunk['file']} is corrupt (sha256 mismatch).")
+    return [json_codec.loads(line) for line in gzip.decompress(raw).splitlines() if line]
+
+def load_manifest(backup_dir: str) -> Dict[str, Any]:
+    manifest = _read_json(os.path.join(backup_dir, MANIFEST_NAME))
+    if manifest is None:
+        raise BackupError(f"No {MANIFEST_NAME} in {backup_dir}.")
+    if manifest.get("format") != BACKUP_FORMAT or manifest.get("format_version") != BACKUP_FORMAT_VERSION:
+        raise BackupError(f"{backup_dir} is not a {BACKUP_FORMAT} v{BACKUP_FORMAT_VERSION} archive.")
+    return manifest
+
+async def backup_datastores(client: RobloxClient, backup_dir: str, datastore_names: List[str], scope: str = "global",
+                            all_scopes: bool = False, as_of: Optional[str] = None, concurrency: int = 8,
+                            chunk_entries: int = 1000, page_size: int = 100,
+                            progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+    """Snapshots standard datastores into a chunked, gzip-compressed archive directory with a manifest.
+
+    Each entry is stored with its version, attributes and user IDs. With
+    as_of (RFC 3339), every listed key is read as of that time from its
+    version history instead of its current value; keys that did not exist
+    then are skipped. Keys deleted outright since as_of are not listed by
+    Open Cloud and so cannot be recovered this way.
+
+    Keys are listed with next-page prefetch and values fetched with bounded
+    concurrency (all requests share the client's datastore rate limit).
+    A chunk always ends on a page boundary, and the manifest records the
+    cursor after it, so rerunning the same backup into the same directory
+    resumes after the last finished chunk.
+    """
+    if as_of:
+        as_of = normalize_timestamp(as_of)
+    os.makedirs(backup_dir, exist_ok=True)
+    manifest_path = os.path.join(backup_dir, MANIFEST_NAME)
+    identity = {"universe_id": client.universe_id, "scope": None if all_scopes else scope, "all_scopes": all_scopes,
+                "as_of": as_of, "datastore_names": list(datastore_names)}
+    manifest = _read_json(manifest_path)
+    resumed = manifest is not None
+    if manifest is not None:
+        for field, expected in identity.items():
+            if manifest.get(field) != expected:
+                raise BackupError(f"{backup_dir} already holds a different backup ({field}: {manifest.get(field)!r}, "
+                                  f"requested {expected!r}). Choose an empty directory.")
+        logger.info(f"Resuming backup into {backup_dir}")
+    else:
+        manifest = dict(identity, format=BACKUP_FORMAT, format_version=BACKUP_FORMAT_VERSION,
+                        created_at=datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"), complete=False,
+                        datastores=[{"name": name, "cursor": None, "complete": False, "entries": 0, "skipped": 0, "chunks": []}
+                                    for name in datastore_names])
+        _write_json_atomic(manifest_path, manifest)
+
+    for store_index, store in enumerate(manifest["datastores"]):
+        if store["complete"]:
+            continue
+        name = store["name"]
+        logger.info(f"Backing up datastore '{name}' ({store['entries']} entries already saved)")
+
+        async def snapshot(key_info):
+            key_scope = key_info.get("scope") or scope
+            if as_of:
+                return await client.get_datastore_entry_as_of(name, key_info["key"], as_of, scope=key_scope)
+            return await client.get_datastore_entry_snapshot(name, key_info["key"], scope=key_scope)
+
+        buffered: List[bytes] = []
+        buffered_skipped = 0
+
+        def flush_chunk(next_cursor: Optional[str]) -> None:
+            nonlocal buffered, buffered_skipped
+            if buffered:
+                chunk_file = os.path.join(backup_dir, f"{store_index:03d}-{len(store['chunks']):05d}.jsonl.gz")
+                store["chunks"].append(_write_chunk(chunk_file, buffered))
+            store["entries"] += len(buffered)
+            store["skipped"] += buffered_skipped
+            store["cursor"] = next_cursor
+            store["complete"] = next_cursor is None
+            _write_json_atomic(manifest_path, manifest)
+            buffered, buffered_skipped = [], 0
+
+        pages = client.iter_datastore_entry_pages(name, scope=scope, page_size=page_size, cursor=store["cursor"],
+                                                  all_scopes=all_scopes)
+        async with contextlib.aclosing(pages):
+            async for keys, _, next_cursor in pages:
+                async with contextlib.aclosing(ordered_bounded_map(keys, snapshot, concurrency)) as snapshots:
+                    async for _, key_info, entry, error in snapshots:
+                        if error is not None:
+                            raise RobloxApiError(f"Backup of '{name}' stopped at key '{key_info.get('key')}' "
+                                                 f"(run it again to resume): {error}",
+                                                 status_code=getattr(error, "status_code", None)) from error
+                        if entry is None:
+                            buffered_skipped += 1
+                            continue
+                        buffered.append(json_codec.dumps({
+                            "scope": key_info.get("scope") or scope, "key": key_info["key"], "version": entry.get("version"),
+                            "value": entry.get("value"), "attributes": entry.get("attributes"), "user_ids": entry.get("user_ids"),
+                        }) + b"\n")
+                if len(buffered) >= chunk_entries or next_cursor is None:
+                    flush_chunk(next_cursor)
+                if progress is not None:
+                    await progress(sum(s["entries"] for s in manifest["datastores"]) + len(buffered), None)
+
+    manifest["complete"] = True
+    _write_json_atomic(manifest_path, manifest)
+    entries = sum(store["entries"] for store in manifest["datastores"])
+    logger.info(f"Backup of {len(manifest['datastores'])} datastores into {backup_dir} complete ({entries} entries)")
+    return {
+        "backup_dir": backup_dir,
+        "datastores": {store["name"]: store["entries"] for store in manifest["datastores"]},
+        "entries": entries,
+        "skipped": sum(store["skipped"] for store in manifest["datastores"]),
+        "chunks": sum(len(store["chunks"]) for store in manifest["datastores"]),
+        "bytes": sum(chunk["bytes"] for store in manifest["datastores"] for chunk in store["chunks"]),
+        "resumed": resumed,
+    }
+
+async def restore_datastores(client: RobloxClient, backup_dir: str, datastore_names: Optional[List[str]] = None,
+                             mode: str = "match_version", concurrency: int = 8,
+                             progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+    """Replays a backup archive into the universe's datastores with bounded concurrency.
+
+    Modes:
+      overwrite      write every entry unconditionally.
+      match_version  read the current version first; skip entries that are
+                     unchanged since the backup, and write the rest with
+                     matchVersion (or exclusive create if the key is gone),
+                     so a concurrent writer is reported as a conflict
+                     instead of being clobbered.
+      create_only    exclusive create: only restore keys that don't exist.
+    Chunks are verified against their sha256 before use. Finished chunks,
+    and the finished entries of chunks that had failures, are recorded in
+    restore.checkpoint.json; rerunning the same restore skips them and only
+    retries the failed entries, so every entry is counted once.
+    """
+    if mode not in RESTORE_MODES:
+        raise BackupError(f"Unknown restore mode '{mode}'. Choose one of: {', '.join(RESTORE_MODES)}.")
+    manifest = load_manifest(backup_dir)
+    if not manifest.get("complete"):
+        raise BackupError(f"The backup in {backup_dir} is incomplete; run the backup again to finish it first.")
+    stores = manifest["datastores"]
+    if datastore_names:
+        unknown = sorted(set(datastore_names) - {store["name"] for store in stores})
+        if unknown:
+            raise BackupError(f"Not in this backup: {', '.join(unknown)}.")
+        stores = [store for store in stores if store["name"] in datastore_names]
+
+    checkpoint_file = os.path.join(backup_dir, RESTORE_CHECKPOINT_NAME)
+    identity = {"universe_id": client.universe_id, "mode": mode, "datastore_names": [store["name"] for store in stores]}
+    state = _read_json(checkpoint_file)
+    resumed = state is not None
+    if state is not None:
+        for field, expected in identity.items():
+            if state.get(field) != expected:
+                raise BackupError(f"{checkpoint_file} is from a different restore ({field}: {state.get(field)!r}, "
+                                  f"requested {expected!r}). Delete it to start over.")
+        logger.info(f"Resuming restore from {backup_dir} ({len(state['done_chunks'])} chunks already restored)")
+    else:
+        state = dict(identity, done_chunks=[], partial_chunks={}, written=0, unchanged=0, conflicts=0)
+
+    total = sum(store["entries"] for store in stores)
+    done = (sum(chunk["entries"] for store in stores for chunk in store["chunks"] if chunk["file"] in state["done_chunks"])
+            + sum(len(indexes) for indexes in state["partial_chunks"].values()))
+    failed = 0
+    errors: List[str] = []
+
+    for store in stores:
+        name = store["name"]
+
+        async def restore_one(entry):
+            key, key_scope = entry["key"], entry.get("scope") or "global"
+            match_version, exclusive = None, False
+            if mode == "create_only":
+                exclusive = True
+            elif mode == "match_version":
+                current = await client.get_datastore_entry_snapshot(name, key, scope=key_scope)
+                if current is None:
+                    exclusive = True
+                elif current.get("version") and current.get("version") == entry.get("version"):
+                    return "unchanged"
+                else:
+                    match_version = current.get("version")
+            try:
+                await client.set_datastore_entry(name, key, entry.get("value"), scope=key_scope,
+                                                 match_version=match_version, exclude_previous_value=exclusive,
+                                                 user_ids=entry.get("user_ids"), attributes=entry.get("attributes"))
+            except RobloxApiError as e:
+                if e.status_code in CONFLICT_STATUS_CODES:
+                    return "conflict"
+                raise
+            return "written"
+
+        for chunk in store["chunks"]:
+            if chunk["file"] in state["done_chunks"]:
+                continue
+            # Chunk contents are fixed (sha256-checked), so entry indexes identify entries across runs
+            finished = set(state["partial_chunks"].pop(chunk["file"], []))
+            pending = [(index, entry) for index, entry in enumerate(_read_chunk(backup_dir, chunk)) if index not in finished]
+            chunk_failed = 0
+
+            async def restore_indexed(item):
+                return await restore_one(item[1])
+
+            async with contextlib.aclosing(ordered_bounded_map(pending, restore_indexed, concurrency)) as outcomes:
+                async for _, (index, entry), outcome, error in outcomes:
+                    done += 1
+                    if error is not None:
+                        chunk_failed += 1
+                        if len(errors) < 20:
+                            errors.append(f"{name}/{entry.get('key')}: {error}")
+                        continue
+                    finished.add(index)
+                    if outcome == "written":
+                        state["written"] += 1
+                    elif outcome == "unchanged":
+                        state["unchanged"] += 1
+                    else:
+                        state["conflicts"] += 1
+            failed += chunk_failed
+            if chunk_failed:
+                state["partial_chunks"][chunk["file"]] = sorted(finished)
+            else:
+                state["done_chunks"].append(chunk["file"])
+            _write_json_atomic(checkpoint_file, state)
+            if progress is not None:
+                await progress(done, total)
+
+    if not failed and os.path.exists(checkpoint_file):
+        os.remove(checkpoint_file)
+    logger.info(f"Restore from {backup_dir} ({mode}): {state['written']} written, {state['unchanged']} unchanged, "
+                f"{state['conflicts']} conflicts, {failed} failed")
+    return {
+        "backup_dir": backup_dir,
+        "mode": mode,
+        "entries": total,
+        "written": state["written"],
+        "unchanged": state["unchanged"],
+        "conflicts": state["conflicts"],
+        "failed": failed,
+        "errors": errors,
+        "resumed": resumed,
+    }
@@ -0,0 +1,117 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, List
+
+from .metrics import CLOUD_DATASTORE_CACHE
+
+CacheKey = Tuple[int, str, str, str] # (universe_id, datastore_name, scope, entry_key)
+
+class CachedEntry:
+    __slots__ = ("value", "exists", "version", "content_md5", "stored_at")
+
+    def __init__(self, value: Any, exists: bool, version: Optional[str], content_md5: Optional[str], stored_at: float):
+        self.value = value
+        self.exists = exists # False = the key is known not to exist (404 or deleted)
+        self.version = version
+        self.content_md5 = content_md5
+        self.stored_at = stored_at
+
+class DatastoreCache:
+    """Read-through cache for standard DataStore entries, with TTL and LRU eviction.
+
+    Entries are keyed by (universe, datastore, scope, key) and remember the
+    entry version and content-md5 Open Cloud returned, so a write can be
+    checked against (or replace) what was read. Missing keys are cached too.
+    A ttl of 0 disables the cache. Cached values are shared, not copied:
+    callers must not mutate them.
+
+    Reads go through begin_read()/finish_read(): a write (put or invalidate)
+    to a key while a read of it is in flight bumps that key's generation, and
+    the read's result is then not cached, so a slow GET can't replace a
+    newer value with the one it fetched before the write.
+    """
+
+    def __init__(self, ttl: float = 15.0, max_entries: int = 1000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[CacheKey, CachedEntry]" = OrderedDict()
+        self._reads: Dict[CacheKey, List[int]] = {} # key -> [reads in flight, write generation]; only while reads are in flight
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: CacheKey) -> Optional[CachedEntry]:
+        """Returns the fresh entry for key (counting a hit) or None (counting a miss)."""
+        if not self.enabled:
+            return None
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry.stored_at <= self.ttl:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            CLOUD_DATASTORE_CACHE.labels("hit").inc()
+            return entry
+        if entry is not None:
+            del self._entries[key] # Expired
+        self.misses += 1
+        CLOUD_DATASTORE_CACHE.labels("miss").inc()
+        return None
+
+    def begin_read(self, key: CacheKey) -> int:
+        """Registers a read about to hit Open Cloud; pass the returned token to finish_read."""
+        slot = self._reads.setdefault(key, [0, 0])
+        slot[0] += 1
+        return slot[1]
+
+    def finish_read(self, key: CacheKey, token: int, value: Any = None, exists: bool = True, version: Optional[str] = None,
+                    content_md5: Optional[str] = None, store: bool = True) -> None:
+        """Ends a read; caches its result only if store is set and no write to key happened since begin_read."""
+        slot = self._reads.get(key)
+        fresh = slot is not None and slot[1] == token
+        if slot is not None:
+            slot[0] -= 1
+            if slot[0] <= 0:
+                del self._reads[key]
+        if store and fresh:
+            self._store(key, value, exists, version, content_md5)
+
+    def _note_write(self, key: CacheKey) -> None:
+        slot = self._reads.get(key)
+        if slot is not None:
+            slot[1] += 1
+
+    def _store(self, key: CacheKey, value: Any, exists: bool, version: Optional[str], content_md5: Optional[str]) -> None:
+        if not self.enabled:
+            return
+        self._entries[key] = CachedEntry(value, exists, version, content_md5, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def put(self, key: CacheKey, value: Any, exists: bool = True, version: Optional[str] = None,
+            content_md5: Optional[str] = None) -> None:
+        """Records the result of a write (or delete) made through this client."""
+        self._note_write(key)
+        self._store(key, value, exists, version, content_md5)
+
+    def invalidate(self, key: CacheKey) -> None:
+        self._note_write(key)
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+        }
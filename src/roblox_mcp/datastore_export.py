@@ -0,0 +1,124 @@
+import contextlib
+import json
+import logging
+import os
+from typing import Dict, Any, Optional, Callable, Awaitable
+
+from . import json_codec
+from .roblox_client import RobloxClient, RobloxApiError, ordered_bounded_map
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+
+class ExportCheckpointError(ValueError):
+    """The checkpoint next to the output file belongs to a different export."""
+
+def checkpoint_path(output_path: str) -> str:
+    return output_path + CHECKPOINT_SUFFIX
+
+def _write_checkpoint(path: str, state: Dict[str, Any]) -> None:
+    # Write-then-rename so a kill mid-write never leaves a torn checkpoint
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def _load_checkpoint(path: str, identity: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    for field, expected in identity.items():
+        if state.get(field) != expected:
+            raise ExportCheckpointError(f"Checkpoint {path} is for a different export ({field}: {state.get(field)!r}, "
+                                        f"requested {expected!r}). Delete it or choose another output file.")
+    return state
+
+async def export_datastore_jsonl(client: RobloxClient, datastore_name: str, output_path: str, scope: str = "global",
+                                 prefix: Optional[str] = None, all_scopes: bool = False, concurrency: int = 8,
+                                 page_size: int = 100, resume: bool = True,
+                                 progress: Optional[Callable[[int], Awaitable[None]]] = None) -> Dict[str, Any]:
+    """Exports every entry of a standard datastore to a JSONL file, one {"scope", "key", "value"} object per line.
+
+    Keys are listed page by page (the next page is prefetched) and each page's
+    values are fetched concurrently, then written in listing order. After each
+    page the file is flushed and a checkpoint (cursor of the next page, entry
+    count, file size) is written next to it; a later call with resume=True
+    truncates anything past the checkpoint and continues from that cursor
+    (or starts over if the file is shorter than the checkpoint says).
+    If a value can't be fetched the export stops before writing that page, so
+    resuming retries it. Entries deleted between listing and fetching are
+    skipped. The checkpoint is removed once the last page is written.
+    """
+    identity = {"universe_id": client.universe_id, "datastore": datastore_name, "scope": None if all_scopes else scope,
+                "prefix": prefix, "all_scopes": all_scopes}
+    checkpoint_file = checkpoint_path(output_path)
+    state = _load_checkpoint(checkpoint_file, identity) if resume else None
+    if state is not None:
+        size = os.path.getsize(output_path) if os.path.exists(output_path) else None
+        if size is None or size < state["bytes_written"]:
+            # The file was replaced or cut short since the checkpoint; truncate() would pad it with NULs
+            logger.warning(f"Checkpoint {checkpoint_file} expects {state['bytes_written']} bytes in {output_path} "
+                           f"but it has {size if size is not None else 'none'}; starting the export over")
+            state = None
+    resumed = state is not None
+    if state is None:
+        state = dict(identity, cursor=None, entries=0, skipped=0, pages=0, bytes_written=0)
+        if os.path.exists(checkpoint_file):
+            os.remove(checkpoint_file) # A fresh export must not leave an older checkpoint to resume from later
+
+    with open(output_path, "r+b" if resumed else "wb") as f:
+        f.truncate(state["bytes_written"]) # Drop a page written after the last checkpoint
+        f.seek(state["bytes_written"])
+        if resumed:
+            logger.info(f"Resuming export of '{datastore_name}' to {output_path} after {state['entries']} entries")
+
+        async def fetch_value(key_info):
+            return await client.get_datastore_entry(datastore_name, key_info["key"],
+                                                    scope=key_info.get("scope") or scope, use_cache=False)
+
+        async def page_lines(keys):
+            lines = []
+            skipped = 0
+            async with contextlib.aclosing(ordered_bounded_map(keys, fetch_value, concurrency)) as values:
+                async for _, key_info, value, error in values:
+                    if error is not None:
+                        raise RobloxApiError(f"Export stopped at key '{key_info.get('key')}' after {state['entries']} entries "
+                                             f"(run again with resume to continue): {error}",
+                                             status_code=getattr(error, "status_code", None)) from error
+                    if value is None:
+                        skipped += 1 # Deleted since it was listed
+                        continue
+                    lines.append(json_codec.dumps({"scope": key_info.get("scope") or scope, "key": key_info["key"],
+                                                   "value": value}) + b"\n")
+            return lines, skipped
+
+        pages = client.iter_datastore_entry_pages(datastore_name, scope=scope, prefix=prefix, page_size=page_size,
+                                                  cursor=state["cursor"], all_scopes=all_scopes)
+        async with contextlib.aclosing(pages):
+            async for keys, _, next_cursor in pages:
+                lines, skipped = await page_lines(keys)
+                f.write(b"".join(lines))
+                f.flush()
+                os.fsync(f.fileno())
+                state.update(cursor=next_cursor, entries=state["entries"] + len(lines), skipped=state["skipped"] + skipped,
+                             pages=state["pages"] + 1, bytes_written=f.tell())
+                if next_cursor:
+                    _write_checkpoint(checkpoint_file, state)
+                if progress is not None:
+                    await progress(state["entries"])
+
+    if os.path.exists(checkpoint_file):
+        os.remove(checkpoint_file)
+    logger.info(f"Exported {state['entries']} entries from '{datastore_name}' to {output_path} ({state['bytes_written']} bytes)")
+    return {
+        "output_path": output_path,
+        "entries": state["entries"],
+        "skipped": state["skipped"],
+        "pages": state["pages"],
+        "bytes": state["bytes_written"],
+        "resumed": resumed,
+    }
@@ -0,0 +1,58 @@
+from typing import Dict, Any, List
+
+# Columnar encoding the plugin uses for list_children / find_instances when the
+# command asks for format="columnar". Instead of one {name, className, path, handle}
+# object per instance it sends parallel arrays (all indexes 0-based):
+#
+#   {"format": "columnar", "count": N,
+#    "names": [...], "class_index": [...], "classes": ["Part", ...],
+#    "parent_index": [...], "parents": ["Workspace.Model", ...],
+#    "handle_prefix": "@3fa9c2d1:", "ids": [...],
+#    "properties": {"Anchored": [...]}, "missing_properties": {"Anchored": [3, 7]}}
+#
+# Class names are interned, and paths are "<parents[parent_index]>.<name>", so neither
+# full paths nor key names repeat per row. A parent of "" (game itself, or no parent
+# at all) means the path is just the name, matching Instance:GetFullName().
+
+COLUMNAR_FORMAT = "columnar"
+
+def is_columnar_listing(value: Any) -> bool:
+    return isinstance(value, dict) and value.get("format") == COLUMNAR_FORMAT
+
+def expand_instance_listing(value: Any) -> Any:
+    """Turns a columnar listing into the list of instance dicts the row format uses.
+
+    Anything that isn't a columnar listing (the row format from older plugins,
+    error dicts) is returned unchanged, so callers can always pass the raw result.
+    """
+    if not is_columnar_listing(value):
+        return value
+
+    names: List[str] = value.get("names") or []
+    classes: List[str] = value.get("classes") or []
+    class_index: List[int] = value.get("class_index") or []
+    parents: List[str] = value.get("parents") or []
+    parent_index: List[int] = value.get("parent_index") or []
+    ids: List[Any] = value.get("ids") or []
+    handle_prefix = value.get("handle_prefix")
+    property_columns: Dict[str, List[Any]] = value.get("properties") or {}
+    missing = {name: set(indexes) for name, indexes in (value.get("missing_properties") or {}).items()}
+
+    # Each parent path gets its separator once, not once per row
+    parent_prefixes = [f"{parent}." if parent else "" for parent in parents]
+    entries = []
+    for i, name in enumerate(names):
+        entry = {
+            "name": name,
+            "className": classes[class_index[i]],
+            "path": parent_prefixes[parent_index[i]] + name,
+        }
+        if handle_prefix and i < len(ids):
+            entry["handle"] = f"{handle_prefix}{ids[i]}"
+        if property_columns:
+            entry["properties"] = {
+                prop: column[i] for prop, column in property_columns.items()
+                if i not in missing.get(prop, ())
+            }
+        entries.append(entry)
+    return entries
@@ -0,0 +1,89 @@
+import json
+import math
+from typing import Any, Union
+
+# JSON for the plugin bridge and tool output. orjson is used when installed
+# (pip install orjson); otherwise everything goes through the standard library.
+# Compact output matches FastAPI's JSONResponse byte for byte (UTF-8, no spaces),
+# except that orjson spells float exponents "2e-7" where json writes "2e-07"
+# (same value once decoded). Where orjson's behaviour differs, the other
+# backend's rules win, so results never depend on which one is installed:
+#   - loads: orjson turns integers beyond 64 bits into (lossy) floats, so input
+#     with a run of 19+ digits is decoded by the standard library (exact ints).
+#   - dumps: NaN/Infinity raise ValueError (as JSONResponse does); orjson would
+#     silently write null. Integers beyond 64 bits are encoded by the stdlib.
+#   - dumps_text: NaN/Infinity are written as null, on both backends.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+# 19 digits can already exceed int64 (and 20 can exceed uint64); digits inside
+# strings or fractions also match, which only costs a slower (still exact) decode.
+# Mapping every digit to "0" and searching for a run is far cheaper than a regex.
+_DIGIT_MASK = bytes(0x30 if 0x30 <= byte <= 0x39 else 0x20 for byte in range(256))
+_LONG_DIGIT_RUN = b"0" * 19
+
+def _has_long_digit_run(data: bytes) -> bool:
+    return data.translate(_DIGIT_MASK).find(_LONG_DIGIT_RUN) != -1
+
+def _has_non_finite(obj: Any) -> bool:
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(value) for value in obj)
+    return False
+
+def _replace_non_finite(obj: Any) -> Any:
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _replace_non_finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_replace_non_finite(value) for value in obj]
+    return obj
+
+def dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON bytes, as sent to the plugin. Raises ValueError for NaN/Infinity."""
+    if orjson is not None:
+        try:
+            data = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+        else:
+            # orjson writes non-finite floats as null; only output containing null can hide one
+            if b"null" in data and _has_non_finite(obj):
+                raise ValueError("Out of range float values are not JSON compliant")
+            return data
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+def loads(data: Union[bytes, str]) -> Any:
+    if orjson is not None:
+        raw = data.encode("utf-8", "surrogatepass") if isinstance(data, str) else data
+        if not _has_long_digit_run(raw):
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass # Let the standard library decide (it accepts NaN/Infinity) and raise its own error
+    return json.loads(data)
+
+def dumps_text(obj: Any, indent: bool = False) -> str:
+    """JSON text for tool output; indent=True matches json.dumps(obj, indent=2) layout. NaN/Infinity become null."""
+    if orjson is not None:
+        try:
+            option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+            return orjson.dumps(obj, option=option).decode("utf-8")
+        except TypeError:
+            pass
+    try:
+        if indent:
+            return json.dumps(obj, ensure_ascii=False, allow_nan=False, indent=2)
+        return json.dumps(obj, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+    except ValueError:
+        if not _has_non_finite(obj):
+            raise # Not a NaN problem (e.g. a circular reference)
+    return dumps_text(_replace_non_finite(obj), indent)
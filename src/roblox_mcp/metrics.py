@@ -0,0 +1,188 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Dict, Any, Optional, List, Tuple, Callable
+
+# Minimal Prometheus text-format (0.0.4) metrics. Updates are a dict lookup plus
+# an add (histograms: one bisect), so they can stay on in production.
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class _Metric(ABC):
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+
+    def labels(self, *values: Any):
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.label_names):
+                raise ValueError(f"{self.name} expects labels {self.label_names}, got {key}")
+            child = self._children[key] = self._new_child()
+        return child
+
+    @abstractmethod
+    def _new_child(self) -> Any:
+        """Creates the per-label-set value holder."""
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        for key, child in list(self._children.items()):
+            lines.extend(self._render_child(key, child))
+        return lines
+
+    def _render_child(self, key: Tuple[str, ...], child: Any) -> List[str]:
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(child.value)}"]
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+class Gauge(_Metric):
+    """Gauge; set_function() makes it read a live value at scrape time instead."""
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, label_names: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, label_names)
+        self._function: Optional[Callable[[], float]] = None
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self._function = function
+
+    def render(self) -> List[str]:
+        if self._function is not None:
+            self.labels().set(self._function())
+        return super().render()
+
+class _HistogramValue:
+    __slots__ = ("upper_bounds", "bucket_counts", "sum", "count")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self.upper_bounds = upper_bounds
+        self.bucket_counts = [0] * (len(upper_bounds) + 1) # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.bucket_counts[bisect_left(self.upper_bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _render_child(self, key: Tuple[str, ...], child: _HistogramValue) -> List[str]:
+        lines = []
+        cumulative = 0
+        for upper_bound, bucket_count in zip(self.buckets + (float("inf"),), child.bucket_counts):
+            cumulative += bucket_count
+            labels = _format_labels(self.label_names, key, f'le="{_format_value(upper_bound)}"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.label_names, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+        lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: Tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, label_names: Tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, label_names))
+
+    def histogram(self, name: str, documentation: str, label_names: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, label_names, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+REGISTRY = MetricsRegistry()
+
+# --- Plugin bridge ---
+PLUGIN_QUEUE_DEPTH = REGISTRY.gauge("roblox_mcp_plugin_command_queue_depth", "Commands waiting to be picked up by the Studio plugin.")
+PLUGIN_PENDING_RESULTS = REGISTRY.gauge("roblox_mcp_plugin_pending_results", "Commands waiting for a result from the Studio plugin.")
+PLUGIN_CONNECTED = REGISTRY.gauge("roblox_mcp_plugin_connected", "1 while the Studio plugin is polling, else 0.")
+PLUGIN_ROUNDTRIP_SECONDS = REGISTRY.histogram("roblox_mcp_plugin_roundtrip_seconds", "Time from queueing a plugin command to receiving its result.", ("action",))
+PLUGIN_COMMANDS = REGISTRY.counter("roblox_mcp_plugin_commands_total", "Plugin commands by action and outcome (ok, timeout, cancelled, error).", ("action", "outcome"))
+PLUGIN_TIMEOUTS = REGISTRY.counter("roblox_mcp_plugin_command_timeouts_total", "Plugin commands that timed out waiting for a result.", ("action",))
+PLUGIN_POLL_INTERVAL_SECONDS = REGISTRY.histogram("roblox_mcp_plugin_poll_interval_seconds", "Time between the starts of consecutive /plugin_command polls.")
+PLUGIN_POLL_GAP_SECONDS = REGISTRY.histogram("roblox_mcp_plugin_poll_gap_seconds", "Time with no poll outstanding: previous poll's response to the next poll's request.")
+PLUGIN_GZIP_BODIES = REGISTRY.counter("roblox_mcp_plugin_gzip_bodies_total", "Gzip-encoded plugin bodies by direction (request = plugin to server, response = server to plugin).", ("direction",))
+PLUGIN_GZIP_RAW_BYTES = REGISTRY.counter("roblox_mcp_plugin_gzip_raw_bytes_total", "Uncompressed size of gzip-encoded plugin bodies.", ("direction",))
+PLUGIN_GZIP_BYTES_SAVED = REGISTRY.counter("roblox_mcp_plugin_gzip_bytes_saved_total", "Bytes gzip kept off the wire for plugin bodies (uncompressed minus compressed).", ("direction",))
+PLUGIN_CHUNKED_RESULTS = REGISTRY.counter("roblox_mcp_plugin_chunked_results_total", "Results the plugin sent in chunks, by outcome (complete, rejected, invalid, expired).", ("outcome",))
+PLUGIN_CHUNK_BUFFER_BYTES = REGISTRY.gauge("roblox_mcp_plugin_chunk_buffer_bytes", "Bytes held by incomplete chunked result transfers.")
+
+# --- Open Cloud client ---
+# Labelled by API family (see rate_limit.family_for_url) rather than raw URL to keep cardinality bounded
+CLOUD_REQUEST_SECONDS = REGISTRY.histogram("roblox_mcp_cloud_request_seconds", "Open Cloud HTTP request latency.", ("family", "method"))
+CLOUD_RESPONSES = REGISTRY.counter("roblox_mcp_cloud_responses_total", "Open Cloud HTTP responses by status code.", ("family", "method", "status"))
+CLOUD_RETRIES = REGISTRY.counter("roblox_mcp_cloud_retries_total", "Open Cloud request retries.", ("family", "reason"))
+CLOUD_THROTTLED = REGISTRY.counter("roblox_mcp_cloud_throttled_total", "Open Cloud 429 responses.", ("family",))
+CLOUD_DATASTORE_CACHE = REGISTRY.counter("roblox_mcp_cloud_datastore_cache_lookups_total", "DataStore entry cache lookups by result (hit, miss).", ("result",))
+CLOUD_ASSET_UPLOAD_CACHE = REGISTRY.counter("roblox_mcp_cloud_asset_upload_cache_total", "Asset upload index lookups by result (hit, miss, stale).", ("result",))
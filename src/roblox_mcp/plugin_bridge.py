@@ -0,0 +1,281 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Dict, Any, Optional, List
+
+logger = logging.getLogger(__name__)
+
+class PluginUnavailableError(ConnectionError):
+    """Raised instead of queueing when the Studio plugin isn't polling."""
+
+class PluginResultRegistry:
+    """Tracks in-flight plugin requests as one asyncio future per request_id.
+
+    A waiter registers a future before its command is queued; the
+    /plugin_report_result endpoint resolves it, which wakes the waiter
+    immediately. Entries are always removed when the waiter finishes
+    (result, timeout or cancellation), so late results are simply dropped.
+    """
+
+    def __init__(self):
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def __contains__(self, request_id: str) -> bool:
+        return request_id in self._pending
+
+    def register(self, request_id: str) -> asyncio.Future:
+        """Creates the future a caller will await for request_id."""
+        if request_id in self._pending:
+            raise ValueError(f"Request ID already pending: {request_id}")
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        return future
+
+    def resolve(self, request_id: str, result: Any) -> bool:
+        """Delivers a result. Returns False if nobody is waiting for it anymore."""
+        future = self._pending.get(request_id)
+        if future is None or future.done():
+            return False
+        future.set_result(result)
+        return True
+
+    def discard(self, request_id: str) -> None:
+        """Drops a pending entry, cancelling its future if still unresolved."""
+        future = self._pending.pop(request_id, None)
+        if future is not None and not future.done():
+            future.cancel()
+
+    async def wait(self, request_id: str, timeout: float) -> Any:
+        """Waits for the result of a registered request.
+
+        Raises TimeoutError if no result arrives within timeout seconds.
+        The entry is discarded on every exit path, including cancellation.
+        """
+        future = self._pending.get(request_id)
+        if future is None:
+            raise KeyError(f"Request ID not registered: {request_id}")
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            # asyncio.TimeoutError is not the builtin TimeoutError before Python 3.11
+            raise TimeoutError(f"Timeout waiting for plugin result for request_id {request_id}") from None
+        finally:
+            self.discard(request_id)
+
+class PluginCommandQueue:
+    """FIFO of commands waiting for the Studio plugin, with long-poll support.
+
+    Behaves like the plain deque it replaces (append/popleft/len), and lets
+    a /plugin_command handler park until a command arrives instead of
+    returning an empty response straight away. Commands carrying a
+    "deadline" (Unix seconds) that has passed are dropped when dequeued,
+    since nobody is waiting for their result anymore.
+    """
+
+    def __init__(self):
+        self._commands: deque = deque()
+        self._not_empty = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def __bool__(self) -> bool:
+        return bool(self._commands)
+
+    def __iter__(self):
+        return iter(self._commands)
+
+    def append(self, command: Dict[str, Any]) -> None:
+        self._commands.append(command)
+        self._not_empty.set()
+
+    def _take_live(self) -> Optional[Dict[str, Any]]:
+        """Pops the oldest unexpired command, dropping expired ones on the way."""
+        now = time.time()
+        while self._commands:
+            command = self._commands.popleft()
+            deadline = command.get("deadline")
+            if deadline is None or deadline > now:
+                return command
+            logger.info(f"Dropped expired plugin command {command.get('request_id')} ({command.get('action')}) at dequeue.")
+        return None
+
+    def popleft(self) -> Dict[str, Any]:
+        """Removes the oldest live command. Raises IndexError when empty, like deque."""
+        command = self._take_live()
+        if not self._commands:
+            self._not_empty.clear()
+        if command is None:
+            raise IndexError("pop from an empty plugin command queue")
+        return command
+
+    async def wait_not_empty(self, timeout: float) -> bool:
+        """Waits up to timeout seconds for a command. Returns True if one is queued."""
+        if self._commands:
+            return True
+        try:
+            await asyncio.wait_for(self._not_empty.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        return bool(self._commands)
+
+    def remove(self, request_id: str) -> bool:
+        """Drops a still-queued command (e.g. its caller gave up). Returns True if found."""
+        for command in self._commands:
+            if command.get("request_id") == request_id:
+                self._commands.remove(command)
+                if not self._commands:
+                    self._not_empty.clear()
+                return True
+        return False
+
+    def pop_batch(self, max_commands: int) -> List[Dict[str, Any]]:
+        """Removes up to max_commands of the oldest commands, in order."""
+        batch = []
+        while self._commands and len(batch) < max_commands:
+            command = self._take_live()
+            if command is not None:
+                batch.append(command)
+        if not self._commands:
+            self._not_empty.clear()
+        return batch
+
+class PluginPresence:
+    """Tracks when the Studio plugin was last heard from.
+
+    The plugin counts as available while a /plugin_command poll is in flight
+    (long-poll) or if any plugin request (poll, result, logs, scene sync)
+    arrived within stale_after seconds; the latter keeps a plugin that is busy
+    running a long command from looking disconnected. wait_for_poll() lets a
+    caller hold a command until the plugin polls again.
+    """
+
+    def __init__(self, stale_after: float = 15.0):
+        self.stale_after = stale_after
+        self.last_poll_started: Optional[float] = None
+        self.last_poll_finished: Optional[float] = None
+        self.last_seen: Optional[float] = None
+        self._polled = asyncio.Event()
+
+    def mark_seen(self) -> None:
+        self.last_seen = time.monotonic()
+
+    def poll_started(self) -> None:
+        self.last_poll_started = self.last_seen = time.monotonic()
+        # Wake everyone currently waiting; later waiters wait for the next poll
+        self._polled.set()
+        self._polled.clear()
+
+    def poll_finished(self) -> None:
+        self.last_poll_finished = self.last_seen = time.monotonic()
+
+    @property
+    def poll_in_flight(self) -> bool:
+        return self.last_poll_started is not None and (
+            self.last_poll_finished is None or self.last_poll_finished < self.last_poll_started)
+
+    def is_available(self) -> bool:
+        if self.last_seen is None:
+            return False
+        return self.poll_in_flight or time.monotonic() - self.last_seen <= self.stale_after
+
+    def seconds_since_seen(self) -> Optional[float]:
+        return None if self.last_seen is None else time.monotonic() - self.last_seen
+
+    async def wait_for_poll(self, timeout: float) -> bool:
+        """Waits up to timeout seconds for the plugin to poll. Returns True if it did."""
+        if self.poll_in_flight:
+            return True
+        try:
+            await asyncio.wait_for(self._polled.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+class ResultChunkError(ValueError):
+    """A result chunk was rejected (malformed, inconsistent, or over the buffer limit)."""
+
+class _ChunkedTransfer:
+    __slots__ = ("total", "chunks", "received", "size", "updated")
+
+    def __init__(self, total: int):
+        self.total = total
+        self.chunks: List[Optional[bytes]] = [None] * total
+        self.received = 0
+        self.size = 0
+        self.updated = time.monotonic()
+
+class ChunkedResultAssembler:
+    """Reassembles plugin results that were too large for a single POST.
+
+    The plugin splits the encoded {request_id, result} JSON into numbered
+    chunks; add() buffers them per request_id and returns the joined bytes
+    once every chunk is in. Duplicate chunks (retries) are ignored. All
+    incomplete transfers together may hold at most max_buffered_bytes, and
+    a transfer that receives nothing for expire_after seconds is dropped.
+    """
+
+    def __init__(self, max_buffered_bytes: int = 64 * 1024 * 1024, expire_after: float = 60.0,
+                 max_chunks: int = 4096):
+        self.max_buffered_bytes = max_buffered_bytes
+        self.expire_after = expire_after
+        self.max_chunks = max_chunks
+        self.buffered_bytes = 0
+        self._transfers: Dict[str, _ChunkedTransfer] = {}
+
+    def __len__(self) -> int:
+        return len(self._transfers)
+
+    def add(self, request_id: str, index: int, total: int, data: bytes) -> Optional[bytes]:
+        """Buffers one chunk. Returns the complete payload when this was the last missing chunk.
+
+        Raises ResultChunkError if the chunk doesn't fit the transfer or the
+        buffer limit; the transfer is dropped in that case. Call expire()
+        first so abandoned transfers don't count against the limit.
+        """
+        if not 0 < total <= self.max_chunks or not 0 <= index < total:
+            self.discard(request_id)
+            raise ResultChunkError(f"Invalid chunk {index}/{total} for request_id {request_id}")
+
+        transfer = self._transfers.get(request_id)
+        if transfer is None:
+            transfer = self._transfers[request_id] = _ChunkedTransfer(total)
+        elif transfer.total != total:
+            self.discard(request_id)
+            raise ResultChunkError(f"Chunk count changed mid-transfer for request_id {request_id}")
+        transfer.updated = time.monotonic()
+
+        if transfer.chunks[index] is not None:
+            return None # Retried chunk
+        if self.buffered_bytes + len(data) > self.max_buffered_bytes:
+            self.discard(request_id)
+            raise ResultChunkError(f"Result for request_id {request_id} exceeds the {self.max_buffered_bytes}-byte chunk buffer")
+
+        transfer.chunks[index] = data
+        transfer.received += 1
+        transfer.size += len(data)
+        self.buffered_bytes += len(data)
+        if transfer.received < transfer.total:
+            return None
+
+        del self._transfers[request_id]
+        self.buffered_bytes -= transfer.size
+        return b"".join(transfer.chunks)
+
+    def discard(self, request_id: str) -> None:
+        transfer = self._transfers.pop(request_id, None)
+        if transfer is not None:
+            self.buffered_bytes -= transfer.size
+
+    def expire(self) -> int:
+        """Drops transfers idle for longer than expire_after. Returns how many were dropped."""
+        cutoff = time.monotonic() - self.expire_after
+        stale = [request_id for request_id, transfer in self._transfers.items() if transfer.updated < cutoff]
+        for request_id in stale:
+            logger.warning(f"Dropped incomplete chunked result for request_id {request_id}")
+            self.discard(request_id)
+        return len(stale)
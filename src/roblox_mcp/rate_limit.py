@@ -0,0 +1,167 @@
+import asyncio
+import contextlib
+import logging
+import time
+from typing import Dict, Any, Optional, AsyncIterator, Mapping
+
+logger = logging.getLogger(__name__)
+
+# Per-family budgets, from the documented Open Cloud per-key quotas (requests/minute),
+# with a little headroom. burst = how many requests may go out back to back.
+DEFAULT_FAMILY_LIMITS: Dict[str, Dict[str, float]] = {
+    "datastores": {"per_minute": 280, "burst": 20, "max_concurrency": 16},
+    "luau-execution": {"per_minute": 40, "burst": 5, "max_concurrency": 4},
+    "assets": {"per_minute": 55, "burst": 5, "max_concurrency": 4},
+    "publish": {"per_minute": 10, "burst": 2, "max_concurrency": 1},
+    "default": {"per_minute": 120, "burst": 10, "max_concurrency": 8},
+}
+
+def family_for_url(url: str) -> str:
+    """Maps an Open Cloud URL to the rate-limit family whose quota it counts against."""
+    if "/datastores/" in url:
+        return "datastores"
+    if "luau-execution" in url:
+        return "luau-execution"
+    if "/assets/" in url or "/operations/" in url:
+        return "assets"
+    if "develop.roblox.com" in url and "/versions" in url:
+        return "publish"
+    return "default"
+
+class TokenBucket:
+    """Async token bucket. Callers queue in FIFO order instead of racing for tokens."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate # tokens per second
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        async with self._lock: # One waiter at a time -> FIFO queueing
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Stops handing out tokens for `seconds` (e.g. after a 429 with Retry-After)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limit: +1 per window of successes, halved on throttling."""
+
+    def __init__(self, max_limit: int, min_limit: int = 1):
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self) -> None:
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self) -> None:
+        self.limit = min(self.max_limit, self.limit + 1 / max(self.limit, 1))
+
+    def on_throttled(self) -> None:
+        self.limit = max(self.min_limit, self.limit / 2)
+
+class FamilyRateLimiter:
+    """Token bucket + adaptive concurrency for one API family."""
+
+    def __init__(self, name: str, per_minute: float, burst: float, max_concurrency: int):
+        self.name = name
+        self.bucket = TokenBucket(rate=per_minute / 60.0, capacity=burst)
+        self.concurrency = AdaptiveConcurrencyLimiter(max_limit=int(max_concurrency))
+        self.requests = 0
+        self.throttled = 0
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        await self.bucket.acquire()
+        await self.concurrency.acquire()
+        try:
+            self.requests += 1
+            yield
+        finally:
+            await self.concurrency.release()
+
+    def record_response(self, status_code: int, headers: Mapping[str, str], default_backoff: float = 1.0) -> Optional[float]:
+        """Feeds a response back into the limiter.
+
+        On 429 the whole family pauses for Retry-After (or default_backoff) and
+        the concurrency limit is halved; the pause is returned. An exhausted
+        x-ratelimit-remaining also pauses until x-ratelimit-reset, before we get a 429.
+        """
+        if status_code == 429:
+            self.throttled += 1
+            delay = _parse_seconds(headers.get("Retry-After"), default_backoff)
+            self.bucket.pause(delay)
+            self.concurrency.on_throttled()
+            logger.warning(f"Rate limit hit for '{self.name}'; pausing {delay:.2f}s, concurrency limit now {int(self.concurrency.limit)}.")
+            return delay
+
+        self.concurrency.on_success()
+        remaining = headers.get("x-ratelimit-remaining")
+        if remaining is not None and _parse_seconds(remaining, 1.0) <= 0:
+            reset = _parse_seconds(headers.get("x-ratelimit-reset"), 0.0)
+            if reset > 0:
+                self.bucket.pause(reset)
+                logger.info(f"Quota for '{self.name}' exhausted; pausing {reset:.2f}s until reset.")
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "concurrency_limit": int(self.concurrency.limit),
+            "in_flight": self.concurrency.in_flight,
+        }
+
+def _parse_seconds(value: Optional[str], default: float) -> float:
+    try:
+        return max(0.0, float(value)) if value is not None else default
+    except (ValueError, TypeError):
+        return default
+
+class RateLimiterRegistry:
+    """Lazily creates one FamilyRateLimiter per API family."""
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, float]]] = None):
+        self.limits = {**DEFAULT_FAMILY_LIMITS, **(limits or {})}
+        self._limiters: Dict[str, FamilyRateLimiter] = {}
+
+    def for_family(self, family: str) -> FamilyRateLimiter:
+        limiter = self._limiters.get(family)
+        if limiter is None:
+            config = self.limits.get(family, self.limits["default"])
+            limiter = FamilyRateLimiter(family, config["per_minute"], config["burst"], int(config["max_concurrency"]))
+            self._limiters[family] = limiter
+        return limiter
+
+    def for_url(self, url: str) -> FamilyRateLimiter:
+        return self.for_family(family_for_url(url))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: limiter.stats() for name, limiter in self._limiters.items()}
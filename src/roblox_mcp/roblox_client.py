@@ -1,15 +1,22 @@
 import httpx # Replace requests
 import asyncio # Import asyncio
 import logging
-# import time # Replaced by asyncio.sleep
+import time # For request latency metrics (sleeps use asyncio.sleep)
 import json
-from typing import Dict, Any, Optional, List, AsyncIterator # Added AsyncIterator
+from typing import Dict, Any, Optional, List, AsyncIterator, Iterable, Callable, Awaitable, Tuple # Added AsyncIterator
+from collections import deque
 import base64
 import os
 from pathlib import Path
 import contextlib # For async context manager with files
+import importlib.util
+import hashlib
 
 from .config import Settings
+from .rate_limit import RateLimiterRegistry
+from .datastore_cache import DatastoreCache
+from .asset_cache import AssetUploadIndex, hash_file, owner_fingerprint
+from .metrics import CLOUD_REQUEST_SECONDS, CLOUD_RESPONSES, CLOUD_RETRIES, CLOUD_THROTTLED
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +32,73 @@ class RobloxApiError(Exception):
         self.status_code = status_code
         self.response_data = response_data
 
+async def ordered_bounded_map(items: Iterable[Any], func: Callable[[Any], Awaitable[Any]],
+                              concurrency: int) -> AsyncIterator[Tuple[int, Any, Any, Optional[Exception]]]:
+    """Runs func over items with at most `concurrency` calls in flight.
+
+    Yields (index, item, result, error) in input order as soon as each result
+    and every earlier one are done, so callers can stream results. Only a
+    small window of calls runs ahead of the consumer, keeping memory flat for
+    long inputs; leaving the loop early cancels whatever is still running.
+    """
+    concurrency = max(1, concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    iterator = iter(enumerate(items))
+    window: deque = deque()
+
+    async def run(item):
+        async with semaphore:
+            return await func(item)
+
+    def fill():
+        while len(window) < concurrency * 2:
+            try:
+                index, item = next(iterator)
+            except StopIteration:
+                return
+            window.append((index, item, asyncio.ensure_future(run(item))))
+
+    fill()
+    try:
+        while window:
+            index, item, task = window.popleft()
+            try:
+                result, error = await task, None
+            except Exception as e:
+                result, error = None, e
+            fill()
+            yield index, item, result, error
+    finally:
+        for _, _, task in window:
+            task.cancel()
+
+async def iterate_pages(fetch_page: Callable[[Optional[str]], Awaitable[Dict[str, Any]]], items_key: str,
+                         cursor: Optional[str] = None, prefetch: bool = True
+                         ) -> AsyncIterator[Tuple[List[Any], Optional[str], Optional[str]]]:
+    """Walks a cursor-paginated Open Cloud listing, one page at a time.
+
+    Yields (items, cursor, next_cursor): the page's items, the cursor that
+    fetched it and the cursor for the page after it (None on the last page).
+    With prefetch, the next page is requested as soon as a page arrives, so
+    its round trip overlaps with the caller's work on the current one.
+    Resuming from a saved next_cursor continues right after that page.
+    """
+    pending = asyncio.ensure_future(fetch_page(cursor))
+    try:
+        while pending is not None:
+            page = await pending
+            pending = None
+            next_cursor = page.get("nextPageCursor") or None
+            if next_cursor and prefetch:
+                pending = asyncio.ensure_future(fetch_page(next_cursor))
+            yield page.get(items_key) or [], cursor, next_cursor
+            if next_cursor and pending is None:
+                pending = asyncio.ensure_future(fetch_page(next_cursor))
+            cursor = next_cursor
+    finally:
+        if pending is not None:
+            pending.cancel()
+
 class RobloxClient:
     def __init__(self, config: Settings):
         if not config:
@@ -39,15 +113,38 @@ class RobloxClient:
             "Content-Type": "application/json",
             "Accept": "application/json" # Generally expect JSON responses
         }
-        self.client = httpx.AsyncClient(headers=headers, timeout=30.0) # Default timeout
-        logger.info("RobloxClient initialized with httpx.AsyncClient.")
+        # One long-lived client per process: keep-alive connections are pooled and reused
+        limits = httpx.Limits(
+            max_connections=config.roblox_http_max_connections,
+            max_keepalive_connections=config.roblox_http_max_keepalive_connections,
+            keepalive_expiry=config.roblox_http_keepalive_expiry,
+        )
+        http2 = config.roblox_http2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("ROBLOX_HTTP2 is enabled but the 'h2' package is not installed; falling back to HTTP/1.1.")
+            http2 = False
+        self.client = httpx.AsyncClient(headers=headers, timeout=30.0, limits=limits, http2=http2) # Default timeout
+        logger.info(f"RobloxClient initialized with httpx.AsyncClient (max_connections={limits.max_connections}, http2={http2}).")
+
+        # Per-API-family token buckets + adaptive concurrency, shared by every caller of this client
+        self.rate_limiters = RateLimiterRegistry()
+        # Read-through cache for get_datastore_entry; writes and deletes through this client keep it current
+        self.datastore_cache = DatastoreCache(ttl=config.roblox_datastore_cache_ttl,
+                                              max_entries=config.roblox_datastore_cache_max_entries)
+        # Content hash + asset type -> asset ID of earlier uploads by this API key's owner, persisted across restarts
+        self.asset_index = AssetUploadIndex(config.roblox_asset_cache_path, owner=owner_fingerprint(self.api_key))
+
+    @property
+    def is_closed(self) -> bool:
+        return self.client.is_closed
 
     async def _request(self, method: str, url: str,
                  params: Optional[Dict] = None, json_data: Optional[Dict] = None,
                  data: Optional[Any] = None, headers: Optional[Dict] = None,
                  files: Optional[Dict] = None, # httpx uses 'files', 'data' for form data, 'content' for raw bytes
                  content: Optional[bytes] = None, # For raw content like datastore set
-                 timeout: Optional[float] = 30.0 # Allow per-request timeout override
+                 timeout: Optional[float] = 30.0, # Allow per-request timeout override
+                 response_headers: Optional[Dict[str, str]] = None # Filled with the successful response's headers
                  ) -> Dict[str, Any]:
         """Async internal helper to make HTTP requests to Roblox API using httpx."""
         request_headers = self.client.headers.copy() # Start with client defaults
@@ -63,41 +160,48 @@ class RobloxClient:
 
         max_retries = 3
         retry_delay = 1.0 # seconds, float for asyncio.sleep
+        limiter = self.rate_limiters.for_url(url)
 
         for attempt in range(max_retries):
             try:
                 logger.debug(f"Sending {method} request to {url} (Attempt {attempt+1})")
-                response = await self.client.request(
-                    method=method,
-                    url=url,
-                    params=params,
-                    json=json_data,
-                    data=data, # For form data (dict)
-                    files=files,
-                    content=content, # For raw bytes/strings
-                    headers=request_headers,
-                    timeout=timeout
-                )
+                # Wait for a token and a concurrency slot for this API family
+                async with limiter.slot():
+                    started = time.monotonic()
+                    response = await self.client.request(
+                        method=method,
+                        url=url,
+                        params=params,
+                        json=json_data,
+                        data=data, # For form data (dict)
+                        files=files,
+                        content=content, # For raw bytes/strings
+                        headers=request_headers,
+                        timeout=timeout
+                    )
+
+                CLOUD_REQUEST_SECONDS.labels(limiter.name, method).observe(time.monotonic() - started)
+                CLOUD_RESPONSES.labels(limiter.name, method, response.status_code).inc()
 
                 logger.debug(f"Received response: Status {response.status_code}, Headers: {response.headers}")
+                throttle_delay = limiter.record_response(response.status_code, response.headers, default_backoff=retry_delay)
 
                 # Handle Rate Limits (429)
-                if response.status_code == 429:
-                    retry_after_str = response.headers.get("Retry-After")
-                    try:
-                        delay = float(retry_after_str) if retry_after_str else retry_delay
-                    except (ValueError, TypeError):
-                        delay = retry_delay
-                    # Ensure non-negative delay
-                    delay = max(0, delay)
-                    logger.warning(f"Rate limit hit (429) on attempt {attempt + 1}/{max_retries}. Retrying in {delay:.2f}s...")
-                    await asyncio.sleep(delay)
+                if throttle_delay is not None:
+                    # The limiter pauses the whole family, so the retry (and every other
+                    # caller) queues on the bucket instead of sleeping independently
+                    logger.warning(f"Rate limit hit (429) on attempt {attempt + 1}/{max_retries}. Retrying in {throttle_delay:.2f}s...")
                     # Exponential backoff, but ensure it respects Retry-After if larger
-                    retry_delay = max(retry_delay * 2, delay) 
+                    retry_delay = max(retry_delay * 2, throttle_delay)
+                    CLOUD_THROTTLED.labels(limiter.name).inc()
+                    if attempt < max_retries - 1:
+                        CLOUD_RETRIES.labels(limiter.name, "throttled").inc()
                     continue
 
                 # Check for other errors
                 response.raise_for_status() # Raises httpx.HTTPStatusError for 4xx/5xx
+                if response_headers is not None:
+                    response_headers.update(response.headers)
 
                 # Try to parse JSON, handle cases with no content
                 if response.status_code == 204: # No Content
@@ -131,13 +235,15 @@ class RobloxClient:
             
             except httpx.RequestError as e: # Catches broader network issues, timeouts etc.
                 logger.error(f"Request Error for {url} on attempt {attempt + 1}: {e}")
+                CLOUD_RESPONSES.labels(limiter.name, method, "error").inc()
                 if attempt == max_retries - 1:
                     raise RobloxApiError(f"Request Failed after {max_retries} attempts: {e}") from e
+                CLOUD_RETRIES.labels(limiter.name, "network").inc()
                 await asyncio.sleep(retry_delay)
                 retry_delay *= 2
 
-        # Should not be reached if max_retries > 0
-        raise RobloxApiError(f"Request failed after {max_retries} retries.")
+        # Only reached when every attempt was throttled (429)
+        raise RobloxApiError(f"Request failed after {max_retries} retries (rate limited).", status_code=429)
 
     # --- Luau Execution --- 
     async def _poll_operation(self, operation_path: str, timeout: int = 90) -> Dict[str, Any]:
@@ -286,8 +392,23 @@ class RobloxClient:
             raise # Re-raise the specific API error
 
     # --- Datastore --- 
-    async def get_datastore_entry(self, datastore_name: str, entry_key: str, scope: str = "global") -> Any:
-        """Async gets an entry from a standard datastore. Returns the decoded JSON value or raw text."""
+    def _datastore_cache_key(self, datastore_name: str, entry_key: str, scope: str) -> tuple:
+        return (self.universe_id, datastore_name, scope, entry_key)
+
+    async def get_datastore_entry(self, datastore_name: str, entry_key: str, scope: str = "global",
+                                  use_cache: bool = True) -> Any:
+        """Async gets an entry from a standard datastore. Returns the decoded JSON value or raw text.
+
+        Served from datastore_cache while fresh unless use_cache is False; the
+        fetched value (or its absence) is cached either way, unless this client
+        wrote the key while the request was in flight.
+        """
+        cache_key = self._datastore_cache_key(datastore_name, entry_key, scope)
+        if use_cache:
+            cached = self.datastore_cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"Datastore entry '{entry_key}' from '{datastore_name}' served from cache (version {cached.version})")
+                return cached.value if cached.exists else None
         logger.info(f"Getting datastore entry '{entry_key}' from '{datastore_name}' (scope: {scope})")
         endpoint = f"datastores/v1/universes/{self.universe_id}/standard-datastores/datastore/entries/entry"
         url = f"{API_BASE_URL.rstrip('/')}/{endpoint.lstrip('/')}"
@@ -296,26 +417,29 @@ class RobloxClient:
             "scope": scope,
             "entryKey": entry_key
         }
+        read_token = self.datastore_cache.begin_read(cache_key)
+        fetched: Optional[Dict[str, Any]] = None # finish_read() arguments once we know what is stored
         try:
             # Use the _request method now which handles errors and retries
             # Expecting raw text or JSON directly from this endpoint
-            response = await self._request("GET", url, params=params, timeout=15.0) 
+            headers: Dict[str, str] = {}
+            response = await self._request("GET", url, params=params, timeout=15.0, response_headers=headers)
             
-            # _request now returns dict, check for raw_content if JSON failed
-            if "raw_content" in response:
+            # The API returns the value directly: any JSON value (a number or boolean too),
+            # or {"raw_content": text} from _request if the body isn't JSON
+            if isinstance(response, dict) and "raw_content" in response:
                 logger.warning(f"Datastore value for {entry_key} is not valid JSON. Returning raw text.")
-                return response["raw_content"]
             elif response == {}: # Should not happen for GET with content, but check
                  logger.warning(f"Datastore GET for {entry_key} returned empty response dict.")
                  return None
-            else:
-                 # If it's not raw_content and not empty, it should be parsed JSON
-                 # The API returns the value directly, not nested in a dict
-                 return response 
+            value = self._entry_value(response)
+            fetched = {"value": value, "version": headers.get("roblox-entry-version"), "content_md5": headers.get("content-md5")}
+            return value
 
         except RobloxApiError as e:
             if e.status_code == 404:
                 logger.info(f"Datastore entry '{entry_key}' not found (404).")
+                fetched = {"value": None, "exists": False}
                 return None # Return None if key doesn't exist
             else:
                 # Re-raise other API errors
@@ -323,6 +447,97 @@ class RobloxClient:
         except Exception as e:
              logger.error(f"Unexpected error getting datastore entry '{entry_key}': {e}", exc_info=True)
              raise RobloxApiError(f"Unexpected error: {e}") from e
+        finally:
+            # Skips the cache update if a write to this key landed while we were reading
+            self.datastore_cache.finish_read(cache_key, read_token, store=fetched is not None, **(fetched or {}))
+
+    @staticmethod
+    def _entry_value(response: Any) -> Any:
+        # _request hands back non-JSON bodies as {"raw_content": text}
+        if isinstance(response, dict) and "raw_content" in response:
+            return response["raw_content"]
+        return response
+
+    @staticmethod
+    def _entry_metadata(headers: Dict[str, str]) -> Dict[str, Any]:
+        def json_header(name):
+            raw = headers.get(name)
+            if not raw:
+                return None
+            try:
+                return json.loads(raw)
+            except json.JSONDecodeError:
+                return None
+        return {
+            "version": headers.get("roblox-entry-version"),
+            "created_time": headers.get("roblox-entry-created-time"),
+            "version_created_time": headers.get("roblox-entry-version-created-time"),
+            "attributes": json_header("roblox-entry-attributes"),
+            "user_ids": json_header("roblox-entry-userids"),
+        }
+
+    async def get_datastore_entry_snapshot(self, datastore_name: str, entry_key: str, scope: str = "global",
+                                           version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Async gets an entry with its metadata: {"value", "version", "created_time", "version_created_time", "attributes", "user_ids"}.
+
+        Reads the current value, or a specific version when `version` is given.
+        Returns None if the entry (or version) does not exist. Bypasses datastore_cache.
+        """
+        logger.info(f"Getting datastore entry snapshot '{entry_key}' from '{datastore_name}' (scope: {scope}, version: {version or 'latest'})")
+        endpoint = f"datastores/v1/universes/{self.universe_id}/standard-datastores/datastore/entries/entry"
+        params = {
+            "datastoreName": datastore_name,
+            "scope": scope,
+            "entryKey": entry_key
+        }
+        if version:
+            endpoint += "/versions/version"
+            params["versionId"] = version
+        url = f"{API_BASE_URL.rstrip('/')}/{endpoint.lstrip('/')}"
+        headers: Dict[str, str] = {}
+        try:
+            response = await self._request("GET", url, params=params, timeout=15.0, response_headers=headers)
+        except RobloxApiError as e:
+            if e.status_code == 404:
+                return None
+            raise
+        snapshot = self._entry_metadata(headers)
+        snapshot["value"] = self._entry_value(response)
+        return snapshot
+
+    async def list_datastore_entry_versions(self, datastore_name: str, entry_key: str, scope: str = "global",
+                                            start_time: Optional[str] = None, end_time: Optional[str] = None,
+                                            sort_order: str = "Ascending", limit: Optional[int] = None,
+                                            cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Async lists versions of an entry ({"versions": [{"version", "deleted", "contentLength", "createdTime", "objectCreatedTime"}], "nextPageCursor"})."""
+        logger.info(f"Listing versions of '{entry_key}' in '{datastore_name}' (scope: {scope}, {start_time} - {end_time})")
+        endpoint = f"datastores/v1/universes/{self.universe_id}/standard-datastores/datastore/entries/entry/versions"
+        url = f"{API_BASE_URL.rstrip('/')}/{endpoint.lstrip('/')}"
+        params = {
+            "datastoreName": datastore_name,
+            "scope": scope,
+            "entryKey": entry_key,
+            "sortOrder": sort_order
+        }
+        if start_time: params["startTime"] = start_time
+        if end_time: params["endTime"] = end_time
+        if limit: params["limit"] = limit
+        if cursor: params["cursor"] = cursor
+        return await self._request("GET", url, params=params)
+
+    async def get_datastore_entry_as_of(self, datastore_name: str, entry_key: str, as_of: str,
+                                        scope: str = "global") -> Optional[Dict[str, Any]]:
+        """Async gets the snapshot of an entry as it was at `as_of` (RFC 3339), or None if it didn't exist then.
+
+        Uses the newest version created at or before as_of; Open Cloud keeps versions for 30 days.
+        """
+        page = await self.list_datastore_entry_versions(datastore_name, entry_key, scope=scope, end_time=as_of,
+                                                        sort_order="Descending", limit=1)
+        versions = page.get("versions") or []
+        if not versions or versions[0].get("deleted"):
+            return None
+        return await self.get_datastore_entry_snapshot(datastore_name, entry_key, scope=scope,
+                                                       version=versions[0].get("version"))
 
     async def set_datastore_entry(self, datastore_name: str, entry_key: str, value: Any, 
                               scope: str = "global", 
@@ -348,17 +563,19 @@ class RobloxClient:
         if exclude_previous_value:
             params["exclusiveCreate"] = "true"
         
-        if user_ids or attributes:
-             metadata = {}
-             if user_ids: metadata["roblox-entry-userids"] = json.dumps(user_ids)
-             if attributes: metadata["roblox-entry-attributes"] = json.dumps(attributes)
-             encoded_metadata = base64.b64encode(json.dumps(metadata).encode()).decode()
-             request_headers["roblox-entry-metadata"] = encoded_metadata
+        # Open Cloud reads user IDs and attributes from their own JSON-valued headers
+        if user_ids:
+            request_headers["roblox-entry-userids"] = json.dumps(user_ids)
+        if attributes:
+            request_headers["roblox-entry-attributes"] = json.dumps(attributes)
 
+        cache_key = self._datastore_cache_key(datastore_name, entry_key, scope)
         try:
             json_string_value = json.dumps(value)
             # Send JSON string as raw content bytes
             content_bytes = json_string_value.encode('utf-8')
+            content_md5 = base64.b64encode(hashlib.md5(content_bytes).digest()).decode()
+            request_headers["content-md5"] = content_md5
             # Use await for async _request
             result = await self._request(
                 "POST", url, 
@@ -366,10 +583,16 @@ class RobloxClient:
                 content=content_bytes, # Use content for raw bytes
                 headers=request_headers
             )
+            # We know exactly what is stored now; cache the round-tripped value, not the caller's object
+            self.datastore_cache.put(cache_key, json.loads(json_string_value),
+                                     version=result.get("version") if isinstance(result, dict) else None,
+                                     content_md5=content_md5)
             return result # Should contain version info on success
-        except json.JSONDecodeError:
-             raise ValueError("Value provided is not JSON serializable.")
+        except (TypeError, ValueError) as e:
+             raise ValueError(f"Value provided is not JSON serializable: {e}")
         except Exception as e:
+            # The write may or may not have landed (or a version precondition failed): forget what we had
+            self.datastore_cache.invalidate(cache_key)
             logger.error(f"Error setting datastore entry '{entry_key}': {e}", exc_info=True)
             raise # Re-raise original or wrap in RobloxApiError if needed
 
@@ -383,22 +606,46 @@ class RobloxClient:
             "scope": scope,
             "entryKey": entry_key
         }
+        cache_key = self._datastore_cache_key(datastore_name, entry_key, scope)
         try:
             # Use await. Expects 204 No Content on success, _request returns {}
             await self._request("DELETE", url, params=params)
             logger.info(f"Deletion request successful for entry '{entry_key}'.")
+            self.datastore_cache.put(cache_key, None, exists=False)
         except RobloxApiError as e:
              if e.status_code == 404:
                   # Log info but don't raise error if trying to delete non-existent key
                   logger.info(f"Entry '{entry_key}' not found during delete attempt (404).")
+                  self.datastore_cache.put(cache_key, None, exists=False)
                   return # Treat as success (idempotent delete)
              else:
+                  self.datastore_cache.invalidate(cache_key)
                   logger.error(f"API error deleting entry '{entry_key}': {e}")
                   raise # Re-raise other errors
         except Exception as e:
+             self.datastore_cache.invalidate(cache_key)
              logger.error(f"Unexpected error deleting entry '{entry_key}': {e}", exc_info=True)
              raise RobloxApiError(f"Unexpected error during delete: {e}") from e
 
+    # Bulk variants: async iterators of (index, key, result, error) in input order; a key's failure is reported, not raised
+    def get_datastore_entries(self, datastore_name: str, entry_keys: List[str], scope: str = "global",
+                                    concurrency: int = 8, use_cache: bool = True) -> AsyncIterator[Tuple[int, str, Any, Optional[Exception]]]:
+        async def get_one(entry_key):
+            return await self.get_datastore_entry(datastore_name, entry_key, scope=scope, use_cache=use_cache)
+        return ordered_bounded_map(entry_keys, get_one, concurrency)
+
+    def set_datastore_entries(self, datastore_name: str, entries: List[Tuple[str, Any]], scope: str = "global",
+                                    concurrency: int = 8) -> AsyncIterator[Tuple[int, Tuple[str, Any], Any, Optional[Exception]]]:
+        async def set_one(entry):
+            entry_key, value = entry
+            return await self.set_datastore_entry(datastore_name, entry_key, value, scope=scope)
+        return ordered_bounded_map(entries, set_one, concurrency)
+
+    def delete_datastore_entries(self, datastore_name: str, entry_keys: List[str], scope: str = "global",
+                                       concurrency: int = 8) -> AsyncIterator[Tuple[int, str, Any, Optional[Exception]]]:
+        async def delete_one(entry_key):
+            return await self.delete_datastore_entry(datastore_name, entry_key, scope=scope)
+        return ordered_bounded_map(entry_keys, delete_one, concurrency)
 
     async def list_datastores(self, prefix: Optional[str] = None, limit: Optional[int] = None, cursor: Optional[str] = None) -> Dict[str, Any]:
         """Async lists standard datastores in the universe."""
@@ -412,6 +659,48 @@ class RobloxClient:
         
         # Use await
         return await self._request("GET", url, params=params)
+
+    async def list_datastore_entries(self, datastore_name: str, scope: str = "global", prefix: Optional[str] = None,
+                                     limit: Optional[int] = None, cursor: Optional[str] = None,
+                                     all_scopes: bool = False) -> Dict[str, Any]:
+        """Async lists one page of entry keys in a standard datastore ({"keys": [{"scope", "key"}], "nextPageCursor"})."""
+        logger.info(f"Listing entry keys in '{datastore_name}' (scope: {scope}, prefix: {prefix}, limit: {limit})")
+        endpoint = f"datastores/v1/universes/{self.universe_id}/standard-datastores/datastore/entries"
+        url = f"{API_BASE_URL.rstrip('/')}/{endpoint.lstrip('/')}"
+        params = {"datastoreName": datastore_name}
+        if all_scopes: params["AllScopes"] = "true"
+        else: params["scope"] = scope
+        if prefix: params["prefix"] = prefix
+        if limit: params["limit"] = limit
+        if cursor: params["cursor"] = cursor
+        return await self._request("GET", url, params=params)
+
+    async def iter_datastores(self, prefix: Optional[str] = None, page_size: int = 100) -> AsyncIterator[Dict[str, Any]]:
+        """Yields every standard datastore in the universe ({"name", "createdTime"}), following all pages."""
+        async def fetch(cursor):
+            return await self.list_datastores(prefix=prefix, limit=page_size, cursor=cursor)
+        async with contextlib.aclosing(iterate_pages(fetch, "datastores")) as pages:
+            async for datastores, _, _ in pages:
+                for datastore in datastores:
+                    yield datastore
+
+    def iter_datastore_entry_pages(self, datastore_name: str, scope: str = "global", prefix: Optional[str] = None,
+                                   page_size: int = 100, cursor: Optional[str] = None,
+                                   all_scopes: bool = False) -> AsyncIterator[Tuple[List[Dict[str, Any]], Optional[str], Optional[str]]]:
+        """Pages of entry keys as (keys, cursor, next_cursor); save next_cursor to resume after that page."""
+        async def fetch(page_cursor):
+            return await self.list_datastore_entries(datastore_name, scope=scope, prefix=prefix, limit=page_size,
+                                                     cursor=page_cursor, all_scopes=all_scopes)
+        return iterate_pages(fetch, "keys", cursor=cursor)
+
+    async def iter_datastore_entries(self, datastore_name: str, scope: str = "global", prefix: Optional[str] = None,
+                                     page_size: int = 100, all_scopes: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """Yields every entry key ({"scope", "key"}) in a standard datastore, following all pages."""
+        async with contextlib.aclosing(self.iter_datastore_entry_pages(datastore_name, scope=scope, prefix=prefix,
+                                                                       page_size=page_size, all_scopes=all_scopes)) as pages:
+            async for keys, _, _ in pages:
+                for key in keys:
+                    yield key
         
     # --- Assets --- 
     
@@ -439,11 +728,68 @@ class RobloxClient:
                  f.close()
 
 
-    async def upload_asset(self, file_path: str, asset_type: str, display_name: str, description: str = "") -> Dict[str, Any]:
-        """Async uploads a file as a new asset (e.g., Model, Image, Audio)."""
+    async def stale_asset_reason(self, asset_id: Any) -> Optional[str]:
+        """Why a previously uploaded asset can no longer be reused (None if it still can)."""
+        try:
+            details = await self.get_asset_details(asset_id)
+        except RobloxApiError as e:
+            if e.status_code == 404:
+                return "asset not found"
+            raise
+        moderation_state = (details.get("moderationResult") or {}).get("moderationState")
+        if moderation_state == "Rejected":
+            return "rejected by moderation"
+        return None
+
+    async def verify_asset_index(self, remove_stale: bool = True, concurrency: int = 4) -> Dict[str, Any]:
+        """Checks every asset_index entry against get_asset_details; drops stale ones when remove_stale."""
+        entries = list(self.asset_index.entries().values())
+        report: Dict[str, Any] = {"checked": len(entries), "valid": 0, "stale": [], "errors": []}
+
+        async def check(entry):
+            return await self.stale_asset_reason(entry["asset_id"])
+
+        async with contextlib.aclosing(ordered_bounded_map(entries, check, concurrency)) as outcomes:
+            async for _, entry, reason, error in outcomes:
+                if error is not None:
+                    report["errors"].append({"asset_id": entry["asset_id"], "error": str(error)})
+                elif reason is None:
+                    report["valid"] += 1
+                    self.asset_index.mark_verified(entry["sha256"], entry["asset_type"])
+                else:
+                    report["stale"].append({"asset_id": entry["asset_id"], "file_name": entry.get("file_name"), "reason": reason})
+                    if remove_stale:
+                        self.asset_index.invalidate(entry["sha256"], entry["asset_type"])
+        return report
+
+    async def upload_asset(self, file_path: str, asset_type: str, display_name: str, description: str = "",
+                           force: bool = False, verify_cached: bool = False) -> Dict[str, Any]:
+        """Async uploads a file as a new asset (e.g., Model, Image, Audio).
+
+        If the same bytes were already uploaded as the same asset type, the
+        recorded asset ID is returned without uploading ("cached": True) unless
+        force is set. verify_cached checks the recorded asset with
+        get_asset_details first and uploads again if it is gone or rejected.
+        """
         if not os.path.exists(file_path): # Keep sync check for existence
             raise FileNotFoundError(f"File not found at path: {file_path}")
 
+        content_hash = None
+        if self.asset_index.enabled:
+            content_hash = await asyncio.to_thread(hash_file, file_path) # Large meshes/audio: keep the loop free
+            cached = None if force else self.asset_index.get(content_hash, asset_type)
+            if cached is not None and verify_cached:
+                reason = await self.stale_asset_reason(cached["asset_id"])
+                if reason is None:
+                    self.asset_index.mark_verified(content_hash, asset_type)
+                else:
+                    logger.info(f"Cached asset {cached['asset_id']} for '{Path(file_path).name}' is stale ({reason}); uploading again")
+                    self.asset_index.invalidate(content_hash, asset_type)
+                    cached = None
+            if cached is not None:
+                logger.info(f"'{Path(file_path).name}' was already uploaded as {asset_type} asset {cached['asset_id']}; skipping upload")
+                return {"assetId": cached["asset_id"], "cached": True, "cacheEntry": cached}
+
         logger.info(f"Uploading asset '{display_name}' ({asset_type}) from file '{Path(file_path).name}'")
         asset_api_url = "https://apis.roblox.com/assets/v1/assets" 
 
@@ -473,12 +819,19 @@ class RobloxClient:
 
                 # Make the request using the client directly (or adapt _request if preferred for retries)
                 # Using client directly for simplicity with multipart files
-                response = await self.client.post(
-                    asset_api_url, 
-                    files=files_payload, 
-                    headers=upload_headers, 
-                    timeout=120.0 # Longer timeout for uploads
-                )
+                limiter = self.rate_limiters.for_url(asset_api_url)
+                async with limiter.slot():
+                    started = time.monotonic()
+                    response = await self.client.post(
+                        asset_api_url, 
+                        files=files_payload, 
+                        headers=upload_headers, 
+                        timeout=120.0 # Longer timeout for uploads
+                    )
+                CLOUD_REQUEST_SECONDS.labels(limiter.name, "POST").observe(time.monotonic() - started)
+                CLOUD_RESPONSES.labels(limiter.name, "POST", response.status_code).inc()
+                if limiter.record_response(response.status_code, response.headers) is not None:
+                    CLOUD_THROTTLED.labels(limiter.name).inc()
                 response.raise_for_status() # Check for HTTP errors
 
                 op_data = response.json()
@@ -500,7 +853,12 @@ class RobloxClient:
                 
                 if asset_id:
                      logger.info(f"Asset upload successful. Asset ID: {asset_id}")
-                     return {"assetId": asset_id, "operationResult": final_result}
+                     if content_hash:
+                         try:
+                             self.asset_index.put(content_hash, asset_type, asset_id, display_name, file_name)
+                         except OSError as e: # The upload itself succeeded; don't report it as failed
+                             logger.warning(f"Could not record asset {asset_id} in the upload index: {e}")
+                     return {"assetId": asset_id, "cached": False, "operationResult": final_result}
                 else:
                      raise RobloxApiError("Asset upload finished but failed to retrieve Asset ID.", response_data=final_result)
 
@@ -518,11 +876,9 @@ class RobloxClient:
     async def get_asset_details(self, asset_id: int) -> Dict[str, Any]:
         """Async gets details for a specific asset ID."""
         logger.info(f"Getting details for asset ID: {asset_id}")
-        # Placeholder - requires correct endpoint
-        # endpoint = f"assets/v1/assets/{asset_id}"
-        # url = f"{API_BASE_URL.rstrip('/')}/{endpoint.lstrip('/')}" 
-        # return await self._request("GET", url)
-        raise NotImplementedError("get_asset_details API call not fully implemented - requires correct endpoint.")
+        endpoint = f"assets/v1/assets/{asset_id}"
+        url = f"{API_BASE_URL.rstrip('/')}/{endpoint.lstrip('/')}"
+        return await self._request("GET", url)
 
     async def list_assets(self, asset_types: Optional[List[str]] = None, 
                       filter_keyword: Optional[str] = None, 
@@ -0,0 +1,236 @@
+import logging
+import time
+from typing import Dict, Any, Optional, List
+
+logger = logging.getLogger(__name__)
+
+# ID the plugin uses for the DataModel (game) itself; services are its children.
+# Only the plugin's MIRRORED_SERVICES are sent, so game itself is never answerable here.
+GAME_ID = 0
+
+class SceneMirror:
+    """In-memory copy of the Studio instance tree, fed by the companion plugin.
+
+    The plugin sends a chunked snapshot (``[id, parent_id, name, class_name]``
+    rows) and then coalesced change batches: an upsert row of the same shape,
+    or ``[id]`` for a removal. Every applied snapshot or change batch bumps
+    ``version``, which only ever increases.
+
+    Only the subtrees of the services the plugin mirrors are held, so
+    lookups return None whenever the mirror can't answer with confidence
+    (cold, stale, a path segment it doesn't know, or game itself, whose
+    children and descendants include services that aren't mirrored), so
+    callers can fall back to a live plugin round trip.
+    """
+
+    def __init__(self, stale_after: float = 15.0):
+        self.stale_after = stale_after
+        self.version = 0
+        self.session: Optional[str] = None
+        self.last_seq = 0
+        self.ready = False
+        self.last_update = 0.0
+        self.handle_prefix: Optional[str] = None # Plugin instance handles are handle_prefix + id
+        self._nodes: Dict[int, List[Any]] = {} # id -> [parent_id, name, class_name]
+        self._children: Dict[int, Dict[int, None]] = {} # parent_id -> ordered child ids
+        self._staging: Optional[Dict[str, Any]] = None
+
+    # --- Feeding the mirror ---
+    def apply_snapshot_chunk(self, session: str, chunk_index: int, final: bool, rows: List[List[Any]],
+                             handle_prefix: Optional[str] = None) -> bool:
+        """Accumulates one snapshot chunk; the tree is swapped in on the final chunk.
+
+        Returns False if the chunk is out of sequence (the plugin should restart the snapshot).
+        """
+        if chunk_index == 0:
+            self._staging = {"session": session, "next_chunk": 0, "nodes": {}, "children": {}}
+        staging = self._staging
+        if staging is None or staging["session"] != session or staging["next_chunk"] != chunk_index:
+            logger.warning(f"Out-of-sequence scene snapshot chunk {chunk_index} for session {session}; discarding snapshot.")
+            self._staging = None
+            return False
+
+        for row in rows:
+            self._upsert(staging["nodes"], staging["children"], row)
+        staging["next_chunk"] += 1
+
+        if final:
+            self._nodes = staging["nodes"]
+            self._children = staging["children"]
+            self._staging = None
+            self.session = session
+            self.handle_prefix = handle_prefix
+            self.last_seq = 0
+            self.ready = True
+            self.version += 1
+            self.last_update = time.monotonic()
+            logger.info(f"Scene mirror loaded snapshot: {len(self._nodes)} instances (version {self.version}).")
+        return True
+
+    def apply_changes(self, session: str, seq: int, changes: List[List[Any]]) -> bool:
+        """Applies one change batch. Returns False if a resync (new snapshot) is needed."""
+        if not self.ready or session != self.session or seq != self.last_seq + 1:
+            if self.ready:
+                logger.warning(f"Scene change batch out of sequence (session {session}, seq {seq}, expected {self.last_seq + 1}); mirror marked stale.")
+            self.ready = False
+            return False
+
+        for change in changes:
+            if len(change) == 1:
+                self._remove_subtree(change[0])
+            else:
+                self._upsert(self._nodes, self._children, change)
+        self.last_seq = seq
+        self.last_update = time.monotonic()
+        if changes:
+            self.version += 1
+        return True
+
+    def mark_stale(self) -> None:
+        self.ready = False
+
+    @property
+    def is_fresh(self) -> bool:
+        return self.ready and (time.monotonic() - self.last_update) < self.stale_after
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "fresh": self.is_fresh,
+            "version": self.version,
+            "instance_count": len(self._nodes),
+            "seconds_since_update": round(time.monotonic() - self.last_update, 3) if self.last_update else None,
+        }
+
+    @staticmethod
+    def _upsert(nodes: Dict[int, List[Any]], children: Dict[int, Dict[int, None]], row: List[Any]) -> None:
+        instance_id, parent_id, name, class_name = row[0], row[1], row[2], row[3]
+        existing = nodes.get(instance_id)
+        if existing is not None and existing[0] != parent_id:
+            siblings = children.get(existing[0])
+            if siblings is not None:
+                siblings.pop(instance_id, None)
+        nodes[instance_id] = [parent_id, name, class_name]
+        children.setdefault(parent_id, {})[instance_id] = None
+
+    def _remove_subtree(self, instance_id: int) -> None:
+        node = self._nodes.pop(instance_id, None)
+        if node is not None:
+            siblings = self._children.get(node[0])
+            if siblings is not None:
+                siblings.pop(instance_id, None)
+        stack = list(self._children.pop(instance_id, {}))
+        while stack:
+            child_id = stack.pop()
+            self._nodes.pop(child_id, None)
+            stack.extend(self._children.pop(child_id, {}))
+
+    # --- Queries (None means "ask the plugin") ---
+    def _find_child(self, parent_id: int, name: str) -> Optional[int]:
+        for child_id in self._children.get(parent_id, ()):
+            if self._nodes[child_id][1] == name:
+                return child_id
+        return None
+
+    def resolve_path(self, path: str) -> Optional[int]:
+        """Resolves a dotted path the same way the plugin's findObjectFromPath does.
+
+        Returns None for game itself: only some of its services are mirrored.
+        """
+        if not self.is_fresh or not path:
+            return None
+        if path.startswith("@"):
+            return self._resolve_handle(path)
+        parts = path.split(".")
+        first = parts[0].lower()
+        current = GAME_ID
+        if first == "game":
+            parts = parts[1:]
+        elif first == "workspace":
+            current = next((cid for cid in self._children.get(GAME_ID, ()) if self._nodes[cid][2] == "Workspace"), None)
+            if current is None:
+                return None
+            parts = parts[1:]
+        for part in parts:
+            current = self._find_child(current, part)
+            if current is None:
+                return None
+        if current == GAME_ID:
+            return None
+        return current
+
+    def _resolve_handle(self, path: str) -> Optional[int]:
+        """Resolves "@<session>:<id>[.Child...]" handles issued by the plugin."""
+        if not self.handle_prefix or not path.startswith(self.handle_prefix):
+            return None
+        handle_id, _, suffix = path[len(self.handle_prefix):].partition(".")
+        if not handle_id.isdigit() or int(handle_id) not in self._nodes:
+            return None
+        current = int(handle_id)
+        for part in suffix.split(".") if suffix else ():
+            current = self._find_child(current, part)
+            if current is None:
+                return None
+        return current
+
+    def path_of(self, instance_id: int) -> Optional[str]:
+        """Full name as Instance:GetFullName() would return it."""
+        names = []
+        current = instance_id
+        while current != GAME_ID:
+            node = self._nodes.get(current)
+            if node is None:
+                return None
+            names.append(node[1])
+            current = node[0]
+        return ".".join(reversed(names))
+
+    def describe(self, instance_id: int) -> Optional[Dict[str, Any]]:
+        node = self._nodes.get(instance_id)
+        if node is None:
+            return None
+        description = {"name": node[1], "className": node[2], "path": self.path_of(instance_id)}
+        if self.handle_prefix:
+            description["handle"] = f"{self.handle_prefix}{instance_id}"
+        return description
+
+    def list_children(self, parent_path: str) -> Optional[List[Dict[str, Any]]]:
+        parent_id = self.resolve_path(parent_path)
+        if parent_id is None:
+            return None
+        return [self.describe(child_id) for child_id in self._children.get(parent_id, ())]
+
+    def find_instances(self, search_root: str, class_name: Optional[str] = None,
+                       name_contains: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        root_id = self.resolve_path(search_root)
+        if root_id is None:
+            return None
+        name_filter = name_contains.lower() if name_contains else None
+        matches = []
+        stack = list(reversed(list(self._children.get(root_id, ()))))
+        while stack: # Depth-first, children in order, like GetDescendants()
+            instance_id = stack.pop()
+            node = self._nodes[instance_id]
+            if (class_name is None or node[2] == class_name) and (name_filter is None or name_filter in node[1].lower()):
+                matches.append(self.describe(instance_id))
+            stack.extend(reversed(list(self._children.get(instance_id, ()))))
+        return matches
+
+    def get_property(self, object_path: str, property_name: str) -> Optional[Dict[str, Any]]:
+        """Answers the few properties the mirror tracks (Name, ClassName, Parent)."""
+        if property_name not in ("Name", "ClassName", "Parent"):
+            return None
+        instance_id = self.resolve_path(object_path)
+        if instance_id is None:
+            return None
+        parent_id, name, class_name = self._nodes[instance_id]
+        if property_name == "Name":
+            return {"value": name}
+        if property_name == "ClassName":
+            return {"value": class_name}
+        if parent_id == GAME_ID:
+            return None # The DataModel itself isn't mirrored; let the plugin serialize it
+        parent = self.describe(parent_id)
+        if parent is None:
+            return None
+        return {"value": {"type": "Instance", **parent}}
@@ -7,11 +7,13 @@ from collections import deque # Use deque for simple non-async queue
 from datetime import datetime # For timestamping logs received from plugin
 import uuid # For generating unique request IDs
 import time # For timeouts
-import threading # For locking access to shared results
+import contextlib # aclosing() for early exits from Cloud listing iterators
+import base64 # Opaque scene-mirror cursors
 
 # --- FastAPI Imports ---
 from fastapi import FastAPI, HTTPException, Request # Added Request
-from fastapi.responses import JSONResponse # For returning JSON
+from fastapi.responses import JSONResponse, PlainTextResponse # For returning JSON (and /metrics text)
+from fastapi.routing import APIRoute
 # --- End FastAPI Imports ---
 
 from mcp.server.fastmcp import FastMCP, Context
@@ -22,9 +24,22 @@ from .roblox_client import RobloxClient, RobloxApiError # Import client and erro
 from .sse import create_sse_server # Import the SSE server creator
 
 # --- Local Imports ---
-from .config import load_config, Settings # Import config loading
+from .config import load_config, Settings, load_plugin_config, PluginSettings # Import config loading
 from .roblox_client import RobloxClient, RobloxApiError # Import client and error
 from .sse import create_sse_server # Import the SSE server creator
+from .plugin_bridge import (PluginResultRegistry, PluginCommandQueue, PluginPresence, PluginUnavailableError, # Future-based result delivery and long-poll queue
+                            ChunkedResultAssembler, ResultChunkError)
+from .scene_mirror import SceneMirror # Live instance tree pushed by the plugin
+from .studio_logs import StudioLogStore # Sequence-numbered Studio output ring
+from .instance_listing import COLUMNAR_FORMAT, expand_instance_listing # Compact list_children/find_instances payloads
+from .compression import GzipRequestMiddleware, json_response # gzip bodies on the plugin endpoints
+from . import json_codec # orjson when installed, stdlib json otherwise
+from .datastore_export import export_datastore_jsonl, ExportCheckpointError # Resumable DataStore -> JSONL export
+from .datastore_backup import (backup_datastores as backup_datastores_to_archive, restore_datastores, # Chunked DataStore backups
+                               BackupError, RESTORE_MODES)
+from .metrics import (REGISTRY as METRICS_REGISTRY, PLUGIN_QUEUE_DEPTH, PLUGIN_PENDING_RESULTS, PLUGIN_CONNECTED,
+                      PLUGIN_ROUNDTRIP_SECONDS, PLUGIN_COMMANDS, PLUGIN_TIMEOUTS,
+                      PLUGIN_POLL_INTERVAL_SECONDS, PLUGIN_POLL_GAP_SECONDS, PLUGIN_CHUNKED_RESULTS, PLUGIN_CHUNK_BUFFER_BYTES)
 # --- End Local Imports ---
 
 # --- Removed Uvicorn Import ---
@@ -67,56 +82,161 @@ try:
 except Exception as e:
     logger.error(f"Failed to load configuration: {e}. Ensure .env file exists.", exc_info=True)
     global_config = None
+try:
+    plugin_config = load_plugin_config()
+except Exception as e:
+    logger.error(f"Invalid plugin bridge settings: {e}. Using defaults.")
+    plugin_config = PluginSettings.model_construct()
 # --- End Load Config ---
 
-# --- Removed Global Roblox Client (will be instantiated per tool call or managed differently) ---
-# global_roblox_client: Optional[RobloxClient] = None
+# --- Shared Roblox Client ---
+# One pooled httpx client for all Open Cloud tools; created at startup, closed on shutdown
+roblox_client: Optional[RobloxClient] = None
 
 # --- Plugin Command Queue ---
-plugin_command_queue: deque = deque()
+plugin_command_queue = PluginCommandQueue()
+# How long a long-poll /plugin_command request is held open when the queue is empty.
+# Kept below the 15s client timeout in check_disconnected_clients so a parked poll
+# never makes the plugin look disconnected.
+PLUGIN_LONG_POLL_TIMEOUT = 10.0
+# Upper bound on ?max_commands for a single /plugin_command response
+PLUGIN_MAX_COMMANDS_PER_POLL = 100
 
 # --- Last Script Logs ---
 last_script_logs: Dict[str, Any] = {"output": None, "error": None}
 
 # --- Studio Log Buffer ---
-# Store tuples: (server_timestamp, log_entry_dict_from_plugin)
-studio_log_buffer: deque = deque(maxlen=200) # Limit to last 200 entries
+# Ring of Studio output lines with sequence numbers, so readers can page from a cursor
+STUDIO_LOG_CAPACITY = 5000
+studio_log_store = StudioLogStore(capacity=STUDIO_LOG_CAPACITY)
 
 # --- Plugin Result Handling ---
-# Dictionary to store results reported back by the plugin
-# Key: request_id (str), Value: Result data or None if pending
-pending_plugin_results: Dict[str, Any] = {}
-# Lock to ensure thread-safe access to pending_plugin_results
-plugin_results_lock = threading.Lock()
+# One asyncio future per in-flight request_id, resolved by /plugin_report_result
+pending_plugin_results = PluginResultRegistry()
+# When the plugin last polled; tools use it to fail fast (or wait) instead of queueing into the void
+plugin_presence = PluginPresence(stale_after=15.0)
+# What queue_command_and_wait does when the plugin isn't polling (PLUGIN_DISCONNECTED_POLICY /
+# PLUGIN_RECONNECT_WAIT in .env): "fail_fast" raises PluginUnavailableError at once, "wait" holds
+# the command up to PLUGIN_RECONNECT_WAIT seconds and sends it the moment the plugin polls again
+PLUGIN_DISCONNECTED_POLICY = plugin_config.plugin_disconnected_policy
+PLUGIN_RECONNECT_WAIT = plugin_config.plugin_reconnect_wait
+
+def _reconnect_wait_field():
+    # Shared per-call override of the disconnected policy for every tool that waits on the plugin
+    return Field(None, description="If the Studio plugin isn't connected: seconds to hold the command for it to reconnect (0 = fail immediately). Defaults to the server's PLUGIN_DISCONNECTED_POLICY / PLUGIN_RECONNECT_WAIT.")
+# Results too big for one POST arrive in chunks via /plugin_report_result_chunk.
+# Incomplete transfers share RESULT_CHUNK_BUFFER_LIMIT bytes and are dropped after RESULT_CHUNK_EXPIRY idle seconds.
+RESULT_CHUNK_BUFFER_LIMIT = 64 * 1024 * 1024
+RESULT_CHUNK_EXPIRY = 60.0
+result_chunks = ChunkedResultAssembler(max_buffered_bytes=RESULT_CHUNK_BUFFER_LIMIT, expire_after=RESULT_CHUNK_EXPIRY)
 # --- End Plugin Result Handling ---
 
+# --- Metrics ---
+# Live values read at scrape time; poll timestamps feed the poll interval/gap histograms
+PLUGIN_QUEUE_DEPTH.set_function(lambda: len(plugin_command_queue))
+PLUGIN_PENDING_RESULTS.set_function(lambda: len(pending_plugin_results))
+PLUGIN_CONNECTED.set_function(lambda: 1 if polling_connected else 0)
+PLUGIN_CHUNK_BUFFER_BYTES.set_function(lambda: result_chunks.buffered_bytes)
+# --- End Metrics ---
+
+# --- Scene Mirror ---
+# Server-side copy of the Studio instance tree; read tools answer from it when fresh
+scene_mirror = SceneMirror()
+# --- End Scene Mirror ---
+
 # --- Pydantic Model for Incoming Logs ---
 class StudioLogEntry(BaseModel):
     message: str
     log_type: str # e.g., "Print", "Info", "Warning", "Error"
     timestamp: float # Plugin timestamp (os.clock() or similar)
 
+# --- Fast JSON for the plugin endpoints ---
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return json_codec.dumps(content)
+
+class FastJSONRequest(Request):
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = json_codec.loads(await self.body())
+        return self._json
+
+class FastJSONRoute(APIRoute):
+    """Route whose request bodies are parsed with json_codec (pydantic validation is unchanged)."""
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        async def fast_json_handler(request: Request):
+            return await handler(FastJSONRequest(request.scope, request.receive))
+        return fast_json_handler
+# --- End Fast JSON ---
+
 # --- Main FastAPI App ---
 app = FastAPI(
     title="Vibe Blocks MCP Server (SSE) with Plugin Endpoint", # <<< RENAME
-    description="Combines MCP Tools (via SSE) with custom endpoints for Roblox Studio Plugin communication."
+    description="Combines MCP Tools (via SSE) with custom endpoints for Roblox Studio Plugin communication.",
+    default_response_class=FastJSONResponse
 )
+app.router.route_class = FastJSONRoute
+logger.info(f"Plugin endpoint JSON backend: {json_codec.BACKEND}")
+# The plugin gzips large result/log/scene posts (Content-Encoding: gzip); inflate them before routing
+app.add_middleware(GzipRequestMiddleware)
 # --- End Main FastAPI App ---
 
 # --- Add Endpoint for Studio Plugin (DEFINED BEFORE MOUNTING SSE) ---
-@app.get("/plugin_command", response_class=JSONResponse)
-async def get_plugin_command():
-    """Endpoint for the Roblox Studio plugin to poll for commands."""
+@app.get("/plugin_command", response_class=FastJSONResponse)
+async def get_plugin_command(request: Request, long_poll: bool = False, max_commands: Optional[int] = None, gzip: bool = False):
+    """Endpoint for the Roblox Studio plugin to poll for commands.
+
+    With ?long_poll=1 the request is held open until a command is queued or
+    PLUGIN_LONG_POLL_TIMEOUT expires. With ?max_commands=N the response is
+    {"commands": [...]} holding up to N queued commands. Without either
+    parameter a single command (or {}) is returned immediately, as older
+    plugin builds expect. With ?gzip=1 large answers are gzip-encoded.
+    """
     global plugin_command_queue # Added global access
+    batch_size = None
+    if max_commands is not None:
+        batch_size = max(1, min(max_commands, PLUGIN_MAX_COMMANDS_PER_POLL))
+
+    def take_commands():
+        """Pops the response payload, raising IndexError if the queue is empty."""
+        if batch_size is None:
+            return plugin_command_queue.popleft()
+        commands = plugin_command_queue.pop_batch(batch_size)
+        if not commands:
+            raise IndexError("plugin command queue is empty")
+        return {"commands": commands}
+
+    empty_response = {} if batch_size is None else {"commands": []}
     try:
-        # Get the next command from the left side of the queue
-        command = plugin_command_queue.popleft()
-        logger.info(f"Dequeued command for Studio plugin: {command}")
-        return command # FastAPI automatically encodes dict to JSON
+        if long_poll:
+            deadline = time.monotonic() + PLUGIN_LONG_POLL_TIMEOUT
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not await plugin_command_queue.wait_not_empty(remaining):
+                    break
+                # Don't hand a command to a poll whose connection has already gone away
+                if await request.is_disconnected():
+                    logger.debug("Long-poll client disconnected before a command could be delivered.")
+                    return empty_response
+                try:
+                    payload = take_commands()
+                except IndexError:
+                    # Another poller took it first; keep waiting for the rest of the window
+                    continue
+                logger.info(f"Dequeued command(s) for Studio plugin (long-poll): {payload}")
+                return json_response(payload, allow_gzip=gzip)
+            logger.debug("Long-poll window expired with no command.")
+            return empty_response
+
+        # Get the next command(s) from the left side of the queue
+        payload = take_commands()
+        logger.info(f"Dequeued command(s) for Studio plugin: {payload}")
+        return json_response(payload, allow_gzip=gzip)
     except IndexError:
         # Queue is empty
         logger.debug("Plugin command queue empty.") # Add debug log
-        return {} # Return empty JSON object
+        return empty_response # Return empty JSON object
     except Exception as e:
         logger.exception("Error processing plugin command request")
         # Return an error response to the plugin
@@ -137,6 +257,13 @@ async def track_connections(request: Request, call_next):
     connection_type = "Unknown"
     if path == "/plugin_command":
         connection_type = "Polling"
+        poll_started = time.monotonic()
+        if plugin_presence.last_poll_started is not None:
+            PLUGIN_POLL_INTERVAL_SECONDS.observe(poll_started - plugin_presence.last_poll_started)
+        # Only a gap if no other poll was outstanding in between
+        if plugin_presence.last_poll_finished is not None and not plugin_presence.poll_in_flight:
+            PLUGIN_POLL_GAP_SECONDS.observe(poll_started - plugin_presence.last_poll_finished)
+        plugin_presence.poll_started()
         # ポーリング接続を検出したら接続状態をリセット
         if not polling_connected:
             polling_connected = True
@@ -145,10 +272,15 @@ async def track_connections(request: Request, call_next):
         else:
             # すでに接続済みの場合は、単にミスカウントをリセット
             polling_missed_count = 0
-    elif path == "/plugin_report_result":
+    elif path in ("/plugin_report_result", "/plugin_report_results", "/plugin_report_result_chunk"):
         connection_type = "Result Reporting"
+        plugin_presence.mark_seen()
     elif path == "/receive_studio_logs":
         connection_type = "Log Forwarding"
+        plugin_presence.mark_seen()
+    elif path in ("/plugin_scene_snapshot", "/plugin_scene_events"):
+        connection_type = "Scene Sync"
+        plugin_presence.mark_seen()
     else:
         connection_type = f"Other ({path})"
     
@@ -169,6 +301,11 @@ async def track_connections(request: Request, call_next):
     
     try:
         response = await call_next(request)
+        if connection_type == "Polling":
+            plugin_presence.poll_finished()
+        # Long-polls can be held open for a while; count the answer as activity too
+        if client in connected_clients:
+            connected_clients[client]["last_activity"] = time.time()
         return response
     except Exception as e:
         # If an error occurs, the client might have disconnected
@@ -198,6 +335,7 @@ async def check_disconnected_clients():
                     # 3回連続でミスしたら切断と判断
                     if polling_missed_count >= 3 and polling_connected:
                         polling_connected = False
+                        scene_mirror.mark_stale()
                         print(f"{YELLOW}Warning: Roblox Studio plugin has been disabled or disconnected!{RESET}")
                         logger.warning(f"Roblox Studio plugin disabled or disconnected: {client}")
                     else:
@@ -215,6 +353,7 @@ async def check_disconnected_clients():
             # 3回連続でミスしたら切断と判断
             if polling_missed_count >= 3:
                 polling_connected = False
+                scene_mirror.mark_stale()
                 print(f"{YELLOW}Warning: Roblox Studio plugin has been disabled or disconnected!{RESET}")
                 logger.warning(f"Roblox Studio plugin disabled: No polling connection found")
         
@@ -224,9 +363,25 @@ async def check_disconnected_clients():
 @app.on_event("startup")
 async def startup_event():
     asyncio.create_task(check_disconnected_clients())
+    # Warm up the shared Open Cloud client so the first tool call doesn't pay for it
+    await _get_roblox_client()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    global roblox_client
+    if roblox_client is not None:
+        await roblox_client.close_session()
+        roblox_client = None
 
 # --- End Endpoint for Studio Plugin ---
 
+# --- Metrics Endpoint ---
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus scrape endpoint (text exposition format 0.0.4)."""
+    return PlainTextResponse(METRICS_REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+# --- End Metrics Endpoint ---
+
 # --- Add Endpoint for Reporting Plugin Results (NEW) ---
 class PluginResultPayload(BaseModel):
     request_id: str
@@ -235,21 +390,71 @@ class PluginResultPayload(BaseModel):
 @app.post("/plugin_report_result")
 async def report_plugin_result(payload: PluginResultPayload, request: Request):
     """Endpoint for the Studio plugin to report the result of an executed command."""
-    global pending_plugin_results, plugin_results_lock
     client_host = request.client.host if request.client else "unknown"
     request_id = payload.request_id
     result_data = payload.result
     logger.info(f"Received result for request_id {request_id} from plugin at {client_host}")
     
-    with plugin_results_lock:
-        if request_id in pending_plugin_results:
-            pending_plugin_results[request_id] = result_data
-            logger.debug(f"Stored result for {request_id}")
+    if pending_plugin_results.resolve(request_id, result_data):
+        logger.debug(f"Delivered result for {request_id}")
+    else:
+        # This might happen if the server restarted or the request timed out
+        logger.warning(f"Received result for unknown or expired request_id: {request_id}")
+
+    return {"status": "success", "request_id": request_id}
+
+class PluginResultBatchPayload(BaseModel):
+    results: List[PluginResultPayload]
+
+@app.post("/plugin_report_results")
+async def report_plugin_results(payload: PluginResultBatchPayload, request: Request):
+    """Endpoint for the Studio plugin to report many command results in one POST."""
+    client_host = request.client.host if request.client else "unknown"
+    delivered = 0
+    for entry in payload.results:
+        if pending_plugin_results.resolve(entry.request_id, entry.result):
+            delivered += 1
         else:
-            # This might happen if the server restarted or the request timed out
-            logger.warning(f"Received result for unknown or expired request_id: {request_id}")
-            # Optionally, could still store it for a short time in case of race conditions
+            logger.warning(f"Received batched result for unknown or expired request_id: {entry.request_id}")
+    logger.info(f"Received {len(payload.results)} batched result(s) from plugin at {client_host} ({delivered} delivered)")
+    return {"status": "success", "received": len(payload.results), "delivered": delivered}
+
+@app.post("/plugin_report_result_chunk")
+async def report_plugin_result_chunk(request: Request, request_id: str, index: int, total: int):
+    """Endpoint for one chunk of a result too large for a single POST.
+
+    The body is a slice of the encoded {request_id, result} JSON (chunks are
+    numbered from 0). The waiter is resolved once the last chunk arrives.
+    """
+    expired = result_chunks.expire()
+    if expired:
+        PLUGIN_CHUNKED_RESULTS.labels("expired").inc(expired)
+    if request_id not in pending_plugin_results:
+        # Tell the plugin to stop sending: nobody is waiting for this result anymore
+        result_chunks.discard(request_id)
+        return {"status": "unknown_request", "request_id": request_id}
 
+    try:
+        complete = result_chunks.add(request_id, index, total, await request.body())
+    except ResultChunkError as e:
+        logger.warning(f"Rejected result chunk {index}/{total} for {request_id}: {e}")
+        PLUGIN_CHUNKED_RESULTS.labels("rejected").inc()
+        pending_plugin_results.resolve(request_id, {"error": f"Result could not be delivered: {e}"})
+        return JSONResponse(status_code=413, content={"status": "error", "detail": str(e)})
+    if complete is None:
+        return {"status": "partial", "request_id": request_id}
+
+    try:
+        result_data = json_codec.loads(complete)["result"]
+    except (ValueError, KeyError, TypeError) as e:
+        logger.error(f"Reassembled result for {request_id} is not a valid result payload: {e}")
+        PLUGIN_CHUNKED_RESULTS.labels("invalid").inc()
+        pending_plugin_results.resolve(request_id, {"error": f"Reassembled result was not valid JSON: {e}"})
+        return JSONResponse(status_code=400, content={"status": "error", "detail": str(e)})
+
+    PLUGIN_CHUNKED_RESULTS.labels("complete").inc()
+    logger.info(f"Reassembled {len(complete)}-byte result for request_id {request_id} from {total} chunk(s)")
+    pending_plugin_results.resolve(request_id, result_data)
     return {"status": "success", "request_id": request_id}
 # --- End Endpoint for Reporting Plugin Results ---
 
@@ -257,26 +462,50 @@ async def report_plugin_result(payload: PluginResultPayload, request: Request):
 @app.post("/receive_studio_logs")
 async def receive_studio_logs(logs: List[StudioLogEntry], request: Request):
     """Endpoint for the Roblox Studio plugin to push captured logs."""
-    global studio_log_buffer
     client_host = request.client.host if request.client else "unknown"
     try:
         server_received_time = datetime.now().timestamp()
         log_count = len(logs)
         logger.info(f"Received {log_count} log entries from plugin at {client_host}")
-        # Store logs with server timestamp for potential sorting/filtering later
-        # Convert Pydantic model back to dict for storage if needed, or store model directly
-        # Storing dicts might be simpler for the tool later
-        processed_logs = [
-            (server_received_time, log.model_dump()) for log in logs
-        ]
-        studio_log_buffer.extend(processed_logs)
-        return {"status": "success", "received": log_count}
+        for log in logs:
+            studio_log_store.append(log.message, log.log_type, log.timestamp, server_received_time)
+        return {"status": "success", "received": log_count, "last_seq": studio_log_store.last_seq}
     except Exception as e:
         logger.exception(f"Error processing logs from {client_host}")
         # Don't raise HTTPException usually, just log and return error status
         return JSONResponse(status_code=500, content={"status": "error", "detail": str(e)})
 # --- End Endpoint for Receiving Studio Logs ---
 
+# --- Add Endpoints for Scene Mirror Sync (NEW) ---
+class SceneSnapshotPayload(BaseModel):
+    session: str
+    chunk_index: int
+    final: bool
+    nodes: List[List[Any]] # [id, parent_id, name, class_name]
+    handle_prefix: Optional[str] = None # IDs double as instance handles: handle = prefix + id
+
+class SceneEventsPayload(BaseModel):
+    session: str
+    seq: int
+    changes: List[List[Any]] # upsert: [id, parent_id, name, class_name], removal: [id]
+
+@app.post("/plugin_scene_snapshot")
+async def receive_scene_snapshot(payload: SceneSnapshotPayload):
+    """Endpoint for the plugin to upload the instance tree, in chunks."""
+    if not scene_mirror.apply_snapshot_chunk(payload.session, payload.chunk_index, payload.final, payload.nodes,
+                                             handle_prefix=payload.handle_prefix):
+        return {"status": "resync"}
+    return {"status": "success", "version": scene_mirror.version}
+
+@app.post("/plugin_scene_events")
+async def receive_scene_events(payload: SceneEventsPayload):
+    """Endpoint for the plugin to push coalesced scene changes (empty batches act as heartbeats)."""
+    if not scene_mirror.apply_changes(payload.session, payload.seq, payload.changes):
+        # Tell the plugin to send a fresh snapshot
+        return {"status": "resync"}
+    return {"status": "success", "version": scene_mirror.version}
+# --- End Endpoints for Scene Mirror Sync ---
+
 # --- MCP Server Instance (Handles Tool Definitions) ---
 # Note: We still need the FastMCP instance to register tools to.
 mcp_server = FastMCP(
@@ -524,17 +753,20 @@ def safe_object_path(path: str) -> str:
 
 # --- Refactor Tool Handlers to Initialize Client ---
 async def _get_roblox_client() -> Optional[RobloxClient]:
-    """Helper to get or initialize the Roblox client based on global config."""
+    """Returns the shared Roblox client, creating it on first use.
+
+    The client (and its pooled keep-alive connections) lives for the whole
+    app lifetime and is closed on shutdown, so tools must not close it.
+    """
+    global roblox_client
     if not global_config:
         logger.error("Cannot initialize RobloxClient: Configuration not loaded.")
         return None
+    if roblox_client is not None and not roblox_client.is_closed:
+        return roblox_client
     try:
-        # Consider caching this client instance if performance becomes an issue,
-        # but initializing per-call is safer for now.
-        # We need to properly handle session closing if we cache.
-        client = RobloxClient(global_config)
-        # logger.debug(f"Initialized RobloxClient instance: {id(client)}")
-        return client
+        roblox_client = RobloxClient(global_config)
+        return roblox_client
     except Exception as e:
         logger.error(f"Failed to initialize RobloxClient: {e}", exc_info=True)
         return None
@@ -561,7 +793,7 @@ async def execute_luau_in_cloud(ctx: Context, script_text: str = Field(..., desc
             # If we got a dict/list, assume it was parsed JSON
             try:
                 # Pretty-print the JSON result
-                output_str = json.dumps(result, indent=2)
+                output_str = json_codec.dumps_text(result, indent=True)
                 logger.info(f"Luau execution returned parsed JSON object.")
                 # Check for an error key within the JSON itself
                 if isinstance(result, dict) and result.get("error"):
@@ -618,23 +850,33 @@ async def execute_luau_in_cloud(ctx: Context, script_text: str = Field(..., desc
         logger.exception("Unexpected error during execute_luau tool execution.") # Log traceback
         last_script_logs["error"] = f"Unexpected server error: {e}"
         return f"Unexpected server error: {e}"
-    finally:
-        # Ensure client session is closed if initialized per-call
-        if client:
-            await client.close_session()
+
+# Object paths the validating tools accept: dotted names, or an instance handle with an optional ".Child" suffix
+OBJECT_PATH_PATTERN = re.compile(r"^(?:[\w.]+|@[0-9A-Fa-f]+:\d+(?:\.[\w.]+)?)$")
+
+def _is_valid_object_path(path: str) -> bool:
+    return OBJECT_PATH_PATTERN.match(path) is not None
 
 @mcp_server.tool()
-async def get_property(ctx: Context, object_name: str = Field(..., description="Name or path of the object (e.g., 'MyPart' or 'Workspace.Model.Part')."), property_name: str = Field(..., description="Name of the property to retrieve (e.g., 'Position', 'Name', 'BrickColor').")) -> str:
+async def get_property(ctx: Context, object_name: str = Field(..., description="Name or path of the object (e.g., 'MyPart' or 'Workspace.Model.Part')."), property_name: str = Field(..., description="Name of the property to retrieve (e.g., 'Position', 'Name', 'BrickColor')."),
+                       reconnect_wait: Optional[float] = _reconnect_wait_field()) -> str:
     """Retrieves the value of a specific property from an object via the Studio Plugin."""
     # <<< CHANGE: Use plugin queue AND WAIT instead of Luau execution >>>
     logger.info(f"Requesting property '{property_name}' for object '{object_name}' via plugin")
 
     # Basic validation
-    if not re.match(r"^[\w.]+$", object_name): # Allow dots in object name path
+    if not _is_valid_object_path(object_name): # Dotted paths or @session:id handles
         return f"Tool: get_property, Error: Invalid object name format: {object_name}"
     if not re.match(r"^\w+$", property_name):
         return f"Tool: get_property, Error: Invalid property name format: {property_name}"
 
+    # Name/ClassName/Parent are tracked by the scene mirror; skip the round trip when it's fresh
+    mirrored = scene_mirror.get_property(object_name, property_name)
+    if mirrored is not None:
+        value = mirrored["value"]
+        value_str = json_codec.dumps_text(value, indent=True) if isinstance(value, (dict, list)) else str(value)
+        return f"Tool: get_property, Result: Property '{property_name}' of '{object_name}' is: {value_str} (scene mirror version {scene_mirror.version})"
+
     command = {
         "action": "get_property",
         "data": {
@@ -646,7 +888,7 @@ async def get_property(ctx: Context, object_name: str = Field(..., description="
 
     try:
         # Use the helper to queue and wait
-        result_data = await queue_command_and_wait(command, timeout=10.0)
+        result_data = await queue_command_and_wait(command, timeout=10.0, reconnect_wait=reconnect_wait)
 
         logger.info(f"Received result for get_property({object_name}.{property_name}): {result_data}")
 
@@ -661,7 +903,7 @@ async def get_property(ctx: Context, object_name: str = Field(..., description="
                 # Format the output nicely
                 # If the value itself is a dict (e.g., serialized Vector3), pretty print it
                 if isinstance(value, (dict, list)):
-                    value_str = json.dumps(value, indent=2)
+                    value_str = json_codec.dumps_text(value, indent=True)
                 else:
                     value_str = str(value)
                 return f"Tool: get_property, Result: Property '{property_name}' of '{object_name}' is: {value_str}"
@@ -675,6 +917,8 @@ async def get_property(ctx: Context, object_name: str = Field(..., description="
             return f"Tool: get_property, Error: Received unexpected result type from plugin: {type(result_data).__name__}"
         # --- End Result Processing ---
 
+    except PluginUnavailableError as e:
+        return f"Tool: get_property, Error: {e}"
     except TimeoutError as e:
         logger.error(f"Timeout waiting for get_property result: {e}")
         return f"Tool: get_property, Error: Timeout waiting for response from Studio plugin for '{object_name}.{property_name}'."
@@ -683,9 +927,29 @@ async def get_property(ctx: Context, object_name: str = Field(..., description="
         return f"Tool: get_property, Error: An unexpected server error occurred: {e}"
     # <<< END CHANGE >>>
 
+def _format_handle(entry: Dict[str, Any]) -> str:
+    """' Handle: @...' suffix for an instance entry, if the plugin issued one."""
+    return f" Handle: {entry['handle']}" if entry.get("handle") else ""
+
+def _format_list_children(parent_name: str, children: List[Dict[str, Any]]) -> str:
+    """Formats a list of {name, className, path} dicts as list_children tool output."""
+    if not children:
+        return f"Tool: list_children, Result: No children found for '{parent_name}'."
+    output_str = f"Tool: list_children, Result: Children of '{parent_name}':\n"
+    output_str += "\n".join([f"- {child.get('name', '?')} ({child.get('className', '?')}) Path: {child.get('path', '?')}{_format_handle(child)}" for child in children])
+    return output_str
+
 @mcp_server.tool()
-async def list_children(ctx: Context, parent_name: str = Field("Workspace", description="Name or path of the parent object (e.g., 'Workspace', 'Workspace.Model').")) -> str:
+async def list_children(ctx: Context, parent_name: str = Field("Workspace", description="Name or path of the parent object (e.g., 'Workspace', 'Workspace.Model')."),
+                        use_mirror: bool = Field(True, description="Answer from the server's scene mirror when it is fresh (set false to force a live plugin read)."),
+                        reconnect_wait: Optional[float] = _reconnect_wait_field()) -> str:
     """Retrieves children of an object via the Studio Plugin and waits for the result."""
+    if use_mirror:
+        mirrored = scene_mirror.list_children(parent_name)
+        if mirrored is not None:
+            logger.info(f"Answered list_children({parent_name}) from scene mirror (version {scene_mirror.version})")
+            return _format_list_children(parent_name, mirrored) + f"\n(Scene mirror version {scene_mirror.version})"
+
     # <<< CHANGE: Use plugin queue AND WAIT instead of just queueing >>>
     logger.info(f"Requesting list_children via plugin for parent: '{parent_name}'")
 
@@ -693,7 +957,8 @@ async def list_children(ctx: Context, parent_name: str = Field("Workspace", desc
     command = {
         "action": "list_children",
         "data": {
-            "parent_name": parent_name # Send the original name for the plugin to resolve
+            "parent_name": parent_name, # Send the original name for the plugin to resolve
+            "format": COLUMNAR_FORMAT # Parallel arrays instead of one dict per child; older plugins ignore this
         }
         # request_id will be added by queue_command_and_wait
     }
@@ -702,9 +967,9 @@ async def list_children(ctx: Context, parent_name: str = Field("Workspace", desc
         logger.info(f"Attempting to list children for parent: {parent_name}")
         
         # Use the new helper to queue and wait for the result
-        result_data = await queue_command_and_wait(command, timeout=15.0) # Increased timeout slightly
-        
-        logger.info(f"Received result for list_children({parent_name}): {result_data}")
+        result_data = expand_instance_listing(await queue_command_and_wait(command, timeout=15.0, reconnect_wait=reconnect_wait)) # Increased timeout slightly
+
+        logger.info(f"Received result for list_children({parent_name}): {len(result_data) if isinstance(result_data, list) else result_data} child(ren)")
 
         # --- Result Processing ---
         if isinstance(result_data, dict) and "error" in result_data:
@@ -715,20 +980,15 @@ async def list_children(ctx: Context, parent_name: str = Field("Workspace", desc
              return f"Tool: list_children, Error from plugin: {error_msg}"
         elif isinstance(result_data, list):
              # Assume success, result is the list of children dicts
-             # Format the list into a user-friendly string output
-             if not result_data:
-                  return f"Tool: list_children, Result: No children found for '{parent_name}'."
-             else:
-                  output_str = f"Tool: list_children, Result: Children of '{parent_name}':\n"
-                  # <<< CHANGE: Include path in output formatting >>>
-                  output_str += "\n".join([f"- {child.get('name', '?')} ({child.get('className', '?')}) Path: {child.get('path', '?')}" for child in result_data])
-                  return output_str
+             return _format_list_children(parent_name, result_data)
         else:
             # Unexpected result format from plugin
             logger.warning(f"Received unexpected result format for list_children({parent_name}): {result_data} (Type: {type(result_data)})")
             return f"Tool: list_children, Error: Received unexpected result format from plugin: {result_data}"
         # --- End Result Processing ---
 
+    except PluginUnavailableError as e:
+        return f"Tool: list_children, Error: {e}"
     except TimeoutError as e:
         logger.error(f"Timeout waiting for list_children result for parent: {parent_name}: {e}")
         return f"Tool: list_children, Error: Timeout waiting for response from Studio plugin for parent '{parent_name}'."
@@ -738,34 +998,110 @@ async def list_children(ctx: Context, parent_name: str = Field("Workspace", desc
         return f"Tool: list_children, Error: An unexpected server error occurred: {e}"
     # <<< END CHANGE >>>
 
+def _format_find_instances(search_root: str, instances: List[Dict[str, Any]], offset: int = 0,
+                           next_cursor: Optional[str] = None) -> str:
+    """Formats a page of {name, className, path[, properties]} dicts as find_instances tool output."""
+    if not instances and offset == 0 and not next_cursor:
+        return f"Tool: find_instances, Result: No instances found matching criteria under '{search_root}'."
+    # Expecting list of dicts like {name, className, path}
+    if offset or next_cursor:
+        output_str = f"Tool: find_instances, Result: Found {len(instances)} instance(s) under '{search_root}' (results {offset + 1}-{offset + len(instances)}):\n"
+    else:
+        output_str = f"Tool: find_instances, Result: Found {len(instances)} instance(s) under '{search_root}':\n"
+    lines = []
+    for inst in instances:
+        line = f"- {inst.get('name', '?')} ({inst.get('className', '?')}) at path: {inst.get('path', '?')}{_format_handle(inst)}"
+        if inst.get("properties"):
+            line += f" {json_codec.dumps_text(inst['properties'])}"
+        lines.append(line)
+    output_str += "\n".join(lines)
+    if next_cursor:
+        output_str += f"\nMore results available: call find_instances again with cursor='{next_cursor}'."
+    return output_str
+
+FIND_INSTANCES_MAX_LIMIT = 2000
+MIRROR_CURSOR_PREFIX = "mirror:" # Mirror pages are offset-based: "mirror:" + base64 of [offset, search_root, class_name, name_contains]
+
+def _encode_mirror_cursor(offset: int, search_root: str, class_name: Optional[str], name_contains: Optional[str]) -> str:
+    payload = json_codec.dumps([offset, search_root, class_name, name_contains])
+    return MIRROR_CURSOR_PREFIX + base64.urlsafe_b64encode(payload).decode("ascii")
+
+def _decode_mirror_cursor(cursor: str) -> Optional[List[Any]]:
+    """Returns [offset, search_root, class_name, name_contains], or None if the cursor is malformed."""
+    try:
+        state = json_codec.loads(base64.urlsafe_b64decode(cursor[len(MIRROR_CURSOR_PREFIX):].encode("ascii")))
+    except ValueError: # Bad base64 (binascii.Error), bad UTF-8 or bad JSON
+        return None
+    if (not isinstance(state, list) or len(state) != 4 or not isinstance(state[0], int) or state[0] < 0
+            or not isinstance(state[1], str)):
+        return None
+    return state
+
 @mcp_server.tool()
 async def find_instances(ctx: Context,
                      class_name: str = Field(default=None, description="ClassName to filter by (e.g., 'Part', 'Model')."),
                      name_contains: str = Field(default=None, description="Text the instance name should contain (case-insensitive)."),
-                     search_root: str = Field("Workspace", description="Name or path of the object to search under (e.g., 'Workspace', 'ReplicatedStorage.Models').")
-                     ) -> str:
-    """Finds instances within a specified root based on class name or name containing text via the Studio Plugin."""
-    # <<< CHANGE: Use plugin queue AND WAIT instead of Luau execution >>>
-    logger.info(f"Requesting find_instances via plugin under '{search_root}' (class: {class_name or 'Any'}, name contains: {name_contains or 'Any'})")
+                     search_root: str = Field("Workspace", description="Name or path of the object to search under (e.g., 'Workspace', 'ReplicatedStorage.Models')."),
+                     use_mirror: bool = Field(True, description="Answer from the server's scene mirror when it is fresh (set false to force a live plugin search)."),
+                     limit: int = Field(200, description=f"Maximum number of matches to return in this page (1-{FIND_INSTANCES_MAX_LIMIT})."),
+                     offset: int = Field(0, description="Number of matches to skip (ignored when 'cursor' is given)."),
+                     cursor: Optional[str] = Field(None, description="Continuation token from a previous page's 'cursor=...' hint; the other filters are taken from the original search."),
+                     properties: Optional[List[str]] = Field(None, description="Property names to read and return for every match (e.g. ['Position', 'Anchored'])."),
+                     reconnect_wait: Optional[float] = _reconnect_wait_field()) -> str:
+    """Finds instances within a specified root based on class name or name containing text via the Studio Plugin.
+       Results are paged: follow the returned cursor to get the next page.
+    """
+    limit = max(1, min(limit, FIND_INSTANCES_MAX_LIMIT))
+    offset = max(0, offset)
+    plugin_cursor = cursor
+    if cursor and cursor.startswith(MIRROR_CURSOR_PREFIX):
+        state = _decode_mirror_cursor(cursor)
+        if state is None:
+            return f"Tool: find_instances, Error: Invalid cursor '{cursor}'."
+        cursor_offset, cursor_root, cursor_class, cursor_name = state
+        # The cursor's search applies; filters given with it must be the same ones (search_root may be left at its default)
+        if ((class_name is not None and class_name != cursor_class) or (name_contains is not None and name_contains != cursor_name)
+                or search_root not in (cursor_root, "Workspace")):
+            return (f"Tool: find_instances, Error: Cursor belongs to a different search (search_root '{cursor_root}', "
+                    f"class_name {cursor_class!r}, name_contains {cursor_name!r}). Repeat those filters or start over without a cursor.")
+        offset, search_root, class_name, name_contains = cursor_offset, cursor_root, cursor_class, cursor_name
+        plugin_cursor = None
+
+    # The mirror only knows names/classes, so property projections go to the plugin
+    if use_mirror and not properties and not plugin_cursor:
+        mirrored = scene_mirror.find_instances(search_root, class_name=class_name, name_contains=name_contains)
+        if mirrored is not None:
+            logger.info(f"Answered find_instances({search_root}) from scene mirror (version {scene_mirror.version})")
+            page = mirrored[offset:offset + limit]
+            next_cursor = (_encode_mirror_cursor(offset + limit, search_root, class_name, name_contains)
+                           if offset + limit < len(mirrored) else None)
+            return _format_find_instances(search_root, page, offset, next_cursor) + f"\n(Scene mirror version {scene_mirror.version}, {len(mirrored)} total matches)"
 
-    # Basic validation (can add more for search_root if needed)
-    # ... (validation skipped for brevity, assume safe inputs for now)
+    # <<< CHANGE: Use plugin queue AND WAIT instead of Luau execution >>>
+    logger.info(f"Requesting find_instances via plugin under '{search_root}' (class: {class_name or 'Any'}, name contains: {name_contains or 'Any'}, limit: {limit}, offset: {offset}, cursor: {plugin_cursor})")
 
     command = {
         "action": "find_instances",
         "data": {
             "class_name": class_name,         # Pass None if not provided
             "name_contains": name_contains,   # Pass None if not provided
-            "search_root": search_root
+            "search_root": search_root,
+            "limit": limit,
+            "offset": offset,
+            "cursor": plugin_cursor,
+            "properties": properties,
+            "format": COLUMNAR_FORMAT
         }
         # request_id will be added by queue_command_and_wait
     }
 
     try:
         # Use the helper to queue and wait
-        result_data = await queue_command_and_wait(command, timeout=20.0) # Allow slightly longer timeout for search
+        result_data = await queue_command_and_wait(command, timeout=30.0, reconnect_wait=reconnect_wait) # The plugin scans across frames, allow more time
+        if isinstance(result_data, dict) and "instances" in result_data:
+            result_data["instances"] = expand_instance_listing(result_data["instances"])
 
-        logger.info(f"Received result for find_instances({search_root}, {class_name}, {name_contains}): {result_data}")
+        logger.info(f"Received result for find_instances({search_root}, {class_name}, {name_contains}): {len(result_data.get('instances', [])) if isinstance(result_data, dict) else result_data} match(es)")
 
         # --- Result Processing ---
         if isinstance(result_data, dict):
@@ -774,14 +1110,8 @@ async def find_instances(ctx: Context,
                 logger.error(f"Plugin reported error for find_instances: {error_msg}")
                 return f"Tool: find_instances, Error from plugin: {error_msg}"
             elif "instances" in result_data:
-                instances = result_data["instances"]
-                if not instances:
-                    return f"Tool: find_instances, Result: No instances found matching criteria under '{search_root}'."
-                else:
-                    # Expecting list of dicts like {name, className, path}
-                    output_str = f"Tool: find_instances, Result: Found {len(instances)} instance(s) under '{search_root}':\n"
-                    output_str += "\n".join([f"- {inst.get('name', '?')} ({inst.get('className', '?')}) at path: {inst.get('path', '?')}" for inst in instances])
-                    return output_str
+                page_offset = result_data.get("offset", offset) # Absolute position of this page, also for cursor pages
+                return _format_find_instances(search_root, result_data["instances"] or [], page_offset, result_data.get("next_cursor"))
             else:
                 logger.warning(f"Received unexpected dictionary format from plugin for find_instances: {result_data}")
                 return f"Tool: find_instances, Error: Received unexpected result format from plugin: {result_data}"
@@ -790,6 +1120,8 @@ async def find_instances(ctx: Context,
             return f"Tool: find_instances, Error: Received unexpected result type from plugin: {type(result_data).__name__}"
         # --- End Result Processing ---
 
+    except PluginUnavailableError as e:
+        return f"Tool: find_instances, Error: {e}"
     except TimeoutError as e:
         logger.error(f"Timeout waiting for find_instances result: {e}")
         return f"Tool: find_instances, Error: Timeout waiting for response from Studio plugin under '{search_root}'."
@@ -802,7 +1134,8 @@ async def find_instances(ctx: Context,
 async def create_instance(ctx: Context,
                       class_name: str = Field(..., description="The ClassName of the instance to create (e.g., 'Part', 'Model', 'Script')."),
                       properties: Dict[str, Any] = None,
-                      parent_name: str = Field("Workspace", description="Name or path of the parent object to create the instance under (defaults to Workspace).")) -> str:
+                      parent_name: str = Field("Workspace", description="Name or path of the parent object to create the instance under (defaults to Workspace)."),
+                      reconnect_wait: Optional[float] = _reconnect_wait_field()) -> str:
     """Creates a new instance in the Roblox Studio session."""
     logger.info(f"Creating instance: Class='{class_name}', Parent='{parent_name}', Props={properties}")
     
@@ -817,25 +1150,29 @@ async def create_instance(ctx: Context,
     }
     
     # Queue the command and wait for result
-    result = await queue_command_and_wait(command)
+    try:
+        result = await queue_command_and_wait(command, reconnect_wait=reconnect_wait)
+    except PluginUnavailableError as e:
+        return f"Error creating instance: {e}"
     
     # Process the result
     if "error" in result:
         return f"Error creating instance: {result['error']}"
     elif "success" in result and result["success"]:
         instance_name = result.get('name', (properties or {}).get('Name', class_name))  # Handle None case for properties
-        return f"Successfully created {class_name} named '{instance_name}' at {result.get('path', 'unknown path')}"
+        return f"Successfully created {class_name} named '{instance_name}' at {result.get('path', 'unknown path')}{_format_handle(result)}"
     else:
         return f"Unexpected result format from plugin while creating instance: {result}"
 
 @mcp_server.tool()
-async def delete_instance(ctx: Context, object_name: str = Field(..., description="Name or path of the object to delete (e.g., 'MyPart', 'Workspace.Model').")) -> str:
+async def delete_instance(ctx: Context, object_name: str = Field(..., description="Name or path of the object to delete (e.g., 'MyPart', 'Workspace.Model')."),
+                          reconnect_wait: Optional[float] = _reconnect_wait_field()) -> str:
     """Deletes an object from the scene by calling its :Destroy() method via the Studio Plugin."""
     # <<< CHANGE: Use plugin queue AND WAIT instead of Luau execution >>>
     logger.info(f"Requesting delete_instance via plugin for object '{object_name}'")
 
     # Basic validation
-    if not re.match(r"^[\w.]+$", object_name): # Allow dots in object name path
+    if not _is_valid_object_path(object_name): # Dotted paths or @session:id handles
         return f"Tool: delete_instance, Error: Invalid object name format: {object_name}"
 
     command = {
@@ -848,7 +1185,7 @@ async def delete_instance(ctx: Context, object_name: str = Field(..., descriptio
 
     try:
         # Use the helper to queue and wait
-        result_data = await queue_command_and_wait(command, timeout=10.0)
+        result_data = await queue_command_and_wait(command, timeout=10.0, reconnect_wait=reconnect_wait)
 
         logger.info(f"Received result for delete_instance({object_name}): {result_data}")
 
@@ -868,6 +1205,8 @@ async def delete_instance(ctx: Context, object_name: str = Field(..., descriptio
             return f"Tool: delete_instance, Error: Received unexpected result type from plugin: {type(result_data).__name__}"
         # --- End Result Processing ---
 
+    except PluginUnavailableError as e:
+        return f"Tool: delete_instance, Error: {e}"
     except TimeoutError as e:
         logger.error(f"Timeout waiting for delete_instance result: {e}")
         return f"Tool: delete_instance, Error: Timeout waiting for response from Studio plugin for '{object_name}'."
@@ -880,8 +1219,8 @@ async def delete_instance(ctx: Context, object_name: str = Field(..., descriptio
 async def set_property(ctx: Context,
                      object_name: str = Field(..., description="Name or path of the object."),
                      property_name: str = Field(..., description="Name of the property to set."),
-                     value: Any = Field(..., description='Property value - can be a primitive (string, number, boolean, null), a list/array, a dictionary/object, or a JSON string representation of these types.')
-                     ) -> str:
+                     value: Any = Field(..., description='Property value - can be a primitive (string, number, boolean, null), a list/array, a dictionary/object, or a JSON string representation of these types.'),
+                     reconnect_wait: Optional[float] = _reconnect_wait_field()) -> str:
     """Sets a specific property on an object.
        The 'value' parameter can be provided in multiple formats:
        - Primitive types (string, number, boolean, null) can be passed directly
@@ -922,7 +1261,7 @@ async def set_property(ctx: Context,
         }
         
         # Queue the command and wait for result
-        result = await queue_command_and_wait(command)
+        result = await queue_command_and_wait(command, reconnect_wait=reconnect_wait)
         
         # Process the result
         if "error" in result:
@@ -935,6 +1274,8 @@ async def set_property(ctx: Context,
         else:
             return f"Error: Unexpected result format from plugin while setting property."
 
+    except PluginUnavailableError as e:
+        return f"Error: {e}"
     except TimeoutError:
         return f"Error: Timeout waiting for Studio plugin to set property '{property_name}' on '{object_name}'."
     except ValueError as e: # Catch potential errors like invalid property name format
@@ -946,14 +1287,15 @@ async def set_property(ctx: Context,
 @mcp_server.tool()
 async def set_primary_part(ctx: Context,
                           model_path: str = Field(..., description="Path to the Model object."),
-                          part_path: str = Field(..., description="Path to the BasePart object to set as the PrimaryPart.")) -> str:
+                          part_path: str = Field(..., description="Path to the BasePart object to set as the PrimaryPart."),
+                          reconnect_wait: Optional[float] = _reconnect_wait_field()) -> str:
     """Sets the PrimaryPart property of a Model to the specified BasePart."""
     logger.info(f"Setting PrimaryPart of '{model_path}' to '{part_path}'")
 
     # Basic path validation (could be stricter)
-    if not re.match(r"^[\w.]+$", model_path):
+    if not _is_valid_object_path(model_path):
         return f"Error: Invalid model path format: {model_path}"
-    if not re.match(r"^[\w.]+$", part_path):
+    if not _is_valid_object_path(part_path):
         return f"Error: Invalid part path format: {part_path}"
 
     try:
@@ -967,7 +1309,7 @@ async def set_primary_part(ctx: Context,
         }
 
         # Queue the command and wait for result
-        result = await queue_command_and_wait(command)
+        result = await queue_command_and_wait(command, reconnect_wait=reconnect_wait)
 
         # Process the result
         if "error" in result:
@@ -977,6 +1319,8 @@ async def set_primary_part(ctx: Context,
         else:
             return f"Error: Unexpected result format from plugin while setting PrimaryPart."
 
+    except PluginUnavailableError as e:
+        return f"Error: {e}"
     except TimeoutError:
         return f"Error: Timeout waiting for Studio plugin to set PrimaryPart for '{model_path}'."
     except ValueError as e: # Catch other potential errors like invalid path format
@@ -987,8 +1331,8 @@ async def set_primary_part(ctx: Context,
 
 @mcp_server.tool()
 async def move_instance(ctx: Context, object_name: str = Field(..., description="Name or path of the object to move."),
-                  position: Union[str, Dict[str, float]] = Field(..., description='Position as a dictionary with x, y, z keys, or a JSON string for the position dictionary, e.g., `"{\"x\": 0, \"y\": 10, \"z\": 0}"`.')
-                  ) -> str:
+                  position: Union[str, Dict[str, float]] = Field(..., description='Position as a dictionary with x, y, z keys, or a JSON string for the position dictionary, e.g., `"{\"x\": 0, \"y\": 10, \"z\": 0}"`.'),
+                  reconnect_wait: Optional[float] = _reconnect_wait_field()) -> str:
     """Moves an object to a new position using either a dictionary or a JSON string for the position."""
     logger.info(f"Moving '{object_name}' with position input: {position}")
     
@@ -1017,7 +1361,7 @@ async def move_instance(ctx: Context, object_name: str = Field(..., description=
         }
         
         # Queue the command and wait for result
-        result = await queue_command_and_wait(command)
+        result = await queue_command_and_wait(command, reconnect_wait=reconnect_wait)
         
         # Process the result
         if "error" in result:
@@ -1027,6 +1371,8 @@ async def move_instance(ctx: Context, object_name: str = Field(..., description=
         else:
             return f"Error: Unexpected result format from plugin while moving instance."
 
+    except PluginUnavailableError as e:
+        return f"Error: {e}"
     except TimeoutError:
         return f"Error: Timeout waiting for Studio plugin to move '{object_name}'."
     except ValueError as e:
@@ -1038,7 +1384,8 @@ async def move_instance(ctx: Context, object_name: str = Field(..., description=
 @mcp_server.tool()
 async def clone_instance(ctx: Context, object_name: str = Field(..., description="Name or path of the object to clone."),
                      new_name: Optional[str] = Field(None, description="Optional new name for the cloned object."),
-                     parent_name: Optional[str] = Field(None, description="Optional name or path for the parent of the clone (defaults to original parent).")) -> str:
+                     parent_name: Optional[str] = Field(None, description="Optional name or path for the parent of the clone (defaults to original parent)."),
+                     reconnect_wait: Optional[float] = _reconnect_wait_field()) -> str:
     """Clones an existing object, optionally giving it a new name and parent."""
     logger.info(f"Cloning instance '{object_name}' (new name: {new_name}, parent: {parent_name})")
     
@@ -1054,7 +1401,7 @@ async def clone_instance(ctx: Context, object_name: str = Field(..., description
         }
         
         # Queue the command and wait for result
-        result = await queue_command_and_wait(command)
+        result = await queue_command_and_wait(command, reconnect_wait=reconnect_wait)
         
         # Process the result
         if "error" in result:
@@ -1065,12 +1412,16 @@ async def clone_instance(ctx: Context, object_name: str = Field(..., description
             parent_error = result.get("parent_error")
             
             msg = f"Successfully cloned '{object_name}' to '{clone_name}' at path '{clone_path}'."
+            if result.get("clone_handle"):
+                msg += f" Handle: {result['clone_handle']}"
             if parent_error:
                 msg += f" Warning: {parent_error}"
             return msg
         else:
             return f"Error: Unexpected result format from plugin while cloning instance."
 
+    except PluginUnavailableError as e:
+        return f"Error: {e}"
     except TimeoutError:
         return f"Error: Timeout waiting for Studio plugin to clone '{object_name}'."
     except ValueError as e:
@@ -1083,7 +1434,8 @@ async def clone_instance(ctx: Context, object_name: str = Field(..., description
 async def create_script(ctx: Context, script_name: str = Field(..., description="The name for the new Script instance."),
                   script_code: str = Field(..., description="The Luau code content for the script."),
                   script_type: str = Field("Script", description="Type of script: 'Script' or 'LocalScript'."),
-                  parent_name: str = Field("Workspace", description="Name or path of the parent object (defaults to Workspace).")) -> str:
+                  parent_name: str = Field("Workspace", description="Name or path of the parent object (defaults to Workspace)."),
+                  reconnect_wait: Optional[float] = _reconnect_wait_field()) -> str:
     """Creates a new Script or LocalScript instance with the provided code under the specified parent."""
     logger.info(f"Creating {script_type} named '{script_name}' under '{parent_name}'")
     
@@ -1103,7 +1455,7 @@ async def create_script(ctx: Context, script_name: str = Field(..., description=
         }
         
         # Queue the command and wait for result
-        result = await queue_command_and_wait(command)
+        result = await queue_command_and_wait(command, reconnect_wait=reconnect_wait)
         
         # Process the result
         if "error" in result:
@@ -1113,6 +1465,8 @@ async def create_script(ctx: Context, script_name: str = Field(..., description=
         else:
             return f"Error: Unexpected result format from plugin while creating script."
 
+    except PluginUnavailableError as e:
+        return f"Error: {e}"
     except TimeoutError:
         return f"Error: Timeout waiting for Studio plugin to create script."
     except ValueError as e:
@@ -1123,7 +1477,8 @@ async def create_script(ctx: Context, script_name: str = Field(..., description=
 
 @mcp_server.tool()
 async def edit_script(ctx: Context, script_path: str = Field(..., description="Name or path of the script to edit."),
-                   script_code: str = Field(..., description="The new Luau code content for the script.")) -> str:
+                   script_code: str = Field(..., description="The new Luau code content for the script."),
+                   reconnect_wait: Optional[float] = _reconnect_wait_field()) -> str:
     """Edits the source code of an existing Script or LocalScript instance."""
     logger.info(f"Editing script at '{script_path}'")
     
@@ -1138,7 +1493,7 @@ async def edit_script(ctx: Context, script_path: str = Field(..., description="N
         }
         
         # Queue the command and wait for result
-        result = await queue_command_and_wait(command)
+        result = await queue_command_and_wait(command, reconnect_wait=reconnect_wait)
         
         # Process the result
         if "error" in result:
@@ -1148,6 +1503,8 @@ async def edit_script(ctx: Context, script_path: str = Field(..., description="N
         else:
             return f"Error: Unexpected result format from plugin while editing script."
 
+    except PluginUnavailableError as e:
+        return f"Error: {e}"
     except TimeoutError:
         return f"Error: Timeout waiting for Studio plugin to edit script."
     except ValueError as e:
@@ -1157,7 +1514,8 @@ async def edit_script(ctx: Context, script_path: str = Field(..., description="N
         return f"Unexpected server error: {e}"
 
 @mcp_server.tool()
-async def delete_script(ctx: Context, script_path: str = Field(..., description="Name or path of the script to delete.")) -> str:
+async def delete_script(ctx: Context, script_path: str = Field(..., description="Name or path of the script to delete."),
+                        reconnect_wait: Optional[float] = _reconnect_wait_field()) -> str:
     """Deletes an existing Script or LocalScript instance."""
     logger.info(f"Deleting script at '{script_path}'")
     
@@ -1171,7 +1529,7 @@ async def delete_script(ctx: Context, script_path: str = Field(..., description=
         }
         
         # Queue the command and wait for result
-        result = await queue_command_and_wait(command)
+        result = await queue_command_and_wait(command, reconnect_wait=reconnect_wait)
         
         # Process the result
         if "error" in result:
@@ -1181,6 +1539,8 @@ async def delete_script(ctx: Context, script_path: str = Field(..., description=
         else:
             return f"Error: Unexpected result format from plugin while deleting script."
 
+    except PluginUnavailableError as e:
+        return f"Error: {e}"
     except TimeoutError:
         return f"Error: Timeout waiting for Studio plugin to delete script."
     except ValueError as e:
@@ -1218,29 +1578,68 @@ async def list_datastores_in_cloud(ctx: Context, prefix: Optional[str] = Field(N
     except Exception as e:
         logger.exception("Unexpected error in list_datastores tool.")
         return f"Unexpected server error: {e}"
-    finally:
-        if client:
-            await client.close_session()
+
+DATASTORE_KEY_LIST_MAX = 10000
+
+@mcp_server.tool()
+async def list_datastore_keys_in_cloud(ctx: Context, datastore_name: str = Field(..., description="The name of the datastore."),
+                                       scope: Optional[str] = Field("global", description="The scope (defaults to 'global')."),
+                                       prefix: Optional[str] = Field(None, description="Only list keys starting with this prefix."),
+                                       all_scopes: bool = Field(False, description="List keys from every scope (keys are shown as scope/key)."),
+                                       limit: int = Field(1000, description=f"Maximum number of keys to return (1-{DATASTORE_KEY_LIST_MAX}).")) -> str:
+    """Lists entry keys in a standard datastore via the Roblox Cloud API, following pages until the limit."""
+    limit = max(1, min(limit, DATASTORE_KEY_LIST_MAX))
+    logger.info(f"Listing keys via Cloud API in '{datastore_name}' (scope: {scope}, prefix: {prefix}, limit: {limit})")
+    client = await _get_roblox_client()
+    if not client:
+        return "Error: Roblox Client could not be initialized."
+
+    keys = []
+    try:
+        async with contextlib.aclosing(client.iter_datastore_entries(datastore_name, scope=scope, prefix=prefix,
+                                                                     page_size=min(limit, 100), all_scopes=all_scopes)) as entries:
+            async for entry in entries:
+                keys.append(f"{entry.get('scope')}/{entry.get('key')}" if all_scopes else entry.get("key"))
+                if len(keys) > limit: # One past the limit tells us there are more
+                    break
+    except RobloxApiError as e:
+        logger.error(f"API Error listing datastore keys: {e}")
+        return f"Error listing keys in datastore '{datastore_name}': {e}"
+    except Exception as e:
+        logger.exception("Unexpected error in list_datastore_keys tool.")
+        return f"Unexpected server error: {e}"
+
+    if not keys:
+        return f"No keys found in datastore '{datastore_name}'." + (f" (Prefix: {prefix})" if prefix else "")
+    truncated = len(keys) > limit
+    keys = keys[:limit]
+    output = f"{len(keys)} keys in datastore '{datastore_name}':\n" + "\n".join(f"- {key}" for key in keys)
+    if truncated:
+        output += f"\n\n(Stopped at the limit of {limit}; use export_datastore_to_jsonl for the full datastore.)"
+    return output
 
 @mcp_server.tool()
 async def get_datastore_value_in_cloud(ctx: Context, datastore_name: str = Field(..., description="The name of the datastore."),
                         entry_key: str = Field(..., description="The key of the entry to retrieve."),
-                        scope: Optional[str] = Field("global", description="The scope of the datastore (defaults to 'global').")) -> str:
-    """Gets the value of an entry from a standard datastore via the Roblox Cloud API."""
+                        scope: Optional[str] = Field("global", description="The scope of the datastore (defaults to 'global')."),
+                        use_cache: bool = Field(True, description="Serve recently read values from the server's cache (set false to always read from Open Cloud).")) -> str:
+    """Gets the value of an entry from a standard datastore via the Roblox Cloud API.
+       Recently read or written entries are served from a short-lived cache unless use_cache is false.
+    """
     logger.info(f"Getting datastore value via Cloud API for key '{entry_key}' from '{datastore_name}' (scope: {scope})")
     client = await _get_roblox_client()
     if not client:
         return "Error: Roblox Client could not be initialized."
 
     try:
-        value = await client.get_datastore_entry(datastore_name=datastore_name, entry_key=entry_key, scope=scope)
+        value = await client.get_datastore_entry(datastore_name=datastore_name, entry_key=entry_key, scope=scope, use_cache=use_cache)
 
         if value is None:
             return f"No entry found for key '{entry_key}' in datastore '{datastore_name}' (scope: {scope})."
 
         # Format the value nicely
         if isinstance(value, (dict, list)):
-            return f"Value for key '{entry_key}':\n{json.dumps(value, indent=2)}"
+            return f"Value for key '{entry_key}':\n{json_codec.dumps_text(value, indent=True)}"
         else:
             return f"Value for key '{entry_key}': {value}"
 
@@ -1250,9 +1649,6 @@ async def get_datastore_value_in_cloud(ctx: Context, datastore_name: str = Field
     except Exception as e:
         logger.exception("Unexpected error in get_datastore_value tool.")
         return f"Unexpected server error: {e}"
-    finally:
-        if client:
-            await client.close_session()
 
 @mcp_server.tool()
 async def set_datastore_value_in_cloud(ctx: Context, datastore_name: str = Field(..., description="The name of the datastore."),
@@ -1289,9 +1685,6 @@ async def set_datastore_value_in_cloud(ctx: Context, datastore_name: str = Field
     except Exception as e:
         logger.exception("Unexpected error in set_datastore_value tool.")
         return f"Unexpected server error: {e}"
-    finally:
-        if client:
-            await client.close_session()
 
 @mcp_server.tool()
 async def delete_datastore_value_in_cloud(ctx: Context, datastore_name: str = Field(..., description="The name of the datastore."),
@@ -1316,16 +1709,291 @@ async def delete_datastore_value_in_cloud(ctx: Context, datastore_name: str = Fi
     except Exception as e:
         logger.exception("Unexpected error in delete_datastore_value tool.")
         return f"Unexpected server error: {e}"
-    finally:
-        if client:
-            await client.close_session()
+
+# --- Bulk DataStore tools ---
+BULK_DATASTORE_MAX_KEYS = 5000
+BULK_DATASTORE_MAX_CONCURRENCY = 32
+BULK_DATASTORE_PROGRESS_EVERY = 50 # Report progress to the MCP client every N keys
+
+def _clamp_datastore_concurrency(concurrency: int) -> int:
+    return max(1, min(concurrency, BULK_DATASTORE_MAX_CONCURRENCY))
+
+async def _report_bulk_progress(ctx: Context, done: int, total: int) -> None:
+    """Best-effort progress notification; clients without a progress token just ignore it."""
+    if done != total and done % BULK_DATASTORE_PROGRESS_EVERY:
+        return
+    try:
+        await ctx.report_progress(done, total)
+    except Exception as e:
+        logger.debug(f"Could not report progress ({done}/{total}): {e}")
+
+def _parse_datastore_value(value: Any) -> Any:
+    # Same rule as set_datastore_value_in_cloud: strings holding JSON are stored decoded
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            pass
+    return value
+
+@mcp_server.tool()
+async def get_datastore_values_bulk(ctx: Context, datastore_name: str = Field(..., description="The name of the datastore."),
+                                    entry_keys: List[str] = Field(..., description=f"Keys to read (at most {BULK_DATASTORE_MAX_KEYS})."),
+                                    scope: Optional[str] = Field("global", description="The scope (defaults to 'global')."),
+                                    concurrency: int = Field(8, description=f"Requests in flight at once (1-{BULK_DATASTORE_MAX_CONCURRENCY})."),
+                                    use_cache: bool = Field(True, description="Serve recently read values from the server's cache.")) -> str:
+    """Reads many entries from a standard datastore concurrently via the Roblox Cloud API.
+       Returns one line per key, in the order given: the value as compact JSON, '(not found)', or the error for that key.
+    """
+    if not entry_keys or len(entry_keys) > BULK_DATASTORE_MAX_KEYS:
+        return f"Tool: get_datastore_values_bulk, Error: Between 1 and {BULK_DATASTORE_MAX_KEYS} keys are required."
+    concurrency = _clamp_datastore_concurrency(concurrency)
+    logger.info(f"Bulk reading {len(entry_keys)} keys from '{datastore_name}' (scope: {scope}, concurrency: {concurrency})")
+    client = await _get_roblox_client()
+    if not client:
+        return "Error: Roblox Client could not be initialized."
+
+    lines = []
+    found = missing = failed = 0
+    try:
+        async for index, entry_key, value, error in client.get_datastore_entries(datastore_name, entry_keys, scope=scope,
+                                                                                 concurrency=concurrency, use_cache=use_cache):
+            if error is not None:
+                failed += 1
+                lines.append(f"{entry_key}: Error: {error}")
+            elif value is None:
+                missing += 1
+                lines.append(f"{entry_key}: (not found)")
+            else:
+                found += 1
+                lines.append(f"{entry_key}: {json_codec.dumps_text(value)}")
+            await _report_bulk_progress(ctx, index + 1, len(entry_keys))
+    except Exception as e:
+        logger.exception("Unexpected error in get_datastore_values_bulk tool.")
+        return f"Unexpected server error: {e}"
+
+    summary = f"Read {len(entry_keys)} keys from '{datastore_name}' (scope: {scope}): {found} found, {missing} not found, {failed} failed."
+    return summary + "\n" + "\n".join(lines)
+
+@mcp_server.tool()
+async def set_datastore_values_bulk(ctx: Context, datastore_name: str = Field(..., description="The name of the datastore."),
+                                    entries: Dict[str, Any] = Field(..., description=f"Map of entry key to JSON-serializable value (at most {BULK_DATASTORE_MAX_KEYS}). String values holding JSON are stored decoded, as in set_datastore_value_in_cloud."),
+                                    scope: Optional[str] = Field("global", description="The scope (defaults to 'global')."),
+                                    concurrency: int = Field(8, description=f"Requests in flight at once (1-{BULK_DATASTORE_MAX_CONCURRENCY}).")) -> str:
+    """Writes many entries to a standard datastore concurrently via the Roblox Cloud API.
+       Returns one line per key, in the order given, with the new version or the error for that key.
+    """
+    if not entries or len(entries) > BULK_DATASTORE_MAX_KEYS:
+        return f"Tool: set_datastore_values_bulk, Error: Between 1 and {BULK_DATASTORE_MAX_KEYS} entries are required."
+    concurrency = _clamp_datastore_concurrency(concurrency)
+    logger.info(f"Bulk writing {len(entries)} keys to '{datastore_name}' (scope: {scope}, concurrency: {concurrency})")
+    client = await _get_roblox_client()
+    if not client:
+        return "Error: Roblox Client could not be initialized."
+
+    pairs = [(entry_key, _parse_datastore_value(value)) for entry_key, value in entries.items()]
+    lines = []
+    written = failed = 0
+    try:
+        async for index, (entry_key, _), result, error in client.set_datastore_entries(datastore_name, pairs, scope=scope,
+                                                                                       concurrency=concurrency):
+            if error is not None:
+                failed += 1
+                lines.append(f"{entry_key}: Error: {error}")
+            else:
+                written += 1
+                lines.append(f"{entry_key}: version {(result or {}).get('version')}")
+            await _report_bulk_progress(ctx, index + 1, len(pairs))
+    except Exception as e:
+        logger.exception("Unexpected error in set_datastore_values_bulk tool.")
+        return f"Unexpected server error: {e}"
+
+    summary = f"Wrote {written} of {len(pairs)} keys to '{datastore_name}' (scope: {scope}); {failed} failed."
+    return summary + "\n" + "\n".join(lines)
+
+@mcp_server.tool()
+async def delete_datastore_values_bulk(ctx: Context, datastore_name: str = Field(..., description="The name of the datastore."),
+                                       entry_keys: List[str] = Field(..., description=f"Keys to delete (at most {BULK_DATASTORE_MAX_KEYS})."),
+                                       scope: Optional[str] = Field("global", description="The scope (defaults to 'global')."),
+                                       concurrency: int = Field(8, description=f"Requests in flight at once (1-{BULK_DATASTORE_MAX_CONCURRENCY}).")) -> str:
+    """Deletes many entries from a standard datastore concurrently via the Roblox Cloud API.
+       Returns one line per key, in the order given. Deleting a key that does not exist counts as success.
+    """
+    if not entry_keys or len(entry_keys) > BULK_DATASTORE_MAX_KEYS:
+        return f"Tool: delete_datastore_values_bulk, Error: Between 1 and {BULK_DATASTORE_MAX_KEYS} keys are required."
+    concurrency = _clamp_datastore_concurrency(concurrency)
+    logger.info(f"Bulk deleting {len(entry_keys)} keys from '{datastore_name}' (scope: {scope}, concurrency: {concurrency})")
+    client = await _get_roblox_client()
+    if not client:
+        return "Error: Roblox Client could not be initialized."
+
+    lines = []
+    deleted = failed = 0
+    try:
+        async for index, entry_key, _, error in client.delete_datastore_entries(datastore_name, entry_keys, scope=scope,
+                                                                                concurrency=concurrency):
+            if error is None:
+                deleted += 1
+                lines.append(f"{entry_key}: deleted")
+            else:
+                failed += 1
+                lines.append(f"{entry_key}: Error: {error}")
+            await _report_bulk_progress(ctx, index + 1, len(entry_keys))
+    except Exception as e:
+        logger.exception("Unexpected error in delete_datastore_values_bulk tool.")
+        return f"Unexpected server error: {e}"
+
+    summary = f"Deleted {deleted} of {len(entry_keys)} keys from '{datastore_name}' (scope: {scope}); {failed} failed."
+    return summary + "\n" + "\n".join(lines)
+
+@mcp_server.tool()
+async def export_datastore_to_jsonl(ctx: Context, datastore_name: str = Field(..., description="The name of the datastore."),
+                                    output_path: str = Field(..., description="Local path of the JSONL file to write (one {\"scope\", \"key\", \"value\"} object per line)."),
+                                    scope: Optional[str] = Field("global", description="The scope (defaults to 'global')."),
+                                    prefix: Optional[str] = Field(None, description="Only export keys starting with this prefix."),
+                                    all_scopes: bool = Field(False, description="Export entries from every scope."),
+                                    concurrency: int = Field(8, description=f"Value requests in flight at once (1-{BULK_DATASTORE_MAX_CONCURRENCY})."),
+                                    resume: bool = Field(True, description="Continue an interrupted export of the same datastore to the same file from its checkpoint.")) -> str:
+    """Exports every entry (key and value) of a standard datastore to a local JSONL file via the Roblox Cloud API.
+       Progress is checkpointed to '<output_path>.checkpoint.json' after each page of keys, so an interrupted export
+       resumes where it stopped when run again with resume=true.
+    """
+    concurrency = _clamp_datastore_concurrency(concurrency)
+    logger.info(f"Exporting datastore '{datastore_name}' (scope: {scope}, prefix: {prefix}) to {output_path}")
+    client = await _get_roblox_client()
+    if not client:
+        return "Error: Roblox Client could not be initialized."
+
+    async def progress(entries: int) -> None:
+        try:
+            await ctx.report_progress(entries, None)
+        except Exception as e:
+            logger.debug(f"Could not report export progress: {e}")
+
+    try:
+        result = await export_datastore_jsonl(client, datastore_name, output_path, scope=scope, prefix=prefix,
+                                              all_scopes=all_scopes, concurrency=concurrency, resume=resume, progress=progress)
+    except ExportCheckpointError as e:
+        return f"Tool: export_datastore_to_jsonl, Error: {e}"
+    except RobloxApiError as e:
+        logger.error(f"API Error exporting datastore: {e}")
+        return f"Error exporting datastore '{datastore_name}': {e}"
+    except OSError as e:
+        return f"Tool: export_datastore_to_jsonl, Error: Could not write {output_path}: {e}"
+    except Exception as e:
+        logger.exception("Unexpected error in export_datastore_to_jsonl tool.")
+        return f"Unexpected server error: {e}"
+
+    summary = (f"Exported {result['entries']} entries from '{datastore_name}' to {result['output_path']} "
+               f"({result['bytes']} bytes, {result['pages']} pages")
+    if result["skipped"]:
+        summary += f", {result['skipped']} keys deleted during the export were skipped"
+    summary += ")."
+    if result["resumed"]:
+        summary += " Resumed from a checkpoint."
+    return summary
+# --- End Bulk DataStore tools ---
+
+# --- DataStore backup/restore ---
+@mcp_server.tool()
+async def backup_datastores(ctx: Context, datastore_names: List[str] = Field(..., description="Names of the standard datastores to back up."),
+                            backup_dir: str = Field(..., description="Local directory for the archive (manifest.json plus gzip-compressed JSONL chunks). Rerunning into the same directory resumes an interrupted backup."),
+                            scope: Optional[str] = Field("global", description="The scope (defaults to 'global')."),
+                            all_scopes: bool = Field(False, description="Back up entries from every scope."),
+                            as_of: Optional[str] = Field(None, description="ISO 8601 time to snapshot entries as of, using their version history (Open Cloud keeps versions for 30 days). Omit for current values."),
+                            concurrency: int = Field(8, description=f"Value requests in flight at once (1-{BULK_DATASTORE_MAX_CONCURRENCY}).")) -> str:
+    """Snapshots standard datastores into a local, chunked, compressed backup archive via the Roblox Cloud API.
+       Every entry is saved with its version, attributes and user IDs. The manifest is checkpointed after each chunk.
+    """
+    if not datastore_names:
+        return "Tool: backup_datastores, Error: At least one datastore name is required."
+    concurrency = _clamp_datastore_concurrency(concurrency)
+    logger.info(f"Backing up datastores {datastore_names} to {backup_dir} (scope: {scope}, as_of: {as_of})")
+    client = await _get_roblox_client()
+    if not client:
+        return "Error: Roblox Client could not be initialized."
+
+    async def progress(entries: int, total: Optional[int]) -> None:
+        try:
+            await ctx.report_progress(entries, total)
+        except Exception as e:
+            logger.debug(f"Could not report backup progress: {e}")
+
+    try:
+        result = await backup_datastores_to_archive(client, backup_dir, datastore_names, scope=scope, all_scopes=all_scopes,
+                                                    as_of=as_of, concurrency=concurrency, progress=progress)
+    except BackupError as e:
+        return f"Tool: backup_datastores, Error: {e}"
+    except RobloxApiError as e:
+        logger.error(f"API Error backing up datastores: {e}")
+        return f"Error backing up datastores: {e}"
+    except OSError as e:
+        return f"Tool: backup_datastores, Error: Could not write to {backup_dir}: {e}"
+    except Exception as e:
+        logger.exception("Unexpected error in backup_datastores tool.")
+        return f"Unexpected server error: {e}"
+
+    per_store = ", ".join(f"{name}: {count}" for name, count in result["datastores"].items())
+    summary = (f"Backed up {result['entries']} entries ({per_store}) to {result['backup_dir']} "
+               f"in {result['chunks']} chunks ({result['bytes']} bytes compressed).")
+    if result["skipped"]:
+        summary += f" {result['skipped']} listed keys had no value{' at ' + as_of if as_of else ''} and were skipped."
+    if result["resumed"]:
+        summary += " Resumed from the archive's manifest."
+    return summary
+
+@mcp_server.tool()
+async def restore_datastores_from_backup(ctx: Context, backup_dir: str = Field(..., description="Directory of an archive written by backup_datastores."),
+                                         datastore_names: Optional[List[str]] = Field(None, description="Restore only these datastores from the archive (default: all)."),
+                                         mode: str = Field("match_version", description="'match_version' (skip unchanged entries, never clobber a concurrent write), 'create_only' (only restore keys that no longer exist) or 'overwrite'."),
+                                         concurrency: int = Field(8, description=f"Writes in flight at once (1-{BULK_DATASTORE_MAX_CONCURRENCY}).")) -> str:
+    """Restores standard datastores from a backup archive via the Roblox Cloud API.
+       Finished chunks are checkpointed, so rerunning an interrupted restore continues where it stopped.
+    """
+    if mode not in RESTORE_MODES:
+        return f"Tool: restore_datastores_from_backup, Error: 'mode' must be one of: {', '.join(RESTORE_MODES)}."
+    concurrency = _clamp_datastore_concurrency(concurrency)
+    logger.info(f"Restoring datastores from {backup_dir} (mode: {mode}, only: {datastore_names})")
+    client = await _get_roblox_client()
+    if not client:
+        return "Error: Roblox Client could not be initialized."
+
+    async def progress(entries: int, total: Optional[int]) -> None:
+        try:
+            await ctx.report_progress(entries, total)
+        except Exception as e:
+            logger.debug(f"Could not report restore progress: {e}")
+
+    try:
+        result = await restore_datastores(client, backup_dir, datastore_names=datastore_names, mode=mode,
+                                          concurrency=concurrency, progress=progress)
+    except BackupError as e:
+        return f"Tool: restore_datastores_from_backup, Error: {e}"
+    except OSError as e:
+        return f"Tool: restore_datastores_from_backup, Error: Could not read {backup_dir}: {e}"
+    except Exception as e:
+        logger.exception("Unexpected error in restore_datastores_from_backup tool.")
+        return f"Unexpected server error: {e}"
+
+    summary = (f"Restored from {result['backup_dir']} ({mode}): {result['written']} written, {result['unchanged']} unchanged, "
+               f"{result['conflicts']} conflicts, {result['failed']} failed, of {result['entries']} entries.")
+    if result["resumed"]:
+        summary += " Resumed from a checkpoint."
+    if result["failed"]:
+        summary += " Run the restore again to retry the failed entries.\n" + "\n".join(result["errors"])
+    return summary
+# --- End DataStore backup/restore ---
 
 @mcp_server.tool()
 async def upload_asset_via_cloud(ctx: Context, file_path: str = Field(..., description="Local path to the asset file (e.g., .fbx, .png, .mp3)."),
                    asset_type: str = Field(..., description="Type of asset (e.g., 'Model', 'Image', 'Audio'). Check Roblox docs for valid types."),
                    display_name: str = Field(..., description="Name for the asset in Roblox."),
-                   description: Optional[str] = Field("", description="Optional description for the asset.")) -> str:
-    """Uploads a file from the local system as a new Roblox asset via the Cloud API."""
+                   description: Optional[str] = Field("", description="Optional description for the asset."),
+                   force: bool = Field(False, description="Upload even if identical file content was already uploaded as this asset type."),
+                   verify_cached: bool = Field(False, description="Before reusing a previously uploaded asset, check with the Cloud API that it still exists and wasn't rejected.")) -> str:
+    """Uploads a file from the local system as a new Roblox asset via the Cloud API.
+       Re-uploading identical bytes as the same asset type returns the asset ID recorded for the earlier upload, unless force is true.
+    """
     logger.info(f"Uploading asset '{display_name}' ({asset_type}) via Cloud API from '{file_path}'")
     client = await _get_roblox_client()
     if not client:
@@ -1336,8 +2004,13 @@ async def upload_asset_via_cloud(ctx: Context, file_path: str = Field(..., descr
          return f"Error: Invalid asset type format: '{asset_type}'"
 
     try:
-        result = await client.upload_asset(file_path=file_path, asset_type=asset_type, display_name=display_name, description=description)
+        result = await client.upload_asset(file_path=file_path, asset_type=asset_type, display_name=display_name, description=description,
+                                           force=force, verify_cached=verify_cached)
         asset_id = result.get("assetId")
+        if asset_id and result.get("cached"):
+            entry = result.get("cacheEntry") or {}
+            return (f"Identical file content was already uploaded as {asset_type} asset {asset_id} "
+                    f"('{entry.get('display_name')}', {entry.get('uploaded_at')}); returning it without uploading. Pass force=true to upload again.")
         if asset_id:
             return f"Successfully uploaded asset '{display_name}'. New Asset ID: {asset_id}"
         else:
@@ -1355,9 +2028,6 @@ async def upload_asset_via_cloud(ctx: Context, file_path: str = Field(..., descr
     except Exception as e:
         logger.exception("Unexpected error in upload_asset tool.")
         return f"Unexpected server error: {e}"
-    finally:
-        if client:
-            await client.close_session()
 
 @mcp_server.tool()
 async def get_asset_details_via_cloud(ctx: Context, asset_id: int = Field(..., description="The ID of the asset to retrieve details for.")) -> str:
@@ -1369,18 +2039,36 @@ async def get_asset_details_via_cloud(ctx: Context, asset_id: int = Field(..., d
 
     try:
         details = await client.get_asset_details(asset_id=asset_id)
-        return f"Asset Details for {asset_id}:\n{json.dumps(details, indent=2)}"
-    except NotImplementedError:
-        return "Error: Get asset details feature is not yet implemented."
+        return f"Asset Details for {asset_id}:\n{json_codec.dumps_text(details, indent=True)}"
     except RobloxApiError as e:
         logger.error(f"API Error getting asset details: {e}")
         return f"Error getting details for asset {asset_id}: {e}"
     except Exception as e:
         logger.exception(f"Unexpected error in get_asset_details tool.")
         return f"Unexpected server error: {e}"
-    finally:
-        if client:
-            await client.close_session()
+
+@mcp_server.tool()
+async def verify_asset_upload_cache(ctx: Context, remove_stale: bool = Field(True, description="Drop entries whose asset no longer exists or was rejected by moderation.")) -> str:
+    """Checks every recorded upload in the local asset upload index against the Cloud API (get_asset_details)."""
+    logger.info(f"Verifying asset upload index (remove_stale: {remove_stale})")
+    client = await _get_roblox_client()
+    if not client:
+        return "Error: Roblox Client could not be initialized."
+    if not client.asset_index.enabled:
+        return "Tool: verify_asset_upload_cache, Error: The asset upload index is disabled (ROBLOX_ASSET_CACHE_PATH is empty)."
+
+    try:
+        report = await client.verify_asset_index(remove_stale=remove_stale)
+    except Exception as e:
+        logger.exception("Unexpected error in verify_asset_upload_cache tool.")
+        return f"Unexpected server error: {e}"
+
+    lines = [f"Checked {report['checked']} cached uploads: {report['valid']} valid, {len(report['stale'])} stale, {len(report['errors'])} could not be checked."]
+    for stale in report["stale"]:
+        lines.append(f"- stale: asset {stale['asset_id']} ({stale['file_name']}): {stale['reason']}" + (" (removed)" if remove_stale else ""))
+    for error in report["errors"]:
+        lines.append(f"- error: asset {error['asset_id']}: {error['error']}")
+    return "\n".join(lines)
 
 @mcp_server.tool()
 async def list_user_assets_via_cloud(ctx: Context, asset_types: Optional[List[str]] = Field(None, description="Optional list of asset types to filter by (e.g., ['Model', 'Image'])."),
@@ -1416,9 +2104,6 @@ async def list_user_assets_via_cloud(ctx: Context, asset_types: Optional[List[st
     except Exception as e:
         logger.exception("Unexpected error in list_user_assets tool.")
         return f"Unexpected server error: {e}"
-    finally:
-        if client:
-            await client.close_session()
 
 @mcp_server.tool()
 async def publish_place_via_cloud(ctx: Context, target_place_id: Optional[int] = Field(None, description="Optional Place ID to publish. Defaults to configured Place ID."),
@@ -1446,13 +2131,11 @@ async def publish_place_via_cloud(ctx: Context, target_place_id: Optional[int] =
     except Exception as e:
         logger.exception("Unexpected error in publish_place tool.")
         return f"Unexpected server error: {e}"
-    finally:
-        if client:
-            await client.close_session()
 
 @mcp_server.tool()
 async def set_environment(ctx: Context,
-                      properties: Union[Dict[str, Any], str] = Field(..., description="Dictionary of properties to set on the Lighting service or Terrain, or a JSON string of the properties dictionary.")) -> str:
+                      properties: Union[Dict[str, Any], str] = Field(..., description="Dictionary of properties to set on the Lighting service or Terrain, or a JSON string of the properties dictionary."),
+                      reconnect_wait: Optional[float] = _reconnect_wait_field()) -> str:
     """Sets properties on environment services like Lighting or Terrain."""
     logger.info(f"Setting environment properties: {properties}")
     
@@ -1491,7 +2174,7 @@ async def set_environment(ctx: Context,
         }
         
         # Queue the command and wait for result
-        result = await queue_command_and_wait(command)
+        result = await queue_command_and_wait(command, reconnect_wait=reconnect_wait)
         
         # Process the result
         if "error" in result:
@@ -1505,6 +2188,8 @@ async def set_environment(ctx: Context,
         else:
             return f"Error: Unexpected result format from plugin while setting environment properties."
 
+    except PluginUnavailableError as e:
+        return f"Error: {e}"
     except TimeoutError:
         return f"Error: Timeout waiting for Studio plugin to set environment properties."
     except ValueError as e:
@@ -1518,7 +2203,8 @@ async def spawn_npc(ctx: Context, model_asset_id: Optional[int] = Field(None, de
                 template_model_name: Optional[str] = Field(None, description="Name of an existing model in the place (e.g., in ServerStorage) to clone as the NPC."),
                 position: Optional[Union[List[float], Dict[str, float], str]] = Field([0,5,0], description="Position as [X, Y, Z] list, {x, y, z} dictionary, or a JSON string of either format."),
                 parent_name: str = Field("Workspace", description="Parent object for the spawned NPC (defaults to Workspace)."),
-                new_name: Optional[str] = Field(None, description="Optional name for the spawned NPC instance.")) -> str:
+                new_name: Optional[str] = Field(None, description="Optional name for the spawned NPC instance."),
+                reconnect_wait: Optional[float] = _reconnect_wait_field()) -> str:
     """Spawns an NPC in the workspace, either by inserting a model from asset ID or cloning an existing template model."""
     logger.info(f"Spawning NPC (AssetID: {model_asset_id}, Template: {template_model_name}, Name: {new_name})")
     
@@ -1574,7 +2260,7 @@ async def spawn_npc(ctx: Context, model_asset_id: Optional[int] = Field(None, de
         }
         
         # Queue the command and wait for result
-        result = await queue_command_and_wait(command)
+        result = await queue_command_and_wait(command, reconnect_wait=reconnect_wait)
         
         # Process the result
         if "error" in result:
@@ -1589,6 +2275,8 @@ async def spawn_npc(ctx: Context, model_asset_id: Optional[int] = Field(None, de
         else:
             return f"Error: Unexpected result format from plugin while spawning NPC."
 
+    except PluginUnavailableError as e:
+        return f"Error: {e}"
     except TimeoutError:
         return f"Error: Timeout waiting for Studio plugin to spawn NPC."
     except ValueError as e:
@@ -1599,7 +2287,8 @@ async def spawn_npc(ctx: Context, model_asset_id: Optional[int] = Field(None, de
 
 @mcp_server.tool()
 async def play_animation(ctx: Context, target_name: str = Field(..., description="Name or path of the object with Humanoid or AnimationController (e.g., player character, NPC)."),
-                     animation_id: int = Field(..., description="Asset ID of the Animation to play.")) -> str:
+                     animation_id: int = Field(..., description="Asset ID of the Animation to play."),
+                     reconnect_wait: Optional[float] = _reconnect_wait_field()) -> str:
     """Loads and plays an animation on a target object's Humanoid or AnimationController."""
     logger.info(f"Playing animation {animation_id} on target '{target_name}'")
     
@@ -1614,7 +2303,7 @@ async def play_animation(ctx: Context, target_name: str = Field(..., description
         }
         
         # Queue the command and wait for result
-        result = await queue_command_and_wait(command)
+        result = await queue_command_and_wait(command, reconnect_wait=reconnect_wait)
         
         # Process the result
         if "error" in result:
@@ -1624,6 +2313,8 @@ async def play_animation(ctx: Context, target_name: str = Field(..., description
         else:
             return f"Error: Unexpected result format from plugin while playing animation."
 
+    except PluginUnavailableError as e:
+        return f"Error: {e}"
     except TimeoutError:
         return f"Error: Timeout waiting for Studio plugin to play animation on '{target_name}'."
     except ValueError as e:
@@ -1704,9 +2395,6 @@ async def send_chat_via_cloud(ctx: Context, message: str = Field(..., descriptio
     except Exception as e:
         logger.exception("Unexpected error in send_chat tool.")
         return f"Unexpected server error: {e}"
-    finally:
-        if client:
-            await client.close_session()
 
 @mcp_server.tool()
 async def teleport_player_via_cloud(ctx: Context, player_name: str = Field(..., description="The exact name of the Player to teleport."),
@@ -1786,80 +2474,125 @@ async def teleport_player_via_cloud(ctx: Context, player_name: str = Field(...,
     except Exception as e:
         logger.exception("Unexpected error in teleport_player tool.")
         return f"Unexpected server error: {e}"
-    finally:
-        if client:
-            await client.close_session()
 
 @mcp_server.tool()
-async def get_studio_logs(ctx: Context) -> List[Dict[str, Any]]: # REMOVED random_string parameter AGAIN
-    """Retrieves the most recent logs captured from the Roblox Studio Output window."""
-    # The random_string parameter caused issues, removed it again. Tool schema might be inconsistent.
-    global studio_log_buffer
-    
-    safe_limit = 200 # Default to max buffer size now
-    
-    current_logs = list(studio_log_buffer) # Get a snapshot
-    log_slice = current_logs[-safe_limit:]
-    
-    formatted_logs = [log_data for server_ts, log_data in log_slice]
-    
-    logger.info(f"Returning last {len(formatted_logs)} studio logs (limit: {safe_limit}).") 
-    return formatted_logs
+async def get_studio_logs(
+    ctx: Context,
+    since_seq: int = Field(0, description="Only return logs newer than this sequence number. Pass the previous call's 'next_since_seq' to read just the new lines. 0 returns the most recent lines."),
+    log_type: Optional[List[str]] = Field(None, description="Optional log levels to include, e.g. ['Error', 'Warning'] (also accepts 'Output', 'Info' or full 'Enum.MessageType.MessageError' names)."),
+    contains: Optional[str] = Field(None, description="Optional case-insensitive substring the message must contain."),
+    pattern: Optional[str] = Field(None, description="Optional regular expression the message must match."),
+    limit: int = Field(100, description="Maximum number of log entries to return (1-1000)."),
+    tail: Optional[bool] = Field(None, description="Return only the newest 'limit' matching lines. Defaults to true when since_seq is 0; pass false with since_seq 0 to read the whole buffer from the oldest line.")
+) -> Dict[str, Any]:
+    """Retrieves logs captured from the Roblox Studio Output window, oldest first.
+
+    Without a cursor (since_seq 0) this is the most recent 'limit' matching lines. Each entry has a
+    'seq' number. The response's 'next_since_seq' is the cursor for the next call, 'has_more' is true
+    when 'limit' cut the page short, and 'dropped' counts lines that were overwritten before they
+    could be read.
+    """
+    safe_limit = max(1, min(limit, 1000))
+    try:
+        page = studio_log_store.query(since_seq=since_seq, log_types=log_type, contains=contains,
+                                      pattern=pattern, limit=safe_limit, tail=tail)
+    except re.error as e:
+        return {"error": f"Invalid regular expression '{pattern}': {e}"}
+
+    logger.info(f"Returning {len(page['logs'])} studio logs (since_seq: {since_seq}, next_since_seq: {page['next_since_seq']}).")
+    return page
 
 # --- Helper Function to Queue Command and Prepare for Result ---
-async def queue_command_and_wait(command: Dict[str, Any], timeout: float = 20.0) -> Any: # <<< CHANGE: Increased default timeout >>>
+async def queue_command_and_wait(command: Dict[str, Any], timeout: float = 20.0, # <<< CHANGE: Increased default timeout >>>
+                                 on_disconnected: Optional[str] = None, reconnect_wait: Optional[float] = None) -> Any:
     """
     Queues a command, adds a request_id, and waits for the result via /plugin_report_result.
     Returns the result or raises TimeoutError.
+
+    If the plugin isn't polling, on_disconnected decides: "fail_fast" raises PluginUnavailableError
+    without queueing; "wait" holds the command up to reconnect_wait seconds (default
+    PLUGIN_RECONNECT_WAIT) for the plugin to come back, then raises PluginUnavailableError.
+    Without on_disconnected, a given reconnect_wait picks the policy (0 = fail_fast, > 0 = wait);
+    with neither, PLUGIN_DISCONNECTED_POLICY applies. A command whose caller gives up (timeout, or MCP request
+    cancellation arriving as CancelledError) is purged from the queue, and every command
+    carries a "deadline" so one that was already taken is abandoned by the plugin.
     """
-    global plugin_command_queue, pending_plugin_results, plugin_results_lock
+    global plugin_command_queue
     
     request_id = str(uuid.uuid4())
     command_with_id = {**command, "request_id": request_id} # Add request_id to command
+    action = str(command.get("action", "unknown"))
+    started = time.monotonic()
+
+    policy = on_disconnected
+    if policy is None:
+        policy = PLUGIN_DISCONNECTED_POLICY if reconnect_wait is None else ("wait" if reconnect_wait > 0 else "fail_fast")
+    plugin_available = plugin_presence.is_available()
+    if not plugin_available and policy == "fail_fast":
+        PLUGIN_COMMANDS.labels(action, "unavailable").inc()
+        raise PluginUnavailableError(_plugin_unavailable_message())
+    hold = 0.0
+    if not plugin_available:
+        hold = PLUGIN_RECONNECT_WAIT if reconnect_wait is None else reconnect_wait
+    # Absolute deadline (Unix seconds): the queue drops the command after it and the
+    # plugin skips or abandons it, since nobody will be waiting for the result
+    command_with_id["deadline"] = time.time() + hold + timeout
     
+    # Register the waiter before queueing so a fast plugin reply can't be missed
+    pending_plugin_results.register(request_id)
     try:
-        # Initialize pending result entry
-        with plugin_results_lock:
-            pending_plugin_results[request_id] = None # Mark as pending
-
         # Queue the command
         plugin_command_queue.append(command_with_id)
         logger.info(f"Queued command with request_id {request_id}: {command_with_id}")
 
-        # Wait for the result
-        start_time = time.monotonic()
-        while time.monotonic() < start_time + timeout:
-            with plugin_results_lock:
-                result = pending_plugin_results.get(request_id)
-            
-            if result is not None:
-                logger.info(f"Result received for request_id {request_id}")
-                # Clean up the entry
-                with plugin_results_lock:
-                    del pending_plugin_results[request_id]
-                return result # Return the actual result data
-            
-            await asyncio.sleep(0.1) # Small sleep to prevent busy-waiting
-
-        # Timeout occurred
+        if not plugin_available:
+            logger.info(f"Studio plugin not connected; holding request_id {request_id} up to {hold:.0f}s for it to reconnect.")
+            if not await plugin_presence.wait_for_poll(hold):
+                raise PluginUnavailableError(_plugin_unavailable_message(waited=hold))
+
+        # Wait for /plugin_report_result to resolve the future (no polling)
+        result = await pending_plugin_results.wait(request_id, timeout)
+        logger.info(f"Result received for request_id {request_id}")
+        PLUGIN_ROUNDTRIP_SECONDS.labels(action).observe(time.monotonic() - started)
+        PLUGIN_COMMANDS.labels(action, "ok").inc()
+        return result
+
+    except PluginUnavailableError:
+        logger.warning(f"Studio plugin did not reconnect in time for request_id {request_id}")
+        PLUGIN_COMMANDS.labels(action, "unavailable").inc()
+        raise
+    except TimeoutError:
         logger.warning(f"Timeout waiting for result for request_id {request_id}")
-        # Clean up the pending entry on timeout
-        with plugin_results_lock:
-            if request_id in pending_plugin_results:
-                del pending_plugin_results[request_id]
-        raise TimeoutError(f"Timeout waiting for plugin result for request_id {request_id}")
-
+        PLUGIN_TIMEOUTS.labels(action).inc()
+        PLUGIN_COMMANDS.labels(action, "timeout").inc()
+        raise
+    except asyncio.CancelledError:
+        logger.info(f"Wait cancelled for request_id {request_id}")
+        PLUGIN_COMMANDS.labels(action, "cancelled").inc()
+        raise
     except Exception as e:
         logger.exception(f"Error in queue_command_and_wait for request_id {request_id}")
-        # Ensure cleanup even if other errors occur
-        with plugin_results_lock:
-            if request_id in pending_plugin_results:
-                del pending_plugin_results[request_id]
+        PLUGIN_COMMANDS.labels(action, "error").inc()
         raise # Re-raise the exception
+    finally:
+        # wait() already cleans up; this covers failures before it was reached
+        pending_plugin_results.discard(request_id)
+        result_chunks.discard(request_id)
+        # Nobody is waiting anymore, so the plugin must not run it later
+        if plugin_command_queue.remove(request_id):
+            logger.info(f"Purged unanswered command {request_id} ({action}) from the plugin queue.")
+
+def _plugin_unavailable_message(waited: Optional[float] = None) -> str:
+    since = plugin_presence.seconds_since_seen()
+    last_seen = "has never connected" if since is None else f"was last seen {since:.0f}s ago"
+    waited_text = f" and did not reconnect within {waited:.0f}s" if waited is not None else ""
+    return (f"Roblox Studio plugin is not connected (it {last_seen}{waited_text}). "
+            "Open Studio and enable the Vibe Blocks MCP plugin, then retry.")
 
 # --- NEW: Execute Luau in Studio via Plugin --- 
 @mcp_server.tool()
-async def execute_luau_in_studio(ctx: Context, script_code: str = Field(..., description="The Luau code string to execute directly in the Studio session via the plugin.")) -> str:
+async def execute_luau_in_studio(ctx: Context, script_code: str = Field(..., description="The Luau code string to execute directly in the Studio session via the plugin."),
+                                 reconnect_wait: Optional[float] = _reconnect_wait_field()) -> str:
     """Executes arbitrary Luau script in the LIVE Studio session via the plugin.
        WARNING: Use with caution. Captures print output, return values, and errors.
     """
@@ -1874,7 +2607,7 @@ async def execute_luau_in_studio(ctx: Context, script_code: str = Field(..., des
 
     try:
         # Use the helper to queue and wait (use a potentially longer timeout for scripts)
-        result_data = await queue_command_and_wait(command, timeout=30.0) 
+        result_data = await queue_command_and_wait(command, timeout=30.0, reconnect_wait=reconnect_wait) 
 
         logger.info(f"Received result for execute_luau_in_studio: {result_data}")
 
@@ -1897,7 +2630,7 @@ async def execute_luau_in_studio(ctx: Context, script_code: str = Field(..., des
             # Add return values (nicely formatted)
             if return_values is not None:
                  try:
-                     return_str = json.dumps(return_values, indent=2)
+                     return_str = json_codec.dumps_text(return_values, indent=True)
                      output_str += "\n[Return Values]:\n" + return_str + "\n"
                  except TypeError:
                       output_str += f"\n[Return Values (Raw)]:\n{return_values}\n"
@@ -1914,6 +2647,8 @@ async def execute_luau_in_studio(ctx: Context, script_code: str = Field(..., des
             return f"Tool: execute_luau_in_studio, Error: Received unexpected result type from plugin: {type(result_data).__name__}"
         # --- End Result Processing --- 
 
+    except PluginUnavailableError as e:
+        return f"Tool: execute_luau_in_studio, Error: {e}"
     except TimeoutError as e:
         logger.error(f"Timeout waiting for execute_luau_in_studio result: {e}")
         return f"Tool: execute_luau_in_studio, Error: Timeout waiting for response from Studio plugin."
@@ -1929,12 +2664,13 @@ async def modify_children(ctx: Context,
                         property_name: str = Field(..., description="The name of the property to set on matching children."),
                         property_value: Any = Field(..., description='Value to set - can be a primitive (string, number, boolean), list, dictionary, or a JSON string of any of these types.'),
                         child_name_filter: Optional[str] = Field(None, description="Optional: Only modify children with this exact name."),
-                        child_class_filter: Optional[str] = Field(None, description="Optional: Only modify children of this exact ClassName.")) -> str:
+                        child_class_filter: Optional[str] = Field(None, description="Optional: Only modify children of this exact ClassName."),
+                        reconnect_wait: Optional[float] = _reconnect_wait_field()) -> str:
     """Finds direct children under a parent matching optional filters (name/class) and sets a specified property on them."""
     logger.info(f"Modifying children under '{parent_path}' (Name: {child_name_filter or 'Any'}, Class: {child_class_filter or 'Any'}) - Set '{property_name}' to value: {property_value}")
 
     # Basic validation
-    if not re.match(r"^[\w.]+$", parent_path):
+    if not _is_valid_object_path(parent_path):
         return f"Error: Invalid parent path format: {parent_path}"
     if not re.match(r"^\w+$", property_name):
         return f"Error: Invalid property name format: {property_name}"
@@ -1969,7 +2705,7 @@ async def modify_children(ctx: Context,
         }
 
         # Queue the command and wait for result
-        result = await queue_command_and_wait(command, timeout=60.0) # Longer timeout for potentially many children
+        result = await queue_command_and_wait(command, timeout=60.0, reconnect_wait=reconnect_wait) # Longer timeout for potentially many children
 
         # Process the result
         if "error_message" in result: # Check for fatal error first
@@ -1985,6 +2721,8 @@ async def modify_children(ctx: Context,
         else:
             return f"Error: Unexpected result format from plugin while modifying children."
 
+    except PluginUnavailableError as e:
+        return f"Error: {e}"
     except TimeoutError:
         return f"Error: Timeout waiting for Studio plugin to modify children under '{parent_path}'."
     except ValueError as e:
@@ -1992,4 +2730,239 @@ async def modify_children(ctx: Context,
     except Exception as e:
         logger.exception("Unexpected error in modify_children tool.")
         return f"Unexpected server error: {e}"
-# --- END: Modify Children Tool --- 
\ No newline at end of file
+# --- END: Modify Children Tool --- 
+# --- NEW: Scene Mirror Status Tool ---
+@mcp_server.tool()
+async def get_scene_mirror_status(ctx: Context) -> str:
+    """Reports whether the server's scene mirror is usable and its current scene version.
+       The version increases on every applied change, so callers can compare versions to see if the scene changed.
+    """
+    status = scene_mirror.status()
+    status["plugin_connected"] = polling_connected
+    return f"Scene mirror status:\n{json_codec.dumps_text(status, indent=True)}"
+# --- END: Scene Mirror Status Tool ---
+
+# --- NEW: Execute Studio Batch Tool ---
+@mcp_server.tool()
+async def execute_studio_batch(ctx: Context,
+                               steps: List[Dict[str, Any]] = Field(..., description='Ordered list of steps, each {"action": "<plugin action>", "data": {...}} (e.g. {"action": "create_instance", "data": {"class_name": "Part", "parent_name": "Workspace", "properties": {...}}}). A string "$N" or "$N.Child" inside data is replaced by the path of the instance produced by step N (1-based).'),
+                               use_waypoint: bool = Field(True, description="Wrap the whole batch in a single ChangeHistoryService waypoint (one undo step)."),
+                               stop_on_error: bool = Field(True, description="Skip the remaining steps after the first failing step."),
+                               rollback_on_error: bool = Field(False, description="Undo every change made by the batch if any step fails (requires use_waypoint)."),
+                               timeout: float = Field(60.0, description="Seconds to wait for the whole batch to finish."),
+                               reconnect_wait: Optional[float] = _reconnect_wait_field()) -> str:
+    """Runs a list of Studio plugin commands in one round trip and returns an ordered per-step result.
+       Later steps can reference instances created by earlier steps with "$N" (e.g. parent_name: "$1").
+    """
+    logger.info(f"Executing Studio batch of {len(steps) if isinstance(steps, list) else '?'} steps (waypoint: {use_waypoint}, stop_on_error: {stop_on_error}, rollback: {rollback_on_error})")
+
+    if not isinstance(steps, list) or not steps:
+        return "Tool: execute_studio_batch, Error: 'steps' must be a non-empty list of command dictionaries."
+    for index, step in enumerate(steps, start=1):
+        if not isinstance(step, dict) or not isinstance(step.get("action"), str):
+            return f"Tool: execute_studio_batch, Error: Step {index} must be a dictionary with an 'action' string."
+        if "data" in step and not isinstance(step["data"], dict):
+            return f"Tool: execute_studio_batch, Error: Step {index} 'data' must be a dictionary."
+        if step["action"] == "execute_batch":
+            return f"Tool: execute_studio_batch, Error: Step {index} cannot be a nested execute_batch."
+
+    command = {
+        "action": "execute_batch",
+        "data": {
+            "steps": [{"action": step["action"], "data": step.get("data", {})} for step in steps],
+            "use_waypoint": use_waypoint,
+            "stop_on_error": stop_on_error,
+            "rollback_on_error": rollback_on_error
+        }
+    }
+
+    try:
+        result = await queue_command_and_wait(command, timeout=timeout, reconnect_wait=reconnect_wait)
+
+        if not isinstance(result, dict):
+            return f"Tool: execute_studio_batch, Error: Received unexpected result type from plugin: {type(result).__name__}"
+        if "steps" not in result:
+            if "error" in result:
+                return f"Tool: execute_studio_batch, Error from plugin: {result['error']}"
+            return f"Tool: execute_studio_batch, Error: Received unexpected result format from plugin: {result}"
+
+        step_results = result.get("steps") or []
+        failed_count = result.get("failed_count", 0)
+        output_str = f"Tool: execute_studio_batch, Result: {len(step_results) - failed_count}/{len(step_results)} steps succeeded"
+        if result.get("rolled_back"):
+            output_str += " (all changes rolled back)"
+        output_str += ":\n"
+        lines = []
+        for step_result in step_results:
+            index = step_result.get("index", "?")
+            action = step_result.get("action", "?")
+            if step_result.get("skipped"):
+                lines.append(f"- [{index}] {action}: SKIPPED")
+            else:
+                status = "OK" if step_result.get("success") else "FAILED"
+                lines.append(f"- [{index}] {action}: {status} {json_codec.dumps_text(step_result.get('result'))}")
+        return output_str + "\n".join(lines)
+
+    except PluginUnavailableError as e:
+        return f"Tool: execute_studio_batch, Error: {e}"
+    except TimeoutError:
+        return f"Tool: execute_studio_batch, Error: Timeout waiting for Studio plugin to finish the batch of {len(steps)} steps."
+    except Exception as e:
+        logger.exception("Unexpected error in execute_studio_batch tool.")
+        return f"Tool: execute_studio_batch, Error: An unexpected server error occurred: {e}"
+# --- END: Execute Studio Batch Tool ---
+
+# --- NEW: Bulk Create Instances Tool ---
+BULK_CREATE_MAX_INSTANCES = 20000
+
+@mcp_server.tool()
+async def create_instances_bulk(ctx: Context,
+                                class_name: str = Field(..., description="Class of every instance to create (e.g. 'Part')."),
+                                parent_name: str = Field(..., description="Name or path of the parent for all new instances (e.g. 'Workspace.Build')."),
+                                columns: Optional[Dict[str, List[Any]]] = Field(None, description='Per-instance property values as columns of equal length, e.g. {"Name": ["A", "B"], "Position": [[0,1,0], [4,1,0]], "Color": [[1,0,0], [0,0,1]]}. null entries leave the property at its default.'),
+                                shared_properties: Optional[Dict[str, Any]] = Field(None, description='Properties applied to every instance, e.g. {"Anchored": true, "Size": [4,1,4], "Material": "SmoothPlastic"}.'),
+                                count: Optional[int] = Field(None, description="Number of instances to create. Defaults to the column length; required when no columns are given."),
+                                timeout: Optional[float] = Field(None, description="Seconds to wait for the plugin (default scales with the count)."),
+                                reconnect_wait: Optional[float] = _reconnect_wait_field()) -> str:
+    """Creates many instances of one class in a single plugin command (one undo step).
+       Use this instead of repeated create_instance calls when building structures with many parts.
+    """
+    columns = columns or {}
+    shared_properties = shared_properties or {}
+
+    lengths = {name: len(values) for name, values in columns.items() if isinstance(values, list)}
+    if len(lengths) != len(columns):
+        return "Tool: create_instances_bulk, Error: Every entry in 'columns' must be a list of values."
+    if len(set(lengths.values())) > 1:
+        return f"Tool: create_instances_bulk, Error: All columns must have the same length, got {lengths}."
+    column_length = next(iter(lengths.values()), None)
+    if count is None:
+        count = column_length
+    if count is None:
+        return "Tool: create_instances_bulk, Error: Provide 'count' when no property columns are given."
+    if column_length is not None and column_length != count:
+        return f"Tool: create_instances_bulk, Error: 'count' ({count}) does not match the column length ({column_length})."
+    if count <= 0 or count > BULK_CREATE_MAX_INSTANCES:
+        return f"Tool: create_instances_bulk, Error: 'count' must be between 1 and {BULK_CREATE_MAX_INSTANCES}."
+
+    wait_timeout = timeout if timeout is not None else max(30.0, 10.0 + count * 0.02)
+    logger.info(f"Bulk creating {count} {class_name} under '{parent_name}' (columns: {list(columns)}, shared: {list(shared_properties)})")
+
+    command = {
+        "action": "create_instances_bulk",
+        "data": {
+            "class_name": class_name,
+            "parent_name": parent_name,
+            "count": count,
+            "columns": columns,
+            "shared": shared_properties
+        }
+    }
+
+    try:
+        result = await queue_command_and_wait(command, timeout=wait_timeout, reconnect_wait=reconnect_wait)
+
+        if not isinstance(result, dict):
+            return f"Tool: create_instances_bulk, Error: Received unexpected result type from plugin: {type(result).__name__}"
+        if "names" not in result:
+            return f"Tool: create_instances_bulk, Error from plugin: {result.get('error', result)}"
+
+        created = result.get("created", 0)
+        failed = result.get("failed") or []
+        output_str = f"Tool: create_instances_bulk, Result: Created {created}/{count} {class_name} instance(s) under {result.get('parent_path')}"
+        if result.get("deadline_exceeded"):
+            output_str += " (stopped early: deadline exceeded)"
+        output_str += f".\nNames (in column order, false = failed): {json_codec.dumps_text(result.get('names'))}"
+        if result.get("handles"):
+            output_str += f"\nHandles (same order): {json_codec.dumps_text(result['handles'])}"
+        if failed:
+            shown = "\n".join(f"- [{entry.get('index')}] {entry.get('error')}" for entry in failed[:20])
+            more = f"\n... and {len(failed) - 20} more" if len(failed) > 20 else ""
+            output_str += f"\nFailures:\n{shown}{more}"
+        return output_str
+
+    except PluginUnavailableError as e:
+        return f"Tool: create_instances_bulk, Error: {e}"
+    except TimeoutError:
+        return f"Tool: create_instances_bulk, Error: Timeout waiting for Studio plugin to create {count} instances."
+    except Exception as e:
+        logger.exception("Unexpected error in create_instances_bulk tool.")
+        return f"Tool: create_instances_bulk, Error: An unexpected server error occurred: {e}"
+# --- END: Bulk Create Instances Tool ---
+
+# --- NEW: Bulk Set Properties Tool ---
+BULK_SET_MAX_TARGETS = 20000
+
+@mcp_server.tool()
+async def set_properties_bulk(ctx: Context,
+                              entries: Optional[List[Dict[str, Any]]] = Field(None, description='List of {"target": "<path>", "properties": {...}} entries, e.g. [{"target": "Workspace.Wall1", "properties": {"Color": [1,0,0], "Transparency": 0.5}}].'),
+                              targets: Optional[List[str]] = Field(None, description="Column layout: object paths, used together with 'columns' and/or 'shared_properties' (instead of 'entries')."),
+                              columns: Optional[Dict[str, List[Any]]] = Field(None, description='Column layout: per-target property values, each list as long as "targets", e.g. {"Position": [[0,1,0], [4,1,0]]}. null entries are skipped.'),
+                              shared_properties: Optional[Dict[str, Any]] = Field(None, description='Properties set on every target, e.g. {"Material": "Neon"}.'),
+                              timeout: Optional[float] = Field(None, description="Seconds to wait for the plugin (default scales with the number of targets)."),
+                              reconnect_wait: Optional[float] = _reconnect_wait_field()) -> str:
+    """Sets many properties on many objects in a single plugin command (one undo step).
+       Use instead of repeated set_property calls. Reports which targets failed and why.
+    """
+    columns = columns or {}
+    shared_properties = shared_properties or {}
+
+    if entries is not None and targets is not None:
+        return "Tool: set_properties_bulk, Error: Use either 'entries' or 'targets' (+ 'columns'), not both."
+    if entries is not None:
+        for index, entry in enumerate(entries, start=1):
+            if not isinstance(entry, dict) or not isinstance(entry.get("target"), str) or not isinstance(entry.get("properties", {}), dict):
+                return f"Tool: set_properties_bulk, Error: Entry {index} must look like {{\"target\": \"<path>\", \"properties\": {{...}}}}."
+        target_paths = [entry["target"] for entry in entries]
+    elif targets is not None:
+        bad_columns = [name for name, values in columns.items() if not isinstance(values, list) or len(values) != len(targets)]
+        if bad_columns:
+            return f"Tool: set_properties_bulk, Error: Columns {bad_columns} must be lists with one value per target ({len(targets)})."
+        if not columns and not shared_properties:
+            return "Tool: set_properties_bulk, Error: Provide 'columns' and/or 'shared_properties' with 'targets'."
+        target_paths = targets
+    else:
+        return "Tool: set_properties_bulk, Error: Provide 'entries' or 'targets'."
+    if not target_paths or len(target_paths) > BULK_SET_MAX_TARGETS:
+        return f"Tool: set_properties_bulk, Error: Between 1 and {BULK_SET_MAX_TARGETS} targets are required."
+
+    count = len(target_paths)
+    wait_timeout = timeout if timeout is not None else max(30.0, 10.0 + count * 0.02)
+    logger.info(f"Bulk setting properties on {count} targets (layout: {'entries' if entries is not None else 'columns'}, shared: {list(shared_properties)})")
+
+    data: Dict[str, Any] = {"shared": shared_properties}
+    if entries is not None:
+        data["entries"] = [{"target": entry["target"], "properties": entry.get("properties", {})} for entry in entries]
+    else:
+        data["targets"] = targets
+        data["columns"] = columns
+    command = {"action": "set_properties_bulk", "data": data}
+
+    try:
+        result = await queue_command_and_wait(command, timeout=wait_timeout, reconnect_wait=reconnect_wait)
+
+        if not isinstance(result, dict):
+            return f"Tool: set_properties_bulk, Error: Received unexpected result type from plugin: {type(result).__name__}"
+        if "results" not in result:
+            return f"Tool: set_properties_bulk, Error from plugin: {result.get('error', result)}"
+
+        results = result.get("results") or []
+        failures = [(path, outcome) for path, outcome in zip(target_paths, results) if outcome is not True]
+        output_str = f"Tool: set_properties_bulk, Result: Updated {result.get('updated', 0)}/{count} target(s)"
+        if result.get("deadline_exceeded"):
+            output_str += f" (stopped early after {len(results)}: deadline exceeded)"
+        output_str += "."
+        if failures:
+            shown = "\n".join(f"- {path}: {outcome}" for path, outcome in failures[:50])
+            more = f"\n... and {len(failures) - 50} more" if len(failures) > 50 else ""
+            output_str += f"\nFailures:\n{shown}{more}"
+        return output_str
+
+    except PluginUnavailableError as e:
+        return f"Tool: set_properties_bulk, Error: {e}"
+    except TimeoutError:
+        return f"Tool: set_properties_bulk, Error: Timeout waiting for Studio plugin to update {count} targets."
+    except Exception as e:
+        logger.exception("Unexpected error in set_properties_bulk tool.")
+        return f"Tool: set_properties_bulk, Error: An unexpected server error occurred: {e}"
+# --- END: Bulk Set Properties Tool ---
@@ -0,0 +1,147 @@
+import re
+from bisect import bisect_right
+from heapq import merge
+from typing import Dict, Any, Optional, List, Iterable
+
+def normalize_log_level(log_type: str) -> str:
+    """Maps 'Enum.MessageType.MessageWarning', 'MessageWarning' or 'warning' to 'warning'."""
+    level = log_type.rsplit(".", 1)[-1]
+    if level.startswith("Message") and len(level) > len("Message"):
+        level = level[len("Message"):]
+    return level.lower()
+
+class StudioLogStore:
+    """Fixed-size ring of Studio output lines, addressed by sequence number.
+
+    Every entry gets a monotonically increasing ``seq`` (starting at 1), so a
+    reader can ask only for what it hasn't seen yet. Entries live in parallel
+    slot arrays (no per-entry objects). Each level also keeps a sorted
+    list of seqs, so a level filter goes straight to that level's entries
+    and skips the rest.
+    """
+
+    def __init__(self, capacity: int = 5000):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._next_seq = 1
+        self._messages: List[Optional[str]] = [None] * capacity
+        self._log_types: List[Optional[str]] = [None] * capacity
+        self._timestamps: List[float] = [0.0] * capacity
+        self._received: List[float] = [0.0] * capacity
+        # level -> [start, seqs]; seqs[start:] are the live entries of that level
+        self._level_index: Dict[str, List[Any]] = {}
+
+    def __len__(self) -> int:
+        return self._next_seq - self.oldest_seq
+
+    @property
+    def oldest_seq(self) -> int:
+        return max(1, self._next_seq - self.capacity)
+
+    @property
+    def last_seq(self) -> int:
+        return self._next_seq - 1
+
+    def append(self, message: str, log_type: str, timestamp: float, received: float) -> int:
+        seq = self._next_seq
+        slot = seq % self.capacity
+        self._messages[slot] = message
+        self._log_types[slot] = log_type
+        self._timestamps[slot] = timestamp
+        self._received[slot] = received
+        self._next_seq += 1
+
+        index = self._level_index.setdefault(normalize_log_level(log_type), [0, []])
+        index[1].append(seq)
+        self._trim_index(index)
+        return seq
+
+    def _trim_index(self, index: List[Any]) -> None:
+        start, seqs = index
+        oldest = self.oldest_seq
+        while start < len(seqs) and seqs[start] < oldest:
+            start += 1
+        if start > 1024 and start * 2 > len(seqs): # Compact once the dead prefix dominates
+            del seqs[:start]
+            start = 0
+        index[0] = start
+
+    def levels(self) -> List[str]:
+        return [level for level, (start, seqs) in self._level_index.items() if start < len(seqs)]
+
+    def _candidate_seqs(self, first_seq: int, levels: Optional[List[str]], newest_first: bool = False) -> Iterable[int]:
+        if not levels:
+            if newest_first:
+                return range(self._next_seq - 1, first_seq - 1, -1)
+            return range(first_seq, self._next_seq)
+        streams = []
+        for level in {normalize_log_level(level) for level in levels}:
+            index = self._level_index.get(level)
+            if index is None:
+                continue
+            self._trim_index(index)
+            start, seqs = index
+            position = bisect_right(seqs, first_seq - 1, lo=start)
+            if newest_first: # Walk back from the end without copying the level's seqs
+                streams.append(map(seqs.__getitem__, range(len(seqs) - 1, position - 1, -1)))
+            else:
+                streams.append(seqs[position:])
+        return merge(*streams, reverse=newest_first)
+
+    def entry(self, seq: int) -> Dict[str, Any]:
+        slot = seq % self.capacity
+        return {
+            "seq": seq,
+            "message": self._messages[slot],
+            "log_type": self._log_types[slot],
+            "timestamp": self._timestamps[slot],
+        }
+
+    def query(self, since_seq: int = 0, log_types: Optional[List[str]] = None,
+              contains: Optional[str] = None, pattern: Optional[str] = None,
+              limit: int = 100, tail: Optional[bool] = None) -> Dict[str, Any]:
+        """Returns entries with seq > since_seq that match every given filter, oldest first.
+
+        With ``tail`` (the default when since_seq is 0) only the newest
+        ``limit`` matches are returned, still oldest first, and
+        ``next_since_seq`` is the newest seq, so the next call reads only
+        lines logged after this one. Otherwise ``next_since_seq`` is the seq
+        of the last returned entry when ``limit`` cut the page short, or the
+        newest seq scanned. Because of that, entries that didn't match are
+        never rescanned. ``dropped`` counts entries the ring overwrote
+        before the reader caught up. Raises re.error for an invalid pattern.
+        """
+        limit = max(1, limit)
+        if tail is None:
+            tail = since_seq <= 0
+        regex = re.compile(pattern) if pattern else None
+        needle = contains.lower() if contains else None
+        first_seq = max(since_seq + 1, self.oldest_seq)
+        dropped = max(0, first_seq - since_seq - 1) if since_seq > 0 else 0
+
+        logs = []
+        has_more = False
+        next_since_seq = max(since_seq, self.last_seq)
+        for seq in self._candidate_seqs(first_seq, log_types, newest_first=tail):
+            message = self._messages[seq % self.capacity] or ""
+            if needle is not None and needle not in message.lower():
+                continue
+            if regex is not None and not regex.search(message):
+                continue
+            if len(logs) == limit:
+                if not tail: # Older matches left out of a tail don't need another page
+                    has_more = True
+                    next_since_seq = logs[-1]["seq"]
+                break
+            logs.append(self.entry(seq))
+        if tail:
+            logs.reverse()
+
+        return {
+            "logs": logs,
+            "next_since_seq": next_since_seq,
+            "has_more": has_more,
+            "dropped": dropped,
+            "oldest_seq": self.oldest_seq,
+        }
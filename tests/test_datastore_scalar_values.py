@@ -0,0 +1,57 @@
+import asyncio
+import json
+
+from roblox_mcp.config import Settings
+from roblox_mcp.datastore_export import export_datastore_jsonl
+from roblox_mcp.roblox_client import RobloxClient
+
+# Bare JSON numbers and booleans are common DataStore values (coin counts, flags);
+# they must come back as values, not as errors from treating the body as a dict.
+STORED = {"coins": 42, "vip": True, "banned": False, "ratio": 0.5, "name": "Alex", "inventory": {"sword": 1}}
+
+def make_client(stored):
+    client = RobloxClient(Settings(roblox_api_key="test-key", roblox_universe_id=1, roblox_place_id=1,
+                                   roblox_asset_cache_path=""))
+
+    async def fake_request(method, url, params=None, **kwargs):
+        if url.endswith("/entries/entry"):
+            return stored[params["entryKey"]]
+        return {"keys": [{"scope": "global", "key": key} for key in stored], "nextPageCursor": ""}
+
+    client._request = fake_request
+    return client
+
+def test_get_datastore_entry_returns_scalar_values():
+    async def run():
+        client = make_client(STORED)
+        values = {key: await client.get_datastore_entry("PlayerData", key) for key in STORED}
+        cached = {key: await client.get_datastore_entry("PlayerData", key) for key in STORED}
+        await client.client.aclose()
+        return values, cached
+
+    values, cached = asyncio.run(run())
+    assert values == STORED
+    assert cached == STORED
+
+def test_bulk_get_returns_scalar_values():
+    async def run():
+        client = make_client(STORED)
+        results = [(key, value, error) async for _, key, value, error in client.get_datastore_entries("PlayerData", list(STORED))]
+        await client.client.aclose()
+        return results
+
+    assert asyncio.run(run()) == [(key, value, None) for key, value in STORED.items()]
+
+def test_export_writes_scalar_values(tmp_path):
+    output_path = tmp_path / "PlayerData.jsonl"
+
+    async def run():
+        client = make_client(STORED)
+        summary = await export_datastore_jsonl(client, "PlayerData", str(output_path))
+        await client.client.aclose()
+        return summary
+
+    summary = asyncio.run(run())
+    assert summary["entries"] == len(STORED)
+    lines = [json.loads(line) for line in output_path.read_text(encoding="utf-8").splitlines()]
+    assert lines == [{"scope": "global", "key": key, "value": value} for key, value in STORED.items()]